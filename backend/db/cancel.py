@@ -0,0 +1,117 @@
+"""
+This module provides cooperative, server-side cancellation of long operations.
+A CancelToken tracks the statements currently running under it; cancelling the
+token (explicitly or when its deadline expires) sends a cancel request for each
+of them through the dialect, so the server stops the work instead of the client
+merely giving up on it.
+"""
+import threading
+from contextlib import contextmanager
+
+from backend.db.dialects import getDialect
+
+
+class OperationCancelled(Exception):
+    """
+    Brief description:
+        Raised when an operation is started or continued under a cancelled token.
+    """
+
+
+class CancelToken:
+    """
+    Brief description:
+        Cancellation handle shared by the statements of one operation.
+
+    Attributes:
+        cancelled (bool): Whether cancel() has been called.
+    """
+    def __init__(self):
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._active = {}
+        self._timer = None
+
+    @contextmanager
+    def track(self, engine, conn, cursor=None):
+        """
+        Brief description:
+            Registers a running statement so cancel() can interrupt it.
+
+        Parameters:
+            engine (str): Database engine ("PostgreSQL" or "MSSQL").
+            conn: Connection running the statement.
+            cursor (optional): Cursor running the statement (required for ODBC cancel), or any
+                               object with a cancel() method, such as a PreparedStatements registry.
+
+        Returns:
+            A context manager; the statement should be executed inside it.
+
+        Raises:
+            OperationCancelled: If the token was already cancelled.
+        """
+        key = object()
+        with self._lock:
+            self.raiseIfCancelled()
+            self._active[key] = (engine, conn, cursor)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+
+    def raiseIfCancelled(self):
+        """
+        Brief description:
+            Raises OperationCancelled if the token has been cancelled.
+
+        Returns:
+            None
+        """
+        if self.cancelled:
+            raise OperationCancelled("Operation cancelled")
+
+    def cancel(self):
+        """
+        Brief description:
+            Cancels every statement currently tracked by this token on the server
+            and makes further tracked statements fail immediately.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.cancelled = True
+            active = list(self._active.values())
+        for engine, conn, cursor in active:
+            try:
+                getDialect(engine).cancel(conn, cursor)
+            except Exception as e:
+                print("Error cancelling statement:", e)
+
+    def cancelAfter(self, seconds):
+        """
+        Brief description:
+            Schedules cancel() after a deadline, bounding the operation's total duration.
+
+        Parameters:
+            seconds (float): Deadline in seconds from now.
+
+        Returns:
+            None
+        """
+        self._timer = threading.Timer(seconds, self.cancel)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def close(self):
+        """
+        Brief description:
+            Stops the deadline timer, if any. Call when the operation has finished.
+
+        Returns:
+            None
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,498 @@
+"""
+This module provides a cached view of the database catalog (schemas, tables and
+columns) for one session. It adopts the connection opened at login instead of
+reconnecting, and can prefetch the schema list and the default schema's tables,
+columns and search index in the background while the main window is being built.
+When a read replica is configured, catalog reads go to it as long as its lag is
+acceptable and fall back to the primary otherwise, including when a read on the
+replica fails; DDL never goes through here.
+"""
+import threading
+import time
+from contextlib import ExitStack
+
+from backend.db.dbConnection import connectToDatabase
+from backend.db.dialects import getDialect
+from backend.db.search import CatalogIndex
+from backend.db.statements import forgetConnection, preparedFor, statementStats
+from backend.db.metadata import (
+    getColumns, getMemoryOptimizedTables, getPartitionKeys, getPermissions, getSchemaColumns, getSchemas,
+    getTables
+)
+
+# Replica lag (seconds) above which catalog reads fall back to the primary
+MAX_REPLICA_LAG = 30
+# Seconds between replica lag checks
+LAG_CHECK_INTERVAL = 10
+
+
+def closeQuietly(conn):
+    # Closes a connection that may already be broken
+    if conn is not None:
+        try:
+            forgetConnection(conn)
+            conn.close()
+        except Exception:
+            pass
+
+
+class Catalog:
+    """
+    Brief description:
+        Session-wide catalog cache backed by a single, long-lived connection.
+        All catalog queries are serialized on that connection, so the background
+        prefetch and UI requests can safely share it. Cached entries are served
+        without waiting for queries in flight, each entry is loaded by one thread
+        at a time, and failed reads are not cached, so the next call retries them.
+
+    Attributes:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        host (str): Hostname or IP address of the database server.
+        user (str): Database username.
+        password (str): Database password.
+        dbname (str): Target database name.
+        replicaHost (str or None): Read replica serving the catalog reads, if any.
+        maxLag (float): Replica lag in seconds above which reads go to the primary.
+        replicaLag (float or None): Lag measured at the last check; None if unknown.
+        tokens (list[CancelToken]): Tokens that can cancel the running catalog query.
+        timeouts (Timeouts or None): Timeouts of the connections the catalog opens; None uses the defaults.
+    """
+    def __init__(self, engine, host, user, password, dbname, conn=None, replicaHost=None, maxLag=MAX_REPLICA_LAG,
+                 tokens=(), timeouts=None):
+        self.engine = engine
+        self.host = host
+        self.user = user
+        self.password = password
+        self.dbname = dbname
+        self.replicaHost = replicaHost
+        self.maxLag = maxLag
+        self.replicaLag = None
+        self.tokens = list(tokens)
+        self.timeouts = timeouts
+
+        self._conn = None
+        self._replica = None
+        self._replicaUsable = None
+        self._replicaCheckedAt = None
+        self._probe = None
+        self._checkThread = None
+        self._closed = False
+        # _connLock serializes queries and connection changes; _lock only guards the cache
+        self._connLock = threading.RLock()
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._loading = {}
+        self._indexFailures = set()
+        self._prefetchThread = None
+        if conn is not None:
+            self.adopt(conn)
+
+    def adopt(self, conn):
+        """
+        Brief description:
+            Takes ownership of an already open connection (e.g. the one used to validate
+            the login), so no new handshake is needed for catalog reads.
+
+        Parameters:
+            conn: An open database connection.
+
+        Returns:
+            None
+        """
+        # Catalog reads must not hold a transaction open between UI actions
+        conn.autocommit = True
+        with self._connLock:
+            self._conn = conn
+
+    def connection(self):
+        """
+        Brief description:
+            Returns the connection catalog reads should use: the read replica while its
+            lag is within maxLag, the primary otherwise.
+
+        Returns:
+            A database connection object.
+        """
+        with self._connLock:
+            replica = self.replicaConnection()
+            return replica if replica is not None else self.primaryConnection()
+
+    def primaryConnection(self):
+        """
+        Brief description:
+            Returns the connection to the primary, opening one if none was handed over.
+
+        Returns:
+            A database connection object.
+        """
+        with self._connLock:
+            if self._conn is None:
+                self.adopt(connectToDatabase(self.engine, self.host, self.user, self.password, self.dbname,
+                                             self.timeouts))
+            return self._conn
+
+    def replicaConnection(self):
+        """
+        Brief description:
+            Returns the read-only replica connection if a replica is configured, reachable
+            and lagging by at most maxLag seconds. Never waits on the replica: every
+            LAG_CHECK_INTERVAL seconds checkReplica() runs in a background thread, and
+            until it reports back reads use the outcome of the previous check (the
+            primary before the first one).
+
+        Returns:
+            A database connection object, or None if reads should go to the primary.
+        """
+        with self._connLock:
+            if self.replicaHost is None:
+                return None
+            now = time.monotonic()
+            due = self._replicaCheckedAt is None or now - self._replicaCheckedAt >= LAG_CHECK_INTERVAL
+            if due and self._checkThread is None:
+                self._replicaCheckedAt = now
+                self._checkThread = threading.Thread(target=self.checkReplica, name="catalog-replica-check",
+                                                     daemon=True)
+                self._checkThread.start()
+            return self._replica if self._replicaUsable else None
+
+    def checkReplica(self):
+        """
+        Brief description:
+            Measures the replica lag on a dedicated probe connection and opens the read
+            connection once the replica is usable. Connecting and probing happen without
+            holding the catalog lock, so an unreachable replica does not stall catalog
+            reads on the primary; only the outcome is published under the lock.
+
+        Returns:
+            None
+        """
+        try:
+            probe, replica, lag = self._probe, None, None
+            try:
+                if probe is None:
+                    probe = connectToDatabase(self.engine, self.replicaHost, self.user, self.password,
+                                              self.dbname, self.timeouts, readOnly=True)
+                    probe.autocommit = True
+                lag = getDialect(self.engine).replicationLag(probe)
+                if lag is not None and lag <= self.maxLag and self._replica is None:
+                    replica = connectToDatabase(self.engine, self.replicaHost, self.user, self.password,
+                                                self.dbname, self.timeouts, readOnly=True)
+                    replica.autocommit = True
+            except Exception as e:
+                print("Error checking the read replica:", e)
+                closeQuietly(probe)
+                probe, lag = None, None
+
+            with self._connLock:
+                if self._closed:
+                    closeQuietly(probe)
+                    closeQuietly(replica)
+                    return
+                self._probe = probe
+                if lag is None:
+                    self._closeReplica()
+                if replica is not None:
+                    if self._replica is None:
+                        self._replica = replica
+                    else:
+                        closeQuietly(replica)
+                usable = lag is not None and lag <= self.maxLag and self._replica is not None
+                if usable != self._replicaUsable:
+                    if usable:
+                        print(f"Reading the catalog from the read replica {self.replicaHost}")
+                    else:
+                        print(f"Read replica {self.replicaHost} lag is "
+                              f"{'unknown' if lag is None else f'{lag:.0f}s'}; reading the catalog from the primary")
+                self.replicaLag = lag
+                self._replicaUsable = usable
+        finally:
+            with self._connLock:
+                self._checkThread = None
+
+    def _dropReplica(self):
+        # Sends reads to the primary until the next lag check reconnects to the replica
+        self._closeReplica()
+        self._replicaUsable = False
+        self._replicaCheckedAt = time.monotonic()
+        self.replicaLag = None
+
+    def _closeReplica(self):
+        closeQuietly(self._replica)
+        self._replica = None
+
+    def prefetch(self):
+        """
+        Brief description:
+            Starts loading the schema list and the default schema's tables and columns
+            in a background thread. Later calls to schemas(), tables() and columns()
+            return the prefetched results, waiting only for an entry still being loaded.
+
+        Returns:
+            None
+        """
+        if self._prefetchThread is None:
+            self._prefetchThread = threading.Thread(target=self._prefetch, name="catalog-prefetch", daemon=True)
+            self._prefetchThread.start()
+
+    def _prefetch(self):
+        schema = self.defaultSchema()
+        if schema:
+            self.tables(schema)
+            self.searchIndex(schema)
+
+    def _read(self, function, *args):
+        # Runs one metadata query on the catalog connection, raising on failure. A query
+        # that fails on the replica marks it unusable and is retried on the primary.
+        with self._connLock:
+            conn = self.connection()
+            if conn is self._replica:
+                try:
+                    return self._readOn(conn, function, *args)
+                except Exception as e:
+                    if any(token.cancelled for token in self.tokens):
+                        raise
+                    print(f"Error reading from the read replica {self.replicaHost}; "
+                          f"reading the catalog from the primary:", e)
+                    self._dropReplica()
+                conn = self.primaryConnection()
+            return self._readOn(conn, function, *args)
+
+    def _readOn(self, conn, function, *args):
+        with ExitStack() as stack:
+            for token in self.tokens:
+                stack.enter_context(token.track(self.engine, conn, preparedFor(self.engine, conn)))
+            return function(self.engine, self.host, self.user, self.password, self.dbname, *args,
+                            conn=conn, strict=True)
+
+    def _load(self, key, load):
+        # Returns a cache entry, loading it on a miss. Only one thread loads a given key;
+        # the others wait for that key alone. Errors propagate and nothing is cached.
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            keyLock = self._loading.setdefault(key, threading.Lock())
+        with keyLock:
+            with self._lock:
+                if key in self._cache:
+                    return self._cache[key]
+            value = load()
+            with self._lock:
+                self._cache[key] = value
+                self._loading.pop(key, None)
+            return value
+
+    def _get(self, key, load, empty):
+        try:
+            return self._load(key, load)
+        except Exception as e:
+            print(f"Error reading the catalog ({key[0]}):", e)
+            return empty
+
+    def schemas(self):
+        """
+        Brief description:
+            Returns the non-system schemas of the database, loading them on first use.
+
+        Returns:
+            list[str]: Schema names.
+        """
+        return self._get(("schemas",), lambda: self._read(getSchemas), [])
+
+    def defaultSchema(self):
+        """
+        Brief description:
+            Returns the schema selected by default: 'public' on PostgreSQL, the first
+            schema on MSSQL.
+
+        Returns:
+            str or None: The default schema name, or None if there are no schemas.
+        """
+        schemas = self.schemas()
+        if self.engine == "PostgreSQL" and "public" in schemas:
+            return "public"
+        if self.engine == "MSSQL" and schemas:
+            return schemas[0]
+        return None
+
+    def tables(self, schema):
+        """
+        Brief description:
+            Returns the base tables of a schema, loading them on first use.
+
+        Parameters:
+            schema (str): Schema name.
+
+        Returns:
+            list[str]: Table names.
+        """
+        return self._get(("tables", schema), lambda: self._read(getTables, schema), [])
+
+    def _indexSchema(self, schema):
+        # Loads the column snapshot of a schema, caches its columns and builds its search index
+        tables = self._load(("tables", schema), lambda: self._read(getTables, schema))
+        snapshot = self._read(getSchemaColumns, schema)
+        with self._lock:
+            for table, columns in snapshot.items():
+                self._cache[("columns", schema, table)] = tuple(columns)
+        return snapshot, CatalogIndex(tables, snapshot)
+
+    def schemaColumns(self, schema):
+        """
+        Brief description:
+            Loads the columns of every table in a schema with one query and caches them.
+
+        Parameters:
+            schema (str): Schema name.
+
+        Returns:
+            dict[str, list[Column]]: Columns keyed by table name.
+        """
+        try:
+            snapshot, index = self._indexSchema(schema)
+        except Exception as e:
+            print("Error reading the catalog (schemaColumns):", e)
+            return {}
+        with self._lock:
+            self._cache[("searchIndex", schema)] = index
+            self._indexFailures.discard(schema)
+        return snapshot
+
+    def columns(self, schema, table):
+        """
+        Brief description:
+            Returns the columns of a table, from the snapshot if available.
+
+        Parameters:
+            schema (str): Schema name.
+            table (str): Table name.
+
+        Returns:
+            tuple[Column]: Columns in ordinal order.
+        """
+        return self._get(("columns", schema, table), lambda: tuple(self._read(getColumns, schema, table)), ())
+
+    def searchIndex(self, schema):
+        """
+        Brief description:
+            Returns the search index over the tables and column names of a schema, built
+            from the schema's column snapshot (loaded on first use) and rebuilt whenever
+            the snapshot is reloaded. If the snapshot cannot be read, a table-names-only
+            index is cached instead, so searching never queries the database again;
+            prepareSearchIndex() retries it.
+
+        Parameters:
+            schema (str): Schema name.
+
+        Returns:
+            CatalogIndex: The schema's search index (table names only if the columns could not be read).
+        """
+        return self._load(("searchIndex", schema), lambda: self._buildSearchIndex(schema))
+
+    def _buildSearchIndex(self, schema):
+        try:
+            index = self._indexSchema(schema)[1]
+        except Exception as e:
+            print("Error reading the catalog (searchIndex):", e)
+            with self._lock:
+                self._indexFailures.add(schema)
+            return CatalogIndex(self.tables(schema), {})
+        with self._lock:
+            self._indexFailures.discard(schema)
+        return index
+
+    def prepareSearchIndex(self, schema):
+        """
+        Brief description:
+            Builds the search index of a schema ahead of the first search, retrying a
+            snapshot that failed before. Meant to run in the background when a schema
+            is selected, so typing in the search box never waits for the database.
+
+        Parameters:
+            schema (str): Schema name.
+
+        Returns:
+            CatalogIndex: The schema's search index.
+        """
+        with self._lock:
+            if schema in self._indexFailures:
+                self._cache.pop(("searchIndex", schema), None)
+        return self.searchIndex(schema)
+
+    def memoryOptimizedTables(self, schema):
+        """
+        Brief description:
+            Returns the memory-optimized tables of a schema (MSSQL only), loading them on first use.
+
+        Parameters:
+            schema (str): Schema name.
+
+        Returns:
+            set[str]: Table names.
+        """
+        return self._get(("memoryOptimizedTables", schema), lambda: self._read(getMemoryOptimizedTables, schema),
+                         set())
+
+    def partitionKeys(self, schema):
+        """
+        Brief description:
+            Returns the partition key columns of the partitioned tables of a schema,
+            loading them on first use.
+
+        Parameters:
+            schema (str): Schema name.
+
+        Returns:
+            dict[str, list[str]]: Partition key column names, keyed by table name.
+        """
+        return self._get(("partitionKeys", schema), lambda: self._read(getPartitionKeys, schema), {})
+
+    def permissions(self, schema, table):
+        """
+        Brief description:
+            Returns the column-level read/write permissions of the session user on a table.
+            Permissions are not cached.
+
+        Parameters:
+            schema (str): Schema name.
+            table (str): Table name.
+
+        Returns:
+            list[tuple]: (column_name, can_read, can_write) tuples.
+        """
+        try:
+            return self._read(getPermissions, schema, table)
+        except Exception as e:
+            print(f"Error fetching permissions: {e}")
+            return []
+
+    def statementStats(self):
+        """
+        Brief description:
+            Returns the prepare/execute counters of the catalog queries, showing how
+            often a prepared statement was reused instead of re-parsed.
+
+        Returns:
+            dict: Counter values as returned by backend.db.statements.statementStats().
+        """
+        return statementStats()
+
+    def close(self):
+        """
+        Brief description:
+            Closes the catalog connections (primary, replica and replica probe), if open.
+            A replica check still running discards its connections when it finishes.
+
+        Returns:
+            None
+        """
+        with self._connLock:
+            self._closed = True
+            self._closeReplica()
+            closeQuietly(self._probe)
+            self._probe = None
+            if self._conn is not None:
+                try:
+                    forgetConnection(self._conn)
+                    self._conn.close()
+                finally:
+                    self._conn = None
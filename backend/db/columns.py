@@ -0,0 +1,233 @@
+"""
+This module defines the typed column model shared by the metadata layer and
+the SQL generators, and renders the exact SQL type of a column for each engine.
+Column names are interned and type descriptors are shared between columns, so
+very large catalogs stay compact in memory.
+"""
+import sys
+
+# MSSQL types whose declaration carries a length (or MAX)
+SIZED_TYPES_MSSQL = {"char", "varchar", "nchar", "nvarchar", "binary", "varbinary"}
+# MSSQL types whose declaration carries a fractional-seconds scale
+SCALED_TYPES_MSSQL = {"datetime2", "time", "datetimeoffset"}
+# Length used when the catalog does not report one (legacy behaviour)
+DEFAULT_LENGTH = 100
+
+
+class ColumnType:
+    """
+    Brief description:
+        Immutable, shared description of a column type. Instances are interned by
+        columnType(), so the thousands of columns sharing e.g. VARCHAR(50) reference
+        a single object, and the rendered SQL type is computed once per engine.
+
+    Attributes:
+        dataType (str): Base data type name reported by the catalog (e.g. 'varchar', 'numeric').
+        maxLength (int or None): Character/binary length; -1 means MAX on MSSQL.
+        precision (int or None): Numeric precision.
+        scale (int or None): Numeric scale or fractional-seconds precision.
+        collation (str or None): Column collation when it differs from the database default.
+        nativeType (str or None): Exact declared type as rendered by the engine itself, if available.
+    """
+    __slots__ = ("dataType", "maxLength", "precision", "scale", "collation", "nativeType", "_rendered")
+
+    def __init__(self, dataType, maxLength=None, precision=None, scale=None, collation=None, nativeType=None):
+        self.dataType = dataType
+        self.maxLength = maxLength
+        self.precision = precision
+        self.scale = scale
+        self.collation = collation
+        self.nativeType = nativeType
+        self._rendered = {}
+
+    @property
+    def key(self):
+        """
+        Brief description:
+            Returns the attribute tuple that identifies this type.
+
+        Returns:
+            tuple: (dataType, maxLength, precision, scale, collation, nativeType)
+        """
+        return (self.dataType, self.maxLength, self.precision, self.scale, self.collation, self.nativeType)
+
+
+_types = {}
+
+
+def columnType(dataType, maxLength=None, precision=None, scale=None, collation=None, nativeType=None):
+    """
+    Brief description:
+        Returns the shared ColumnType for the given attributes, creating it on first use.
+
+    Parameters:
+        dataType (str): Base data type name.
+        maxLength (int, optional): Character/binary length.
+        precision (int, optional): Numeric precision.
+        scale (int, optional): Numeric scale or fractional-seconds precision.
+        collation (str, optional): Non-default collation.
+        nativeType (str, optional): Exact type as rendered by the engine.
+
+    Returns:
+        ColumnType: The interned type descriptor.
+    """
+    key = (dataType, maxLength, precision, scale, collation, nativeType)
+    descriptor = _types.get(key)
+    if descriptor is None:
+        descriptor = _types.setdefault(key, ColumnType(
+            sys.intern(dataType),
+            maxLength,
+            precision,
+            scale,
+            sys.intern(collation) if collation else collation,
+            sys.intern(nativeType) if nativeType else nativeType,
+        ))
+    return descriptor
+
+
+class Column:
+    """
+    Brief description:
+        A table column: an interned name plus a shared ColumnType descriptor.
+        Uses __slots__ so a catalog of millions of columns stays compact.
+
+    Attributes:
+        name (str): Column name (interned).
+        type (ColumnType): Shared type descriptor. Its attributes (dataType, maxLength,
+                           precision, scale, collation, nativeType) are also readable
+                           directly on the column.
+    """
+    __slots__ = ("name", "type")
+
+    def __init__(self, name, dataType, maxLength=None, precision=None, scale=None,
+                 collation=None, nativeType=None):
+        self.name = sys.intern(name)
+        self.type = columnType(dataType, maxLength, precision, scale, collation, nativeType)
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.dataType!r})"
+
+    dataType = property(lambda self: self.type.dataType)
+    maxLength = property(lambda self: self.type.maxLength)
+    precision = property(lambda self: self.type.precision)
+    scale = property(lambda self: self.type.scale)
+    collation = property(lambda self: self.type.collation)
+    nativeType = property(lambda self: self.type.nativeType)
+
+    def sqlType(self, engine):
+        """
+        Brief description:
+            Returns the exact SQL type of this column for the given engine.
+
+        Parameters:
+            engine (str): Database engine ("PostgreSQL" or "MSSQL").
+
+        Returns:
+            tuple[str, str or None]: The SQL type and a warning message when the
+                                     type could not be reproduced exactly, else None.
+        """
+        return formatType(self, engine)
+
+
+def formatType(column, engine):
+    """
+    Brief description:
+        Renders the declared SQL type of a column, including length, precision and scale.
+        The result is computed once per type descriptor and engine.
+
+    Parameters:
+        column (Column): Column whose type is rendered.
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+
+    Returns:
+        tuple[str, str or None]: The SQL type and a warning message when the type
+                                 had to be approximated, else None.
+    """
+    descriptor = column.type
+    rendered = descriptor._rendered.get(engine)
+    if rendered is None:
+        rendered = descriptor._rendered.setdefault(engine, renderType(descriptor, engine))
+    sqlType, warning = rendered
+    return sqlType, warning.format(name=column.name) if warning else None
+
+
+def renderType(descriptor, engine):
+    """
+    Brief description:
+        Renders a type descriptor for an engine.
+
+    Parameters:
+        descriptor (ColumnType): Type to render.
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+
+    Returns:
+        tuple[str, str or None]: The SQL type and a warning template (with a {name}
+                                 placeholder for the column name), or None.
+    """
+    dtype = descriptor.dataType.strip()
+    lowered = dtype.lower()
+
+    if engine == "PostgreSQL":
+        if descriptor.nativeType:
+            return descriptor.nativeType, None
+        if lowered in ("user-defined", "array"):
+            return "text", (f"column '{{name}}' has type {dtype} that was not resolved; "
+                            f"parameter declared as text")
+        if lowered in ("character varying", "varchar", "character", "char") and descriptor.maxLength:
+            return f"{dtype}({descriptor.maxLength})", None
+        if lowered in ("numeric", "decimal") and descriptor.precision is not None:
+            return f"{dtype}({descriptor.precision},{descriptor.scale or 0})", None
+        return dtype, None
+
+    if lowered in SIZED_TYPES_MSSQL:
+        if descriptor.maxLength == -1:
+            return f"{dtype.upper()}(MAX)", None
+        if descriptor.maxLength:
+            return f"{dtype.upper()}({descriptor.maxLength})", None
+        return f"{dtype.upper()}({DEFAULT_LENGTH})", (
+            f"column '{{name}}' has no reported length; parameter declared as "
+            f"{dtype.upper()}({DEFAULT_LENGTH})")
+    if lowered in ("decimal", "numeric") and descriptor.precision is not None:
+        return f"{dtype.upper()}({descriptor.precision},{descriptor.scale or 0})", None
+    if lowered in SCALED_TYPES_MSSQL and descriptor.scale is not None:
+        return f"{dtype.upper()}({descriptor.scale})", None
+    if lowered in ("text", "ntext", "image"):
+        return dtype.upper(), (f"column '{{name}}' uses deprecated type {dtype.upper()}; "
+                               f"comparisons on it cannot use an index seek")
+    return dtype.upper(), None
+
+
+def asColumns(columns):
+    """
+    Brief description:
+        Converts catalog rows into Column objects. Accepts Column objects unchanged
+        and legacy (column_name, data_type) tuples.
+
+    Parameters:
+        columns (list): Column objects or (column_name, data_type) tuples.
+
+    Returns:
+        list[Column]: The typed column list.
+    """
+    result = []
+    for col in columns:
+        if isinstance(col, Column):
+            result.append(col)
+        else:
+            result.append(Column(col[0], col[1]))
+    return result
+
+
+def findColumn(columns, name):
+    """
+    Brief description:
+        Looks up a column by name.
+
+    Parameters:
+        columns (list[Column]): Columns to search.
+        name (str): Column name.
+
+    Returns:
+        Column or None: The matching column, or None if it does not exist.
+    """
+    return next((col for col in columns if col.name == name), None)
@@ -1,9 +1,13 @@
-import psycopg2
-import pyodbc
+from contextlib import contextmanager
 
-def connectToDatabase(engine, host, user, password, database):
+from backend.db.dialects import DEFAULT_TIMEOUTS, getDialect
+from backend.db.statements import forgetConnection
+
+def connectToDatabase(engine, host, user, password, database, timeouts=None, readOnly=False):
     """
     Establishes a connection to a PostgreSQL or MSSQL database based on the given engine.
+    The driver for the engine is imported on first use only, and connect, statement
+    and lock timeouts are applied to the connection.
 
     Parameters:
         engine (str): Database engine type ('PostgreSQL' or 'MSSQL')
@@ -11,6 +15,8 @@ def connectToDatabase(engine, host, user, password, database):
         user (str): Username for authentication
         password (str): Password for authentication
         database (str): Name of the database to connect to
+        timeouts (Timeouts, optional): Timeouts to apply; defaults to DEFAULT_TIMEOUTS
+        readOnly (bool, optional): Open a read-only session (e.g. on a read replica)
 
     Returns:
         A database connection object
@@ -18,19 +24,31 @@ def connectToDatabase(engine, host, user, password, database):
     Raises:
         ValueError: If the database engine is not supported
     """
-    if engine == "PostgreSQL":
-        return psycopg2.connect(
-            dbname=database,
-            user=user,
-            password=password,
-            host=host,
-            port=5432
-        )
-    elif engine == "MSSQL":
-        connectionString = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={host};DATABASE={database};UID={user};PWD={password}"
-        )
-        return pyodbc.connect(connectionString)
-    else:
-        raise ValueError("Unsupported database engine")
+    return getDialect(engine).connect(host, user, password, database, timeouts or DEFAULT_TIMEOUTS, readOnly)
+
+@contextmanager
+def borrowConnection(engine, host, user, password, database, conn=None):
+    """
+    Yields an open connection: the given one if provided (left open afterwards),
+    otherwise a new connection that is closed when the block exits.
+
+    Parameters:
+        engine (str): Database engine type ('PostgreSQL' or 'MSSQL')
+        host (str): Host address of the database server
+        user (str): Username for authentication
+        password (str): Password for authentication
+        database (str): Name of the database to connect to
+        conn (optional): An already open connection to reuse
+
+    Returns:
+        A context manager yielding a database connection object
+    """
+    if conn is not None:
+        yield conn
+        return
+    conn = connectToDatabase(engine, host, user, password, database)
+    try:
+        yield conn
+    finally:
+        forgetConnection(conn)
+        conn.close()
@@ -0,0 +1,317 @@
+"""
+This module holds the registry of database dialect backends. Each dialect knows
+how to open a connection for its engine and imports its driver module only the
+first time it is needed, so a session never loads the driver of an engine it
+does not use. Every connection is opened with the connect, statement and lock
+timeouts configured here, and in-flight statements can be cancelled server-side.
+Dialects also open read-only connections to replicas and report their lag.
+Hosts may carry a port, as "host:port" (or "[ipv6]:port").
+"""
+import importlib
+import inspect
+from abc import ABC, abstractmethod
+
+
+class Timeouts:
+    """
+    Brief description:
+        Time limits applied to every connection the tool opens. A value of 0 disables
+        the corresponding limit.
+
+    Attributes:
+        connect (int): Seconds allowed to establish a connection.
+        statement (int): Seconds a single statement may run before the server aborts it.
+        lock (int): Seconds a statement may wait for a lock (e.g. DDL blocked by a long transaction).
+    """
+    def __init__(self, connect=10, statement=300, lock=30):
+        self.connect = connect
+        self.statement = statement
+        self.lock = lock
+
+
+DEFAULT_TIMEOUTS = Timeouts()
+
+
+def configureTimeouts(connect=None, statement=None, lock=None):
+    """
+    Brief description:
+        Changes the default timeouts used for connections opened from now on.
+
+    Parameters:
+        connect (int, optional): Connect timeout in seconds.
+        statement (int, optional): Statement timeout in seconds.
+        lock (int, optional): Lock timeout in seconds.
+
+    Returns:
+        Timeouts: The updated defaults.
+    """
+    if connect is not None:
+        DEFAULT_TIMEOUTS.connect = connect
+    if statement is not None:
+        DEFAULT_TIMEOUTS.statement = statement
+    if lock is not None:
+        DEFAULT_TIMEOUTS.lock = lock
+    return DEFAULT_TIMEOUTS
+
+
+def splitHostPort(host, defaultPort=None):
+    """
+    Brief description:
+        Splits an optional port off a host given as "host:port" or "[ipv6]:port".
+        A bare IPv6 address (several colons, no brackets) is returned unchanged.
+
+    Parameters:
+        host (str): Host, optionally followed by a port.
+        defaultPort (int, optional): Port returned when the host has none.
+
+    Returns:
+        tuple[str, int or None]: The host and the port.
+
+    Raises:
+        ValueError: If the port is not a number between 1 and 65535.
+    """
+    host = host.strip()
+    if host.startswith("["):
+        address, _, rest = host[1:].partition("]")
+        if not rest:
+            return address, defaultPort
+        if not rest.startswith(":"):
+            raise ValueError(f"Invalid host: {host!r}")
+        host, port = address, rest[1:]
+    elif host.count(":") == 1:
+        host, port = host.split(":")
+    else:
+        return host, defaultPort
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Invalid port in host {host!r}: {port!r}")
+    return host, int(port)
+
+
+class Dialect(ABC):
+    """
+    Brief description:
+        Base class for a database dialect backend. Subclasses must implement
+        connect(), replicationLag() and cancel().
+
+    Attributes:
+        name (str): Engine name shown in the UI ("PostgreSQL" or "MSSQL").
+        driverModule (str): Import path of the DB-API driver used by this dialect.
+    """
+    name = None
+    driverModule = None
+
+    def __init__(self):
+        self._driver = None
+
+    @property
+    def driver(self):
+        """
+        Brief description:
+            Imports the driver module on first access and caches it.
+
+        Returns:
+            module: The DB-API driver module.
+        """
+        if self._driver is None:
+            self._driver = importlib.import_module(self.driverModule)
+        return self._driver
+
+    @abstractmethod
+    def connect(self, host, user, password, database, timeouts, readOnly=False):
+        """
+        Brief description:
+            Opens a connection to the given database with the given timeouts applied.
+
+        Parameters:
+            host (str): Host address of the database server, optionally as "host:port"
+            user (str): Username for authentication
+            password (str): Password for authentication
+            database (str): Name of the database to connect to
+            timeouts (Timeouts): Connect, statement and lock timeouts
+            readOnly (bool, optional): Open a read-only session, as used for replicas
+
+        Returns:
+            A database connection object
+        """
+
+    @abstractmethod
+    def replicationLag(self, conn):
+        """
+        Brief description:
+            Measures how far the server behind a connection lags behind its primary.
+
+        Parameters:
+            conn: An open connection.
+
+        Returns:
+            float or None: Lag in seconds (0 for a primary or a caught-up replica),
+                           or None if it cannot be determined.
+        """
+
+    @abstractmethod
+    def cancel(self, conn, cursor=None):
+        """
+        Brief description:
+            Asks the server to cancel the statement currently running on a connection.
+            Safe to call from another thread.
+
+        Parameters:
+            conn: The connection running the statement.
+            cursor (optional): The cursor running the statement, if known.
+
+        Returns:
+            None
+        """
+
+
+class PostgresDialect(Dialect):
+    name = "PostgreSQL"
+    driverModule = "psycopg2"
+    port = 5432
+    # Seconds a streaming standby may go without a message from the primary, which sends
+    # keepalives at least every wal_sender_timeout / 2 (30s by default)
+    receiverSilence = 60
+
+    def connect(self, host, user, password, database, timeouts, readOnly=False):
+        host, port = splitHostPort(host, self.port)
+        options = f"-c statement_timeout={timeouts.statement * 1000} -c lock_timeout={timeouts.lock * 1000}"
+        if readOnly:
+            options += " -c default_transaction_read_only=on"
+        return self.driver.connect(
+            dbname=database,
+            user=user,
+            password=password,
+            host=host,
+            port=port,
+            connect_timeout=timeouts.connect,
+            options=options
+        )
+
+    def replicationLag(self, conn):
+        # A standby that has replayed everything it received is current, however old its
+        # last replayed transaction is (an idle primary commits nothing), but only while its
+        # WAL receiver is streaming and hearing from the primary: a disconnected standby has
+        # also replayed everything it received, while falling further behind
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT pg_is_in_recovery(),
+                       r.status,
+                       pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(),
+                       EXTRACT(EPOCH FROM now() - r.last_msg_receipt_time),
+                       EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+                FROM (SELECT 1) AS one
+                LEFT JOIN pg_stat_wal_receiver r ON true
+            """)
+            inRecovery, status, caughtUp, silence, replayAge = cur.fetchone()
+        if not inRecovery:
+            return 0.0
+        replayLag = None if replayAge is None else float(replayAge)
+        if status == "streaming" and silence is not None and float(silence) <= self.receiverSilence:
+            return 0.0 if caughtUp else replayLag
+        # Not streaming (or the status is hidden from this role): only the replay age is known
+        return replayLag
+
+    def cancel(self, conn, cursor=None):
+        # Sends a cancel request for the backend, like pg_cancel_backend()
+        conn.cancel()
+
+
+class MSSQLDialect(Dialect):
+    name = "MSSQL"
+    driverModule = "pyodbc"
+    odbcDriver = "ODBC Driver 17 for SQL Server"
+
+    def connect(self, host, user, password, database, timeouts, readOnly=False):
+        # SQL Server writes the port after a comma
+        host, port = splitHostPort(host)
+        server = host if port is None else f"{host},{port}"
+        connectionString = (
+            f"DRIVER={{{self.odbcDriver}}};"
+            f"SERVER={server};DATABASE={database};UID={user};PWD={password}"
+        )
+        if readOnly:
+            # Required to be routed to / accepted by a readable Availability Group secondary
+            connectionString += ";ApplicationIntent=ReadOnly"
+        conn = self.driver.connect(connectionString, timeout=timeouts.connect)
+        # Query timeout, enforced by the ODBC driver through SQLCancel
+        conn.timeout = timeouts.statement
+        cur = conn.cursor()
+        cur.execute(f"SET LOCK_TIMEOUT {timeouts.lock * 1000 if timeouts.lock else -1}")
+        cur.close()
+        return conn
+
+    def cancel(self, conn, cursor=None):
+        # ODBC cancels per statement handle
+        if cursor is not None:
+            cursor.cancel()
+
+    def replicationLag(self, conn):
+        # Databases outside an Availability Group have no row and are their own primary
+        cur = conn.cursor()
+        try:
+            cur.execute("""
+                SELECT is_primary_replica, secondary_lag_seconds
+                FROM sys.dm_hadr_database_replica_states
+                WHERE is_local = 1 AND database_id = DB_ID()
+            """)
+            row = cur.fetchone()
+        finally:
+            cur.close()
+        if row is None or row[0]:
+            return 0.0
+        return None if row[1] is None else float(row[1])
+
+
+DIALECTS = {
+    PostgresDialect.name: PostgresDialect,
+    MSSQLDialect.name: MSSQLDialect,
+}
+
+_instances = {}
+
+
+def registerDialect(dialectClass):
+    """
+    Brief description:
+        Registers an additional dialect backend under its engine name.
+
+    Parameters:
+        dialectClass (type): A Dialect subclass with `name` and `driverModule` set.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If the class is not a complete Dialect implementation.
+    """
+    if not (isinstance(dialectClass, type) and issubclass(dialectClass, Dialect)):
+        raise TypeError(f"{dialectClass!r} is not a Dialect subclass")
+    if inspect.isabstract(dialectClass):
+        missing = ", ".join(sorted(dialectClass.__abstractmethods__))
+        raise TypeError(f"Dialect {dialectClass.__name__} does not implement: {missing}")
+    if not dialectClass.name or not dialectClass.driverModule:
+        raise TypeError(f"Dialect {dialectClass.__name__} must set name and driverModule")
+    DIALECTS[dialectClass.name] = dialectClass
+    _instances.pop(dialectClass.name, None)
+
+
+def getDialect(engine):
+    """
+    Brief description:
+        Resolves the dialect backend for an engine, creating it on first use.
+
+    Parameters:
+        engine (str): Database engine type ('PostgreSQL' or 'MSSQL')
+
+    Returns:
+        Dialect: The dialect backend.
+
+    Raises:
+        ValueError: If the database engine is not supported
+    """
+    if engine not in _instances:
+        dialectClass = DIALECTS.get(engine)
+        if dialectClass is None:
+            raise ValueError("Unsupported database engine")
+        _instances[engine] = dialectClass()
+    return _instances[engine]
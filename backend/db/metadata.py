@@ -1,9 +1,173 @@
-import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from backend.db.dbConnection import connectToDatabase
+"""
+Catalog queries. Every query is a named, parameterized statement (see QUERIES)
+executed through backend.db.statements, so it is prepared once per connection
+and reused with bound parameters instead of being re-sent as ad-hoc SQL.
+"""
+from datetime import datetime
 
-def getSchemas(engine, host, user, password, database):
+from backend.db.dbConnection import borrowConnection
+from backend.db.columns import Column
+from backend.db.statements import preparedFor
+
+COLUMN_FIELDS_POSTGRES = """
+    c.column_name, c.data_type, c.character_maximum_length,
+    c.numeric_precision, COALESCE(c.numeric_scale, c.datetime_precision),
+    c.collation_name, format_type(a.atttypid, a.atttypmod)
+    FROM information_schema.columns c
+    JOIN pg_catalog.pg_attribute a
+        ON a.attrelid = (quote_ident(c.table_schema) || '.' || quote_ident(c.table_name))::regclass
+        AND a.attname = c.column_name
+"""
+
+COLUMN_FIELDS_MSSQL = """
+    COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH,
+    NUMERIC_PRECISION, COALESCE(NUMERIC_SCALE, DATETIME_PRECISION),
+    CASE WHEN COLLATION_NAME <> CAST(DATABASEPROPERTYEX(DB_NAME(), 'Collation') AS nvarchar(128))
+        THEN COLLATION_NAME END,
+    NULL
+    FROM INFORMATION_SCHEMA.COLUMNS
+"""
+
+# Named catalog queries: PostgreSQL entries are (paramTypes, sql with $n placeholders),
+# MSSQL entries are sql with ? placeholders.
+QUERIES = {
+    "schemas": {
+        "PostgreSQL": ((), """
+            SELECT schema_name
+            FROM information_schema.schemata
+            WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+            ORDER BY schema_name
+        """),
+        "MSSQL": """
+            SELECT DISTINCT s.name
+            FROM sys.schemas s
+            INNER JOIN sys.tables t ON s.schema_id = t.schema_id
+            WHERE s.name NOT IN ('guest', 'INFORMATION_SCHEMA', 'sys', 'db_owner', 'db_accessadmin', 'db_securityadmin')
+            ORDER BY s.name
+        """,
+    },
+    "tables": {
+        "PostgreSQL": (("text",), """
+            SELECT c.relname
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = $1
+            AND c.relkind IN ('r', 'p')
+            AND NOT c.relispartition
+        """),
+        "MSSQL": """
+            SELECT TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+            AND TABLE_SCHEMA = ?
+        """,
+    },
+    "columns": {
+        "PostgreSQL": (("text", "text"), f"""
+            SELECT {COLUMN_FIELDS_POSTGRES}
+            WHERE c.table_schema = $1
+            AND c.table_name = $2
+            ORDER BY c.ordinal_position
+        """),
+        "MSSQL": f"""
+            SELECT {COLUMN_FIELDS_MSSQL}
+            WHERE TABLE_SCHEMA = ?
+            AND TABLE_NAME = ?
+            ORDER BY ORDINAL_POSITION
+        """,
+    },
+    "schemaColumns": {
+        "PostgreSQL": (("text",), f"""
+            SELECT c.table_name, {COLUMN_FIELDS_POSTGRES}
+            JOIN pg_catalog.pg_class r ON r.oid = a.attrelid
+            WHERE c.table_schema = $1
+            AND NOT r.relispartition
+            ORDER BY c.table_name, c.ordinal_position
+        """),
+        "MSSQL": f"""
+            SELECT TABLE_NAME, {COLUMN_FIELDS_MSSQL}
+            WHERE TABLE_SCHEMA = ?
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """,
+    },
+    "memoryOptimizedTables": {
+        "MSSQL": """
+            SELECT t.name
+            FROM sys.tables t
+            INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+            WHERE s.name = ? AND t.is_memory_optimized = 1
+        """,
+    },
+    "partitionKeys": {
+        "PostgreSQL": (("text",), """
+            SELECT c.relname, a.attname
+            FROM pg_catalog.pg_partitioned_table p
+            JOIN pg_catalog.pg_class c ON c.oid = p.partrelid
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL unnest(p.partattrs::int2[]) WITH ORDINALITY AS k(attnum, position)
+            JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum = k.attnum
+            WHERE n.nspname = $1
+            ORDER BY c.relname, k.position
+        """),
+        "MSSQL": """
+            SELECT t.name, c.name
+            FROM sys.tables t
+            INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+            INNER JOIN sys.indexes i ON i.object_id = t.object_id AND i.index_id IN (0, 1)
+            INNER JOIN sys.partition_schemes ps ON ps.data_space_id = i.data_space_id
+            INNER JOIN sys.index_columns ic
+                ON ic.object_id = i.object_id AND ic.index_id = i.index_id AND ic.partition_ordinal > 0
+            INNER JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+            WHERE s.name = ?
+            ORDER BY t.name, ic.partition_ordinal
+        """,
+    },
+    "lastTableModification": {
+        "MSSQL": """
+            SELECT modify_date, object_id
+            FROM sys.tables
+            WHERE modify_date = (SELECT MAX(modify_date) FROM sys.tables)
+        """,
+    },
+    "modifiedTables": {
+        "MSSQL": """
+            SELECT s.name, t.name, t.modify_date, t.object_id
+            FROM sys.tables t
+            INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+            WHERE t.modify_date >= ?
+            ORDER BY t.modify_date, t.object_id
+        """,
+    },
+    "routineSignatures": {
+        "PostgreSQL": (("text", "text"), """
+            SELECT quote_ident(n.nspname) || '.' || quote_ident(p.proname)
+                || '(' || pg_get_function_identity_arguments(p.oid) || ')'
+            FROM pg_catalog.pg_proc p
+            JOIN pg_catalog.pg_namespace n ON n.oid = p.pronamespace
+            WHERE n.nspname = $1
+            AND p.proname = lower($2)
+        """),
+    },
+    "permissions": {
+        "PostgreSQL": (("text", "text", "text"), """
+            SELECT column_name,
+                has_column_privilege($1, quote_ident($2) || '.' || quote_ident($3), column_name, 'SELECT') AS can_read,
+                has_column_privilege($1, quote_ident($2) || '.' || quote_ident($3), column_name, 'UPDATE') AS can_write
+            FROM information_schema.columns
+            WHERE table_schema = $2 AND table_name = $3
+        """),
+        "MSSQL": """
+            SELECT c.name AS column_name,
+                CASE WHEN perm.permission_name = 'SELECT' THEN 1 ELSE 0 END AS can_read,
+                CASE WHEN perm.permission_name = 'UPDATE' THEN 1 ELSE 0 END AS can_write
+            FROM sys.columns c
+            LEFT JOIN sys.database_permissions perm ON c.object_id = perm.major_id AND c.column_id = perm.minor_id
+            WHERE object_id = OBJECT_ID(QUOTENAME(?) + '.' + QUOTENAME(?))
+        """,
+    },
+}
+
+def getSchemas(engine, host, user, password, database, conn=None, strict=False):
     """
     Retrieve a list of non-system schemas from the database.
 
@@ -13,36 +177,25 @@ def getSchemas(engine, host, user, password, database):
         user (str): Username
         password (str): Password
         database (str): Database name
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
 
     Returns:
         List[str]: List of schema names
     """
     schemas = []
     try:
-        conn = connectToDatabase(engine, host, user, password, database)
-        with conn.cursor() as cur:
-            if engine == "PostgreSQL":
-                cur.execute("""
-                    SELECT schema_name
-                    FROM information_schema.schemata
-                    WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
-                    ORDER BY schema_name;
-                """)
-            elif engine == "MSSQL":
-                cur.execute("""
-                    SELECT DISTINCT s.name
-                    FROM sys.schemas s
-                    INNER JOIN sys.tables t ON s.schema_id = t.schema_id
-                    WHERE s.name NOT IN ('guest', 'INFORMATION_SCHEMA', 'sys', 'db_owner', 'db_accessadmin', 'db_securityadmin')
-                    ORDER BY s.name;
-                """)
-            schemas = [row[0] for row in cur.fetchall()]
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("schemas", QUERIES["schemas"])
+            schemas = [row[0] for row in rows]
     except Exception as e:
+        if strict:
+            raise
         print("Error retrieving schemas:", e)
     return schemas
 
 
-def getTables(engine, host, user, password, database, schema):
+def getTables(engine, host, user, password, database, schema, conn=None, strict=False):
     """
     Retrieve a list of tables from the specified schema.
 
@@ -53,37 +206,28 @@ def getTables(engine, host, user, password, database, schema):
         password (str): Password
         database (str): Database name
         schema (str): Target schema name
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
 
     Returns:
         List[str]: List of table names
     """
     tables = []
     try:
-        conn = connectToDatabase(engine, host, user, password, database)
-        with conn.cursor() as cur:
-            if engine == "PostgreSQL":
-                cur.execute(f"""
-                    SELECT table_name
-                    FROM information_schema.tables
-                    WHERE table_schema = '{schema}'
-                    AND table_type = 'BASE TABLE';
-                """)
-            elif engine == "MSSQL":
-                cur.execute(f"""
-                    SELECT TABLE_NAME
-                    FROM INFORMATION_SCHEMA.TABLES
-                    WHERE TABLE_TYPE = 'BASE TABLE'
-                    AND TABLE_SCHEMA = '{schema}';
-                """)
-            tables = [row[0] for row in cur.fetchall()]
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("tables", QUERIES["tables"], (schema,))
+            tables = [row[0] for row in rows]
     except Exception as e:
+        if strict:
+            raise
         print("Error retrieving tables:", e)
     return tables
 
 
-def getColumns(engine, host, user, password, database, schema, table):
+def getColumns(engine, host, user, password, database, schema, table, conn=None, strict=False):
     """
-    Retrieve the columns and data types for a given table.
+    Retrieve the columns of a given table with their full type metadata
+    (length, precision, scale and non-default collation).
 
     Parameters:
         engine (str): Database engine
@@ -93,34 +237,199 @@ def getColumns(engine, host, user, password, database, schema, table):
         database (str): Database name
         schema (str): Schema name
         table (str): Table name
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
 
     Returns:
-        List[Tuple[str, str]]: List of (column_name, data_type) tuples
+        List[Column]: Columns in ordinal order
     """
     columns = []
     try:
-        conn = connectToDatabase(engine, host, user, password, database)
-        with conn.cursor() as cur:
-            if engine == "PostgreSQL":
-                cur.execute(f"""
-                    SELECT column_name, data_type
-                    FROM information_schema.columns
-                    WHERE table_schema = '{schema}'
-                    AND table_name = '{table}';
-                """)
-            elif engine == "MSSQL":
-                cur.execute(f"""
-                    SELECT COLUMN_NAME, DATA_TYPE
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = '{table}'
-                    AND TABLE_SCHEMA = '{schema}';
-                """)
-            columns = cur.fetchall()
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("columns", QUERIES["columns"], (schema, table))
+            columns = [Column(*row) for row in rows]
     except Exception as e:
+        if strict:
+            raise
         print("Error retrieving columns:", e)
     return columns
 
-def getPermissions(engine, host, user, password, dbname, schema, table):
+def getSchemaColumns(engine, host, user, password, database, schema, conn=None, strict=False):
+    """
+    Retrieve the columns of every table in a schema with a single catalog query.
+
+    Parameters:
+        engine (str): Database engine
+        host (str): Database host
+        user (str): Username
+        password (str): Password
+        database (str): Database name
+        schema (str): Schema name
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
+
+    Returns:
+        Dict[str, List[Column]]: Columns in ordinal order, keyed by table name
+    """
+    columns = {}
+    try:
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("schemaColumns", QUERIES["schemaColumns"], (schema,))
+            for row in rows:
+                columns.setdefault(row[0], []).append(Column(*row[1:]))
+    except Exception as e:
+        if strict:
+            raise
+        print("Error retrieving schema columns:", e)
+    return columns
+
+def getMemoryOptimizedTables(engine, host, user, password, database, schema, conn=None, strict=False):
+    """
+    Retrieve the memory-optimized (In-Memory OLTP) tables of a schema. Only SQL Server
+    has them; other engines return an empty set without querying.
+
+    Parameters:
+        engine (str): Database engine
+        host (str): Database host
+        user (str): Username
+        password (str): Password
+        database (str): Database name
+        schema (str): Schema name
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
+
+    Returns:
+        Set[str]: Names of the memory-optimized tables
+    """
+    if engine != "MSSQL":
+        return set()
+    tables = set()
+    try:
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("memoryOptimizedTables", QUERIES["memoryOptimizedTables"], (schema,))
+            tables = {row[0] for row in rows}
+    except Exception as e:
+        if strict:
+            raise
+        print("Error retrieving memory-optimized tables:", e)
+    return tables
+
+def getPartitionKeys(engine, host, user, password, database, schema, conn=None, strict=False):
+    """
+    Retrieve the partitioned tables of a schema and their partition key columns
+    (declarative partitioning on PostgreSQL, partition schemes on SQL Server).
+    Keys that are expressions rather than plain columns are left out.
+
+    Parameters:
+        engine (str): Database engine
+        host (str): Database host
+        user (str): Username
+        password (str): Password
+        database (str): Database name
+        schema (str): Schema name
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
+
+    Returns:
+        Dict[str, List[str]]: Partition key column names in key order, keyed by table name
+    """
+    keys = {}
+    try:
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("partitionKeys", QUERIES["partitionKeys"], (schema,))
+            for table, column in rows:
+                keys.setdefault(table, []).append(column)
+    except Exception as e:
+        if strict:
+            raise
+        print("Error retrieving partition keys:", e)
+    return keys
+
+def getModifiedTables(engine, host, user, password, database, since, conn=None):
+    """
+    Retrieve the tables created or altered after a point in time, using the
+    modification date SQL Server keeps in sys.tables. Only the changed rows are
+    returned, so this is cheap enough to poll. Other engines return no changes.
+
+    The high-water mark is the last modification date together with the ids of
+    the tables modified at exactly that date: the next call reads from that date
+    inclusive and skips those ids, so a table altered in the same clock tick as
+    the last one seen (modify_date has a few milliseconds of resolution) is not lost.
+
+    Parameters:
+        engine (str): Database engine
+        host (str): Database host
+        user (str): Username
+        password (str): Password
+        database (str): Database name
+        since (tuple or None): High-water mark from the previous call; None only
+                               establishes the mark without reporting changes
+        conn (optional): Open connection to reuse instead of connecting
+
+    Returns:
+        Tuple[List[Tuple[str, str]], tuple]: (schema, table) pairs in modification order,
+                                             and the new high-water mark
+    """
+    if engine != "MSSQL":
+        return [], since
+    changed = []
+    try:
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            statements = preparedFor(engine, conn)
+            if since is None:
+                rows = statements.fetchall("lastTableModification", QUERIES["lastTableModification"])
+                # A database without tables starts from the beginning of time
+                if not rows:
+                    return [], (datetime(1900, 1, 1), frozenset())
+                return [], (rows[0][0], frozenset(row[1] for row in rows))
+            lastDate, seen = since
+            rows = statements.fetchall("modifiedTables", QUERIES["modifiedTables"], (lastDate,))
+            for schema, table, modified, objectId in rows:
+                if modified == lastDate and objectId in seen:
+                    continue
+                changed.append((schema, table))
+                if modified != lastDate:
+                    lastDate, seen = modified, frozenset()
+                seen = seen | {objectId}
+            since = (lastDate, seen)
+    except Exception as e:
+        print("Error retrieving modified tables:", e)
+    return changed, since
+
+def getRoutineSignatures(engine, host, user, password, database, schema, name, conn=None, strict=False):
+    """
+    Retrieve the signatures of every PostgreSQL function with a given name in a schema,
+    so each overload can be dropped before a routine is recreated with a different
+    argument list or result type. Other engines return an empty list without querying.
+
+    Parameters:
+        engine (str): Database engine
+        host (str): Database host
+        user (str): Username
+        password (str): Password
+        database (str): Database name
+        schema (str): Schema name
+        name (str): Unquoted routine name, as written in the generated SQL
+        conn (optional): Open connection to reuse instead of connecting
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result
+
+    Returns:
+        List[str]: Schema-qualified signatures such as "public.insertproduct(p_name character varying, p_price numeric)"
+    """
+    if engine != "PostgreSQL":
+        return []
+    signatures = []
+    try:
+        with borrowConnection(engine, host, user, password, database, conn) as conn:
+            rows = preparedFor(engine, conn).fetchall("routineSignatures", QUERIES["routineSignatures"], (schema, name))
+            signatures = [row[0] for row in rows]
+    except Exception as e:
+        if strict:
+            raise
+        print("Error retrieving routine signatures:", e)
+    return signatures
+
+def getPermissions(engine, host, user, password, dbname, schema, table, conn=None, strict=False):
     """
     Brief description:
         Retrieves column-level read and write permissions for a given user on a specified table,
@@ -134,33 +443,18 @@ def getPermissions(engine, host, user, password, dbname, schema, table):
         dbname (str): Name of the target database.
         schema (str): Schema where the table resides.
         table (str): Name of the target table.
+        conn (optional): Open connection to reuse instead of connecting.
+        strict (bool, optional): Raise errors instead of printing them and returning an empty result.
 
     Returns:
         list[tuple]: A list of tuples containing column names and corresponding read/write flags.
                      Returns an empty list if an error occurs.
     """
     try:
-        conn = connectToDatabase(engine, host, user, password, dbname)
-        with conn.cursor() as cur:
-            if engine == "PostgreSQL":
-                cur.execute(f"""
-                    SELECT column_name,
-                        has_column_privilege('{user}', '{schema}.{table}', column_name, 'SELECT') AS can_read,
-                        has_column_privilege('{user}', '{schema}.{table}', column_name, 'UPDATE') AS can_write
-                    FROM information_schema.columns
-                    WHERE table_schema = %s AND table_name = %s;
-                """, (schema, table))
-                return cur.fetchall()
-            elif engine == "MSSQL":
-                cur.execute(f"""
-                    SELECT c.name AS column_name,
-                        CASE WHEN perm.permission_name = 'SELECT' THEN 1 ELSE 0 END AS can_read,
-                        CASE WHEN perm.permission_name = 'UPDATE' THEN 1 ELSE 0 END AS can_write
-                    FROM sys.columns c
-                    LEFT JOIN sys.database_permissions perm ON c.object_id = perm.major_id AND c.column_id = perm.minor_id
-                    WHERE object_id = OBJECT_ID('{schema}.{table}');
-                """)
-                return cur.fetchall()
+        with borrowConnection(engine, host, user, password, dbname, conn) as conn:
+            return preparedFor(engine, conn).fetchall("permissions", QUERIES["permissions"], (user, schema, table))
     except Exception as e:
+        if strict:
+            raise
         print(f"Error fetching permissions: {e}")
         return []
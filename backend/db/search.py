@@ -0,0 +1,114 @@
+"""
+This module provides an in-memory search index over the table and column names
+of a schema, built from the session catalog cache. Table names and column names
+are indexed by trigram, so each keystroke in the table selector is answered
+from posting-set intersections instead of scanning every name or querying the
+database. Queries like "column:tenant_id" find the tables containing a column.
+"""
+
+COLUMN_PREFIXES = ("column:", "col:")
+GRAM_SIZE = 3
+
+
+def trigrams(text):
+    """
+    Brief description:
+        Returns the set of trigrams of a (lower-cased) name.
+
+    Parameters:
+        text (str): The name.
+
+    Returns:
+        set[str]: Its trigrams; empty if the name is shorter than three characters.
+    """
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class NameIndex:
+    """
+    Brief description:
+        Trigram index over a list of names, answering case-insensitive substring queries.
+
+    Attributes:
+        names (list[str]): Indexed names, in their original order.
+    """
+    def __init__(self, names):
+        self.names = list(names)
+        self._lower = [name.lower() for name in self.names]
+        self._postings = {}
+        for position, name in enumerate(self._lower):
+            for gram in trigrams(name):
+                self._postings.setdefault(gram, set()).add(position)
+
+    def search(self, text):
+        """
+        Brief description:
+            Finds the names containing a substring. Queries of three characters or more
+            are narrowed with the trigram postings before the substring check; shorter
+            ones are checked against every name.
+
+        Parameters:
+            text (str): Substring to look for (case-insensitive).
+
+        Returns:
+            set[int]: Positions of the matching names in `names`.
+        """
+        text = text.lower()
+        grams = trigrams(text)
+        if not grams:
+            return {position for position, name in enumerate(self._lower) if text in name}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {position for position in candidates if text in self._lower[position]}
+
+
+class CatalogIndex:
+    """
+    Brief description:
+        Search index over the tables of one schema and their columns.
+
+    Attributes:
+        tables (list[str]): Table names, in catalog order.
+    """
+    def __init__(self, tables, tableColumns):
+        self.tables = list(tables)
+        self._tableIndex = NameIndex(self.tables)
+        tablesByColumn = {}
+        positions = {table: position for position, table in enumerate(self.tables)}
+        for table, columns in tableColumns.items():
+            if table not in positions:
+                continue
+            for column in columns:
+                tablesByColumn.setdefault(column.name, set()).add(positions[table])
+        self._columnIndex = NameIndex(tablesByColumn)
+        self._tablesByColumn = [tablesByColumn[name] for name in self._columnIndex.names]
+
+    def search(self, query):
+        """
+        Brief description:
+            Returns the tables matching a query. The query is split on whitespace; plain
+            terms match table names and "column:<name>" (or "col:<name>") terms match
+            tables having a column whose name contains <name>. All terms must match.
+
+        Parameters:
+            query (str): The search query, e.g. "order column:tenant_id".
+
+        Returns:
+            list[str]: Matching table names, in catalog order. An empty query matches every table.
+        """
+        matches = None
+        for term in query.split():
+            lowered = term.lower()
+            prefix = next((p for p in COLUMN_PREFIXES if lowered.startswith(p)), None)
+            if prefix is not None:
+                found = set()
+                for position in self._columnIndex.search(term[len(prefix):]):
+                    found |= self._tablesByColumn[position]
+            else:
+                found = self._tableIndex.search(term)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        if matches is None:
+            return list(self.tables)
+        return [self.tables[position] for position in sorted(matches)]
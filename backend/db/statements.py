@@ -0,0 +1,196 @@
+"""
+This module runs catalog queries as server-side prepared statements, prepared once
+per connection and then executed with bound parameters only.
+
+PostgreSQL statements are created with PREPARE and run with EXECUTE. On MSSQL,
+each statement gets its own long-lived pyodbc cursor; pyodbc skips the prepare
+step when a cursor runs the same SQL text again, so only the parameters go to
+the server, and the plan is reused from the plan cache.
+"""
+import threading
+import weakref
+from collections import Counter
+
+# Global prepare/execute counters, keyed by "prepare", "execute" and "<kind>:<name>"
+_stats = Counter()
+_statsLock = threading.Lock()
+# Prepared-statement registries per open connection. They are dropped with the
+# connection object; drivers whose connections cannot be weakly referenced (pyodbc)
+# fall back to a map keyed by id(), cleared by forgetConnection().
+_registries = weakref.WeakKeyDictionary()
+_strongRegistries = {}
+_registriesLock = threading.Lock()
+
+
+def _count(kind, name):
+    with _statsLock:
+        _stats[kind] += 1
+        _stats[f"{kind}:{name}"] += 1
+
+
+class PreparedStatements:
+    """
+    Brief description:
+        Registry of the statements already prepared on one connection.
+
+    Attributes:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        conn: The connection the statements are prepared on (None once it is gone).
+    """
+    def __init__(self, engine, conn):
+        self.engine = engine
+        try:
+            # A weak reference, so the registry does not keep its own connection alive
+            self._conn = weakref.ref(conn)
+        except TypeError:
+            self._conn = lambda: conn
+        self._prepared = {}
+        self._running = None
+
+    @property
+    def conn(self):
+        return self._conn()
+
+    def fetchall(self, name, queries, params=()):
+        """
+        Brief description:
+            Executes a named catalog query with bound parameters, preparing it on
+            this connection the first time it is used, and returns all rows.
+
+        Parameters:
+            name (str): Statement name, unique per query.
+            queries (dict): Per-engine query definitions. PostgreSQL entries are
+                            (paramTypes, sql) with $n placeholders; MSSQL entries are
+                            sql with ? placeholders.
+            params (tuple, optional): Values bound to the placeholders.
+
+        Returns:
+            list: Result rows.
+        """
+        if self.engine == "PostgreSQL":
+            return self._fetchPostgres(name, queries["PostgreSQL"], params)
+        if self.engine == "MSSQL":
+            return self._fetchMSSQL(name, queries["MSSQL"], params)
+        raise ValueError("Unsupported database engine")
+
+    def _fetchPostgres(self, name, query, params):
+        statement = f"crud_{name}"
+        with self.conn.cursor() as cur:
+            if statement not in self._prepared:
+                paramTypes, sql = query
+                typeList = f"({', '.join(paramTypes)})" if paramTypes else ""
+                cur.execute(f"PREPARE {statement}{typeList} AS {sql}")
+                self._prepared[statement] = True
+                _count("prepare", name)
+            args = f"({', '.join(['%s'] * len(params))})" if params else ""
+            cur.execute(f"EXECUTE {statement}{args}", params)
+            _count("execute", name)
+            return cur.fetchall()
+
+    def _fetchMSSQL(self, name, sql, params):
+        cur = self._prepared.get(name)
+        if cur is None:
+            cur = self.conn.cursor()
+            self._prepared[name] = cur
+            _count("prepare", name)
+        self._running = cur
+        try:
+            cur.execute(sql, *params)
+            _count("execute", name)
+            return cur.fetchall()
+        finally:
+            self._running = None
+
+    def cancel(self):
+        """
+        Brief description:
+            Cancels the statement this registry is currently running, if any. Safe to
+            call from another thread; passed as the `cursor` of CancelToken.track().
+
+        Returns:
+            None
+        """
+        if self.engine == "MSSQL":
+            cur = self._running
+            if cur is not None:
+                cur.cancel()
+        elif self.conn is not None:
+            self.conn.cancel()
+
+    def close(self):
+        """
+        Brief description:
+            Releases the server-side statements and cursors held for this connection.
+
+        Returns:
+            None
+        """
+        if self.engine == "MSSQL":
+            for cur in self._prepared.values():
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+        self._prepared.clear()
+
+
+def preparedFor(engine, conn):
+    """
+    Brief description:
+        Returns the prepared-statement registry of a connection, creating it on first use.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        conn: An open database connection.
+
+    Returns:
+        PreparedStatements: The registry for this connection.
+    """
+    with _registriesLock:
+        try:
+            registry = _registries.get(conn)
+            weak = True
+        except TypeError:
+            registry = _strongRegistries.get(id(conn))
+            weak = False
+        if registry is None or registry.conn is not conn:
+            registry = PreparedStatements(engine, conn)
+            if weak:
+                _registries[conn] = registry
+            else:
+                _strongRegistries[id(conn)] = registry
+        return registry
+
+
+def forgetConnection(conn):
+    """
+    Brief description:
+        Drops the prepared-statement registry of a connection that is being closed.
+
+    Parameters:
+        conn: The connection being closed.
+
+    Returns:
+        None
+    """
+    with _registriesLock:
+        try:
+            registry = _registries.pop(conn, None)
+        except TypeError:
+            registry = _strongRegistries.pop(id(conn), None)
+    if registry is not None and registry.conn is conn:
+        registry.close()
+
+
+def statementStats():
+    """
+    Brief description:
+        Returns the prepare and execute counters, overall and per statement, so
+        reuse can be checked: a high execute/prepare ratio means prepared plans
+        are being reused.
+
+    Returns:
+        dict: Counter values, e.g. {"prepare": 4, "execute": 120, "prepare:columns": 1, ...}.
+    """
+    with _statsLock:
+        return dict(_stats)
@@ -0,0 +1,394 @@
+"""
+This module generates and/or deploys the same CRUD set to many databases at once.
+
+Targets come from an inventory file (JSON or CSV). They are processed by a thread
+pool with a global concurrency limit and a per-host limit, each target's outcome is
+recorded, and completed targets are saved to a state file so an interrupted or
+partially failed run can be resumed without redoing them.
+"""
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from backend.db.cancel import CancelToken
+from backend.db.catalog import Catalog
+from backend.db.dbConnection import connectToDatabase
+from backend.generators.sharded import generateSharded
+
+INVENTORY_FIELDS = ("engine", "host", "user", "password", "database")
+
+
+class Target:
+    """
+    Brief description:
+        One database to generate for / deploy to.
+
+    Attributes:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        host (str): Hostname or IP address of the database server.
+        user (str): Database username.
+        password (str): Database password.
+        database (str): Database name.
+        replica (str or None): Read replica host used for the catalog reads, if any.
+    """
+    def __init__(self, engine, host, user, password, database, replica=None):
+        self.engine = engine
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.replica = replica
+
+    @property
+    def key(self):
+        """
+        Brief description:
+            Returns a stable identifier for the target, used in reports and the state file.
+
+        Returns:
+            str: "<engine>://<host>/<database>"
+        """
+        return f"{self.engine}://{self.host}/{self.database}"
+
+
+class TargetResult:
+    """
+    Brief description:
+        Outcome of processing one target.
+
+    Attributes:
+        target (Target): The target.
+        status (str): "ok", "failed", "cancelled" (by the run's token or the target deadline)
+                      or "skipped" (already completed in a previous run).
+        statements (int): Number of statements generated.
+        error (str or None): Error message when the target failed or was cancelled.
+        elapsed (float): Seconds spent on the target.
+    """
+    def __init__(self, target, status, statements=0, error=None, elapsed=0.0):
+        self.target = target
+        self.status = status
+        self.statements = statements
+        self.error = error
+        self.elapsed = elapsed
+
+
+def loadInventory(path):
+    """
+    Brief description:
+        Reads connection targets from a JSON file (a list of objects) or a CSV file
+        with a header row. Both use the fields engine, host, user, password, database,
+        and an optional replica field naming a read replica for the catalog reads.
+
+    Parameters:
+        path (str): Path to the inventory file.
+
+    Returns:
+        list[Target]: Targets in file order.
+
+    Raises:
+        ValueError: If an entry is missing a required field.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            entries = json.load(f)
+        else:
+            entries = list(csv.DictReader(f))
+
+    targets = []
+    for index, entry in enumerate(entries, start=1):
+        missing = [field for field in INVENTORY_FIELDS if not str(entry.get(field, "")).strip()]
+        if missing:
+            raise ValueError(f"Inventory entry {index} is missing: {', '.join(missing)}")
+        replica = str(entry.get("replica") or "").strip() or None
+        targets.append(Target(*(str(entry[field]).strip() for field in INVENTORY_FIELDS), replica=replica))
+    return targets
+
+
+def runFingerprint(schema, tables, actions, prefix, deploy, options=None):
+    """
+    Brief description:
+        Identifies the parameters of a run, so the state file only lets a rerun skip
+        targets that completed with the same schema, tables, actions, prefix, mode
+        and generator options.
+
+    Parameters:
+        schema (str): Schema the tables live in.
+        tables (list[str] or None): Tables to process; None means every table in the schema.
+        actions (list[str]): CRUD actions to generate.
+        prefix (str): Prefix for procedure names.
+        deploy (bool): Whether the generated SQL is executed on the targets.
+        options (dict, optional): Generator options for every table.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    payload = json.dumps([schema, sorted(tables) if tables is not None else None, sorted(actions), prefix, deploy,
+                          options or {}], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def loadState(path):
+    """
+    Brief description:
+        Reads the resume state file, mapping target keys to their last recorded status
+        and the fingerprint of the run that recorded it.
+
+    Parameters:
+        path (str): Path to the state file.
+
+    Returns:
+        dict: Target key to state entry; empty if the file does not exist.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def saveState(path, state):
+    """
+    Brief description:
+        Writes the resume state file atomically.
+
+    Parameters:
+        path (str): Path to the state file.
+        state (dict): Target key to state entry.
+
+    Returns:
+        None
+    """
+    tmpPath = f"{path}.tmp"
+    with open(tmpPath, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmpPath, path)
+
+
+def deployStatements(conn, statements, engine=None, tokens=()):
+    """
+    Brief description:
+        Executes generated statements in a single transaction, so a failing target
+        is left unchanged and can simply be retried.
+
+    Parameters:
+        conn: An open database connection.
+        statements (list[str]): SQL statements to execute.
+        engine (str, optional): Database engine, required when tokens are given.
+        tokens (list[CancelToken], optional): Tokens that can cancel the running statement.
+
+    Returns:
+        None
+
+    Raises:
+        OperationCancelled: If one of the tokens is cancelled before a statement starts.
+    """
+    try:
+        with conn.cursor() as cur:
+            for sql in statements:
+                with ExitStack() as stack:
+                    for token in tokens:
+                        stack.enter_context(token.track(engine, conn, cur))
+                    cur.execute(sql)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def interleaveByHost(targets):
+    """
+    Brief description:
+        Reorders targets round-robin across hosts, so workers waiting on one busy
+        host's limit do not hold back targets on other hosts.
+
+    Parameters:
+        targets (list[Target]): Targets in inventory order.
+
+    Returns:
+        list[Target]: Targets in scheduling order.
+    """
+    byHost = {}
+    for target in targets:
+        byHost.setdefault(target.host, []).append(target)
+    ordered = []
+    queues = list(byHost.values())
+    while queues:
+        for queue in queues:
+            ordered.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+
+def processTarget(target, schema, tables, actions, prefix, deploy, outputDir, timeouts=None, tokens=(),
+                  cache=None, options=None):
+    """
+    Brief description:
+        Generates (and optionally deploys) the CRUD set for one target.
+
+    Parameters:
+        target (Target): The target database.
+        schema (str): Schema the tables live in.
+        tables (list[str] or None): Tables to process; None means every table in the schema.
+        actions (list[str]): CRUD actions to generate.
+        prefix (str): Optional prefix for procedure names.
+        deploy (bool): Whether to execute the generated SQL on the target.
+        outputDir (str or None): Directory to write "<database>@<host>.sql" files to.
+        timeouts (Timeouts, optional): Connect, statement and lock timeouts for the target.
+        tokens (list[CancelToken], optional): Tokens that can cancel the target's work.
+        cache (ArtifactCache, optional): Artifact cache shared by all targets, so identical
+                                         tables are rendered once per run.
+        options (dict, optional): Generator options for every table, e.g. {"performance": True}.
+                                  With the MSSQL performance profile, the target's memory-optimized
+                                  tables get natively compiled procedures.
+
+    Returns:
+        int: Number of statements generated.
+    """
+    conn = connectToDatabase(target.engine, target.host, target.user, target.password, target.database, timeouts)
+    catalog = Catalog(target.engine, target.host, target.user, target.password, target.database, conn=conn,
+                      replicaHost=target.replica, tokens=tokens, timeouts=timeouts)
+    try:
+        snapshot = catalog.schemaColumns(schema)
+        # The column snapshot also covers views; only base tables get procedures
+        baseTables = set(catalog.tables(schema))
+        snapshot = {table: columns for table, columns in snapshot.items() if table in baseTables}
+        selected = tables if tables is not None else sorted(snapshot)
+        missing = [table for table in selected if table not in snapshot]
+        if missing:
+            raise ValueError(f"tables not found in {schema}: {', '.join(missing)}")
+        partitionKeys = catalog.partitionKeys(schema)
+        tableOptions = {t: {"partitionKeys": partitionKeys[t]} for t in selected if t in partitionKeys}
+        if options and options.get("performance"):
+            memoryOptimized = catalog.memoryOptimizedTables(schema)
+            for table in selected:
+                if table in memoryOptimized:
+                    tableOptions.setdefault(table, {})["memoryOptimized"] = True
+        statements = generateSharded(target.engine, schema, [(t, snapshot[t]) for t in selected],
+                                     actions, prefix, workers=1, options=options, tableOptions=tableOptions,
+                                     cache=cache)
+
+        if outputDir:
+            fileName = f"{target.database}@{target.host}.sql".replace(os.sep, "_").replace(":", "_")
+            with open(os.path.join(outputDir, fileName), "w", encoding="utf-8") as f:
+                f.write("\n\n".join(statements))
+        if deploy:
+            for token in tokens:
+                token.raiseIfCancelled()
+            conn.autocommit = False
+            deployStatements(conn, statements, target.engine, tokens)
+        return len(statements)
+    finally:
+        catalog.close()
+
+
+def runFanout(targets, schema, actions, tables=None, prefix="", deploy=False, outputDir=None,
+              maxConcurrency=16, perHostLimit=4, statePath=None, resume=True, onResult=None,
+              timeouts=None, targetDeadline=None, cancelToken=None, cache=None, options=None):
+    """
+    Brief description:
+        Processes all targets concurrently and aggregates the per-target results.
+
+    Parameters:
+        targets (list[Target]): Targets, e.g. from loadInventory().
+        schema (str): Schema the tables live in on every target.
+        actions (list[str]): CRUD actions to generate.
+        tables (list[str], optional): Tables to process; None means every table in the schema.
+        prefix (str, optional): Optional prefix for procedure names. Defaults to "".
+        deploy (bool, optional): Execute the generated SQL on each target. Defaults to False.
+        outputDir (str, optional): Directory to write per-target SQL files to.
+        maxConcurrency (int, optional): Targets processed at the same time overall. Defaults to 16.
+        perHostLimit (int, optional): Targets processed at the same time per host. Defaults to 4.
+        statePath (str, optional): State file used to resume; completed targets are recorded there.
+        resume (bool, optional): Skip targets the state file records as completed by a run with the
+                                 same parameters (see runFingerprint). Defaults to True.
+        onResult (callable, optional): Called with each TargetResult as soon as it is available.
+        timeouts (Timeouts, optional): Connect, statement and lock timeouts for every target.
+        targetDeadline (float, optional): Seconds after which a target's running statement is
+                                          cancelled on the server and the target marked cancelled.
+        cancelToken (CancelToken, optional): Cancels the whole run: running statements are
+                                             cancelled and targets not yet finished are marked cancelled.
+        cache (ArtifactCache, optional): Artifact cache for the generated SQL.
+        options (dict, optional): Generator options for every table (see processTarget).
+
+    Returns:
+        list[TargetResult]: Results in the order of `targets`.
+    """
+    if outputDir:
+        os.makedirs(outputDir, exist_ok=True)
+    state = loadState(statePath) if resume else {}
+    run = runFingerprint(schema, tables, actions, prefix, deploy, options)
+    stateLock = threading.Lock()
+    hostLimits = {target.host: threading.Semaphore(perHostLimit) for target in targets}
+    results = {}
+
+    def work(target):
+        previous = state.get(target.key)
+        if previous and previous.get("status") == "ok" and previous.get("run") == run:
+            result = TargetResult(target, "skipped", previous.get("statements", 0))
+        else:
+            start = time.perf_counter()
+            with hostLimits[target.host]:
+                deadline = CancelToken()
+                if targetDeadline:
+                    deadline.cancelAfter(targetDeadline)
+                tokens = [deadline] + ([cancelToken] if cancelToken else [])
+                try:
+                    for token in tokens:
+                        token.raiseIfCancelled()
+                    count = processTarget(target, schema, tables, actions, prefix, deploy, outputDir,
+                                          timeouts, tokens, cache, options)
+                    result = TargetResult(target, "ok", count, elapsed=time.perf_counter() - start)
+                except Exception as e:
+                    elapsed = time.perf_counter() - start
+                    if cancelToken is not None and cancelToken.cancelled:
+                        result = TargetResult(target, "cancelled", error="run cancelled", elapsed=elapsed)
+                    elif deadline.cancelled:
+                        result = TargetResult(target, "cancelled", error=f"deadline of {targetDeadline}s exceeded",
+                                              elapsed=elapsed)
+                    else:
+                        result = TargetResult(target, "failed", error=str(e), elapsed=elapsed)
+                finally:
+                    deadline.close()
+            with stateLock:
+                state[target.key] = {"status": result.status, "statements": result.statements,
+                                     "error": result.error, "finished": time.time(), "run": run}
+                if statePath:
+                    saveState(statePath, state)
+        results[target.key] = result
+        if onResult:
+            onResult(result)
+
+    with ThreadPoolExecutor(max_workers=maxConcurrency) as pool:
+        for future in [pool.submit(work, target) for target in interleaveByHost(targets)]:
+            future.result()
+    return [results[target.key] for target in targets]
+
+
+def formatFanoutReport(results, cache=None):
+    """
+    Brief description:
+        Formats fan-out results as a plain-text report.
+
+    Parameters:
+        results (list[TargetResult]): Per-target results.
+        cache (ArtifactCache, optional): Cache used by the run, whose hit rate is reported.
+
+    Returns:
+        str: The report text.
+    """
+    icons = {"ok": "✅", "skipped": "⏭️", "failed": "❌", "cancelled": "🛑"}
+    lines = []
+    for result in results:
+        detail = result.error if result.error else f"{result.statements} statements"
+        lines.append(f"{icons[result.status]} {result.target.key:<50} {result.elapsed:6.1f}s  {detail}")
+    counts = {status: sum(r.status == status for r in results) for status in icons}
+    lines.append("")
+    lines.append(f"{counts['ok']} ok, {counts['skipped']} skipped, {counts['failed']} failed, "
+                 f"{counts['cancelled']} cancelled of {len(results)} targets.")
+    if cache is not None:
+        lines.append(cache.formatStats())
+    return "\n".join(lines)
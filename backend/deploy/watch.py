@@ -0,0 +1,478 @@
+"""
+This module runs a long-lived watch mode that regenerates and redeploys CRUD
+procedures as soon as the tables they are built from change.
+
+On PostgreSQL an event trigger sends a NOTIFY with the name of every table a DDL
+command touched, and the daemon LISTENs for it, so nothing is polled. SQL Server
+has no such channel; there the daemon polls sys.tables for rows modified after
+the last one it saw. Bursts of changes (a migration altering many tables) are
+debounced into one batch, and only the changed tables are regenerated.
+The event trigger is removed again when the watch that installed it exits,
+unless --keep-trigger is given (--uninstall-trigger removes a kept one).
+
+Usage:
+    python -m backend.deploy.watch --engine PostgreSQL --host localhost --user me \\
+        --database app --schema public --actions Insert Update Delete Filter
+"""
+import argparse
+import getpass
+import os
+import re
+import select
+import threading
+import time
+
+from backend.db.dbConnection import connectToDatabase
+from backend.db.metadata import (getColumns, getMemoryOptimizedTables, getModifiedTables, getPartitionKeys,
+                                  getRoutineSignatures)
+from backend.deploy.fanout import deployStatements
+from backend.generators.sharded import generateSharded
+
+CHANNEL = "crud_ddl"
+
+# Event trigger sending "<schema>.<table>" on CHANNEL for every table a DDL command
+# created or altered. Only tables are reported, so the daemon's own CREATE FUNCTION
+# statements do not wake it up again.
+INSTALL_TRIGGER_POSTGRES = f"""
+    CREATE OR REPLACE FUNCTION public.crud_watch_notify() RETURNS event_trigger AS $$
+    DECLARE
+        changed record;
+    BEGIN
+        FOR changed IN
+            SELECT DISTINCT n.nspname, c.relname
+            FROM pg_event_trigger_ddl_commands() d
+            JOIN pg_class c ON d.classid = 'pg_class'::regclass AND c.oid = d.objid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'p') AND NOT c.relispartition
+        LOOP
+            PERFORM pg_notify('{CHANNEL}', changed.nspname || '.' || changed.relname);
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_event_trigger WHERE evtname = 'crud_watch') THEN
+            CREATE EVENT TRIGGER crud_watch ON ddl_command_end
+                EXECUTE FUNCTION public.crud_watch_notify();
+        END IF;
+    END;
+    $$;
+"""
+
+UNINSTALL_TRIGGER_POSTGRES = """
+    DROP EVENT TRIGGER IF EXISTS crud_watch;
+    DROP FUNCTION IF EXISTS public.crud_watch_notify();
+"""
+
+# Names of the routines a generated statement creates
+ROUTINE_NAME = re.compile(r"CREATE\s+(?:OR\s+(?:REPLACE|ALTER)\s+)?(?:FUNCTION|PROCEDURE)\s+([\w.]+)", re.IGNORECASE)
+
+
+class ChangeDebouncer:
+    """
+    Brief description:
+        Collects changed tables and releases them as one batch once no new change has
+        arrived for `quiet` seconds, or at the latest `maxDelay` seconds after the
+        first change of the batch.
+
+    Attributes:
+        quiet (float): Seconds without changes that end a burst.
+        maxDelay (float): Upper bound on how long a change waits for its batch.
+    """
+    def __init__(self, quiet=2.0, maxDelay=10.0):
+        self.quiet = quiet
+        self.maxDelay = maxDelay
+        self._pending = set()
+        self._first = None
+        self._last = None
+
+    def add(self, tables, now=None):
+        """
+        Brief description:
+            Records changed tables.
+
+        Parameters:
+            tables (iterable[tuple[str, str]]): (schema, table) pairs.
+            now (float, optional): Current monotonic time.
+
+        Returns:
+            None
+        """
+        tables = set(tables)
+        if not tables:
+            return
+        now = time.monotonic() if now is None else now
+        if not self._pending:
+            self._first = now
+        self._pending |= tables
+        self._last = now
+
+    def timeout(self, now=None):
+        """
+        Brief description:
+            Returns how long the caller can wait for more changes before the batch is due.
+
+        Parameters:
+            now (float, optional): Current monotonic time.
+
+        Returns:
+            float or None: Seconds until the batch is due (0 if it is), or None when nothing is pending.
+        """
+        if not self._pending:
+            return None
+        now = time.monotonic() if now is None else now
+        dueAt = min(self._last + self.quiet, self._first + self.maxDelay)
+        return max(0.0, dueAt - now)
+
+    def drain(self, now=None):
+        """
+        Brief description:
+            Returns the pending batch if it is due and starts a new one.
+
+        Parameters:
+            now (float, optional): Current monotonic time.
+
+        Returns:
+            list[tuple[str, str]]: The changed tables, sorted; empty if the batch is not due yet.
+        """
+        if self.timeout(now) != 0.0:
+            return []
+        batch = sorted(self._pending)
+        self._pending = set()
+        self._first = self._last = None
+        return batch
+
+
+def uninstallTrigger(conn):
+    """
+    Brief description:
+        Removes the PostgreSQL event trigger and its notify function, e.g. after a
+        watch that was started with the trigger kept has been retired.
+
+    Parameters:
+        conn: An open PostgreSQL connection.
+
+    Returns:
+        None
+    """
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(UNINSTALL_TRIGGER_POSTGRES)
+
+
+class PostgresChangeSource:
+    """
+    Brief description:
+        Receives table changes from the event trigger through LISTEN/NOTIFY on a
+        dedicated connection.
+
+    Attributes:
+        conn: The listening connection (autocommit).
+        installed (bool): Whether this source created the event trigger (it is then removed by close()).
+    """
+    def __init__(self, conn, installTrigger=True):
+        self.conn = conn
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            self.installed = False
+            if installTrigger:
+                cur.execute("SELECT 1 FROM pg_event_trigger WHERE evtname = 'crud_watch'")
+                self.installed = cur.fetchone() is None
+                cur.execute(INSTALL_TRIGGER_POSTGRES)
+            cur.execute(f"LISTEN {CHANNEL}")
+
+    def close(self, keepTrigger=False):
+        """
+        Brief description:
+            Stops listening and removes the event trigger and its function if this
+            source installed them, so no trace is left in the database.
+
+        Parameters:
+            keepTrigger (bool, optional): Leave the trigger in place. Defaults to False.
+
+        Returns:
+            None
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(f"UNLISTEN {CHANNEL}")
+        if self.installed and not keepTrigger:
+            uninstallTrigger(self.conn)
+
+    def wait(self, timeout):
+        """
+        Brief description:
+            Blocks until a notification arrives or the timeout expires.
+
+        Parameters:
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            set[tuple[str, str]]: (schema, table) pairs reported since the last call.
+        """
+        if not self.conn.notifies:
+            select.select([self.conn], [], [], timeout)
+        self.conn.poll()
+        changed = set()
+        while self.conn.notifies:
+            schema, _, table = self.conn.notifies.pop(0).payload.partition(".")
+            changed.add((schema, table))
+        return changed
+
+
+class MSSQLChangeSource:
+    """
+    Brief description:
+        Polls sys.tables for tables modified after the last seen modification date.
+        Each poll returns only the changed rows, not the catalog.
+
+    Attributes:
+        conn: The polling connection.
+        interval (float): Seconds between polls.
+    """
+    def __init__(self, conn, interval=2.0):
+        self.conn = conn
+        self.interval = interval
+        self._since = getModifiedTables("MSSQL", None, None, None, None, None, conn=conn)[1]
+        self._nextPoll = time.monotonic()
+
+    def wait(self, timeout):
+        """
+        Brief description:
+            Sleeps until the next poll (at most `timeout` seconds) and polls if it is due.
+
+        Parameters:
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            set[tuple[str, str]]: (schema, table) pairs modified since the previous poll.
+        """
+        delay = self._nextPoll - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0.0, delay))
+        self._nextPoll = time.monotonic() + self.interval
+        changed, self._since = getModifiedTables("MSSQL", None, None, None, None, self._since, conn=self.conn)
+        return set(changed)
+
+
+def dropStatements(engine, conn, sql):
+    """
+    Brief description:
+        Returns the statements removing the existing versions of the routines a generated
+        statement creates. Recreating in place is not enough once a table has changed:
+        PostgreSQL cannot change a function's result type with CREATE OR REPLACE and
+        creates a new overload when the argument list differs, and a plain SQL Server
+        CREATE PROCEDURE fails when the procedure exists.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        conn: Connection used to look up the existing PostgreSQL overloads.
+        sql (str): A generated statement.
+
+    Returns:
+        list[str]: DROP statements to execute before the generated statement.
+    """
+    drops = []
+    for name in ROUTINE_NAME.findall(sql):
+        if engine == "PostgreSQL":
+            schema, _, routine = name.rpartition(".")
+            for signature in getRoutineSignatures(engine, None, None, None, None, schema or "public", routine,
+                                                  conn=conn, strict=True):
+                drops.append(f"DROP FUNCTION IF EXISTS {signature};")
+        else:
+            drops.append(f"DROP PROCEDURE IF EXISTS {name};")
+    return drops
+
+
+def regenerate(engine, conn, changed, actions, prefix="", deploy=True, outputDir=None, options=None):
+    """
+    Brief description:
+        Regenerates (and optionally redeploys) the procedures of the changed tables.
+        Tables that no longer exist are skipped. Each procedure replaces its previous
+        versions in its own transaction, so one that fails to deploy is reported and
+        left as it was without rolling back the others.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        conn: Connection used for the column queries and the deployment (autocommit).
+        changed (list[tuple[str, str]]): (schema, table) pairs to regenerate.
+        actions (list[str]): CRUD actions to generate.
+        prefix (str, optional): Optional prefix for procedure names. Defaults to "".
+        deploy (bool, optional): Execute the generated SQL. Defaults to True.
+        outputDir (str, optional): Directory to write "<schema>.<table>.sql" files to.
+        options (dict, optional): Generator options, e.g. {"performance": True}.
+
+    Returns:
+        dict[tuple[str, str], int]: Number of statements generated per regenerated table.
+    """
+    bySchema = {}
+    for schema, table in changed:
+        columns = getColumns(engine, None, None, None, None, schema, table, conn=conn)
+        if columns:
+            bySchema.setdefault(schema, []).append((table, columns))
+
+    counts = {}
+    for schema, tableColumns in bySchema.items():
+        partitionKeys = getPartitionKeys(engine, None, None, None, None, schema, conn=conn)
+        tableOptions = {table: {"partitionKeys": partitionKeys[table]} for table, _ in tableColumns
+                        if table in partitionKeys}
+        if options and options.get("performance"):
+            memoryOptimized = getMemoryOptimizedTables(engine, None, None, None, None, schema, conn=conn)
+            for table, _ in tableColumns:
+                if table in memoryOptimized:
+                    tableOptions.setdefault(table, {})["memoryOptimized"] = True
+        for table, columns in tableColumns:
+            statements = generateSharded(engine, schema, [(table, columns)], actions, prefix,
+                                         workers=1, options=options, tableOptions=tableOptions)
+            if outputDir:
+                with open(os.path.join(outputDir, f"{schema}.{table}.sql"), "w", encoding="utf-8") as f:
+                    f.write("\n\n".join(statements))
+            if deploy:
+                for sql in statements:
+                    try:
+                        drops = dropStatements(engine, conn, sql)
+                        conn.autocommit = False
+                        try:
+                            deployStatements(conn, drops + [sql], engine)
+                        finally:
+                            conn.autocommit = True
+                    except Exception as e:
+                        names = ", ".join(ROUTINE_NAME.findall(sql)) or f"{schema}.{table}"
+                        print(f"Error deploying {names}:", e)
+            counts[(schema, table)] = len(statements)
+    return counts
+
+
+def runWatch(engine, host, user, password, dbname, actions, schemas=None, prefix="", deploy=True,
+             outputDir=None, options=None, quiet=2.0, maxDelay=10.0, pollInterval=2.0,
+             installTrigger=True, keepTrigger=False, stop=None, onBatch=None):
+    """
+    Brief description:
+        Watches the database for table changes and regenerates the procedures of the
+        changed tables after each burst, until `stop` is set.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        host (str): Hostname or IP address of the database server.
+        user (str): Database username (must be allowed to create event triggers on PostgreSQL).
+        password (str): Database password.
+        dbname (str): Target database name.
+        actions (list[str]): CRUD actions to generate.
+        schemas (list[str], optional): Schemas to watch; None watches every schema.
+        prefix (str, optional): Optional prefix for procedure names. Defaults to "".
+        deploy (bool, optional): Execute the regenerated SQL. Defaults to True.
+        outputDir (str, optional): Directory to write the regenerated SQL to.
+        options (dict, optional): Generator options, e.g. {"performance": True}.
+        quiet (float, optional): Seconds without changes that end a burst. Defaults to 2.
+        maxDelay (float, optional): Longest a change waits for its batch. Defaults to 10.
+        pollInterval (float, optional): Seconds between polls on SQL Server. Defaults to 2.
+        installTrigger (bool, optional): Create the PostgreSQL event trigger if missing. Defaults to True.
+        keepTrigger (bool, optional): Leave a trigger this watch created in place when it exits
+                                      (remove it later with uninstallTrigger). Defaults to False.
+        stop (threading.Event, optional): Ends the watch when set.
+        onBatch (callable, optional): Called with the statement counts of each regenerated batch.
+
+    Returns:
+        None
+    """
+    if outputDir:
+        os.makedirs(outputDir, exist_ok=True)
+    stop = stop or threading.Event()
+    listenConn = connectToDatabase(engine, host, user, password, dbname)
+    workConn = connectToDatabase(engine, host, user, password, dbname)
+    workConn.autocommit = True
+    source = None
+    try:
+        if engine == "PostgreSQL":
+            source = PostgresChangeSource(listenConn, installTrigger)
+        else:
+            source = MSSQLChangeSource(listenConn, pollInterval)
+        debouncer = ChangeDebouncer(quiet, maxDelay)
+
+        while not stop.is_set():
+            timeout = debouncer.timeout()
+            changed = source.wait(1.0 if timeout is None else min(timeout, 1.0))
+            debouncer.add((schema, table) for schema, table in changed if schemas is None or schema in schemas)
+            batch = debouncer.drain()
+            if not batch:
+                continue
+            try:
+                counts = regenerate(engine, workConn, batch, actions, prefix, deploy, outputDir, options)
+            except Exception as e:
+                print("Error regenerating procedures:", e)
+                continue
+            if onBatch:
+                onBatch(counts)
+    finally:
+        try:
+            if isinstance(source, PostgresChangeSource):
+                source.close(keepTrigger)
+        except Exception as e:
+            print("Error removing the event trigger:", e)
+        listenConn.close()
+        workConn.close()
+
+
+def printBatch(counts):
+    """
+    Brief description:
+        Prints one line per regenerated table.
+
+    Parameters:
+        counts (dict[tuple[str, str], int]): Statement counts, as passed to onBatch.
+
+    Returns:
+        None
+    """
+    stamp = time.strftime("%H:%M:%S")
+    for (schema, table), count in counts.items():
+        print(f"{stamp} ✅ {schema}.{table}: {count} statements regenerated")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate CRUD procedures when tables change.")
+    parser.add_argument("--engine", choices=["PostgreSQL", "MSSQL"], required=True)
+    parser.add_argument("--host", required=True)
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--password", help="prompted for when omitted")
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--schema", action="append", dest="schemas", help="schema to watch (repeatable; default: all)")
+    parser.add_argument("--actions", nargs="+", default=["Insert", "Update", "Delete", "Filter"])
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--no-deploy", action="store_true", help="only generate, do not execute the SQL")
+    parser.add_argument("--output-dir", help="write the regenerated SQL to this directory")
+    parser.add_argument("--performance", action="store_true", help="use the SQL Server performance profile")
+    parser.add_argument("--debounce", type=float, default=2.0, help="seconds of quiet that end a burst")
+    parser.add_argument("--max-delay", type=float, default=10.0, help="longest a change waits for its batch")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="SQL Server poll interval in seconds")
+    parser.add_argument("--no-install-trigger", action="store_true", help="do not create the PostgreSQL event trigger")
+    parser.add_argument("--keep-trigger", action="store_true", help="leave the PostgreSQL event trigger in place on exit")
+    parser.add_argument("--uninstall-trigger", action="store_true", help="remove the PostgreSQL event trigger and exit")
+    args = parser.parse_args()
+
+    if args.uninstall_trigger and args.engine != "PostgreSQL":
+        parser.error("--uninstall-trigger only applies to PostgreSQL")
+    password = args.password if args.password is not None else getpass.getpass()
+    if args.uninstall_trigger:
+        conn = connectToDatabase(args.engine, args.host, args.user, password, args.database)
+        try:
+            uninstallTrigger(conn)
+        finally:
+            conn.close()
+        print("Event trigger removed.")
+        return
+    print(f"Watching {args.database}@{args.host} for table changes (Ctrl+C to stop)...")
+    try:
+        runWatch(args.engine, args.host, args.user, password, args.database, args.actions,
+                 schemas=args.schemas, prefix=args.prefix, deploy=not args.no_deploy,
+                 outputDir=args.output_dir, options={"performance": True} if args.performance else None,
+                 quiet=args.debounce, maxDelay=args.max_delay, pollInterval=args.poll_interval,
+                 installTrigger=not args.no_install_trigger, keepTrigger=args.keep_trigger, onBatch=printBatch)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
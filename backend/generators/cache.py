@@ -0,0 +1,228 @@
+"""
+This module provides an on-disk, content-addressed cache of generated SQL.
+The artifacts of a table are stored together under the SHA-256 of everything
+their text depends on (column metadata, engine, schema, table, prefix, generator
+options and GENERATOR_VERSION), so a repeat run only renders the tables whose
+metadata changed. Recently used bundles also stay in memory, which makes repeat
+runs and fan-out to identical databases nearly free. Both the files on disk and
+the bundles in memory are bounded in size, evicting the least recently used first.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from backend.generators.crud import GENERATOR_VERSION
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "crud_generator")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+
+
+def fingerprint(engine, schema, table, packedColumns, prefix="", options=None):
+    """
+    Brief description:
+        Computes the cache key of a table's generated artifacts.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        schema (str): Schema name where the table resides.
+        table (str): Table name.
+        packedColumns (tuple[tuple]): Column metadata, as produced by sharded.packColumns().
+        prefix (str, optional): Procedure name prefix. Defaults to "".
+        options (dict, optional): Generator options in effect for the table.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    payload = json.dumps([GENERATOR_VERSION, engine, schema, table, packedColumns, prefix, options or {}],
+                         sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """
+    Brief description:
+        Size-bounded LRU cache of generated SQL on disk, one bundle (action -> SQL)
+        per table fingerprint. Safe to share between threads.
+
+    Attributes:
+        directory (str): Cache directory.
+        maxBytes (int): Size the cache is trimmed back to after each run.
+        maxMemoryBytes (int): Size of SQL text kept in memory across lookups.
+        hits (int): Artifacts served from the cache since the last resetStats().
+        misses (int): Artifacts that had to be rendered since the last resetStats().
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, maxBytes=DEFAULT_MAX_BYTES, maxMemoryBytes=DEFAULT_MAX_MEMORY_BYTES):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.maxMemoryBytes = maxMemoryBytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = None
+        self._loaded = OrderedDict()
+        self._loadedBytes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _index(self):
+        # Sizes and last-use times of the stored bundles, read from disk on first use
+        if self._entries is None:
+            self._entries = {}
+            if os.path.isdir(self.directory):
+                for bucket in os.scandir(self.directory):
+                    if not bucket.is_dir():
+                        continue
+                    for entry in os.scandir(bucket.path):
+                        if entry.name.endswith(".json"):
+                            stat = entry.stat()
+                            self._entries[entry.name[:-5]] = (stat.st_size, stat.st_mtime)
+        return self._entries
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                bundle = json.load(f)
+            # The modification time is the LRU clock across sessions
+            os.utime(path)
+        except (OSError, ValueError):
+            return {}
+        return bundle
+
+    def _remember(self, key, bundle):
+        # Keeps a bundle in memory as the most recently used one; the caller holds the lock
+        self._forget(key)
+        self._loaded[key] = bundle
+        self._loadedBytes += sum(len(sql) for sql in bundle.values())
+        while self._loadedBytes > self.maxMemoryBytes and len(self._loaded) > 1:
+            self._forget(next(iter(self._loaded)))
+
+    def _forget(self, key):
+        bundle = self._loaded.pop(key, None)
+        if bundle is not None:
+            self._loadedBytes -= sum(len(sql) for sql in bundle.values())
+
+    def get(self, key, actions):
+        """
+        Brief description:
+            Returns the cached artifacts of a table and marks them as recently used.
+
+        Parameters:
+            key (str): Cache key from fingerprint().
+            actions (list[str]): Actions being generated; counted as hits or misses.
+
+        Returns:
+            dict[str, str]: Cached SQL by action; actions that are not cached are absent.
+        """
+        with self._lock:
+            bundle = self._loaded.get(key)
+        if bundle is None:
+            bundle = self._read(key)
+        found = {action: bundle[action] for action in actions if action in bundle}
+        with self._lock:
+            if bundle:
+                self._remember(key, bundle)
+                if self._entries is not None and key in self._entries:
+                    self._entries[key] = (self._entries[key][0], time.time())
+            self.hits += len(found)
+            self.misses += len(actions) - len(found)
+        return found
+
+    def put(self, key, artifacts):
+        """
+        Brief description:
+            Stores the artifacts of a table, merged into its existing bundle so artifacts
+            of other actions stay cached. Write errors are reported and otherwise ignored,
+            since the cache is only an optimization.
+
+        Parameters:
+            key (str): Cache key from fingerprint().
+            artifacts (dict[str, str]): Generated SQL by action.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            existing = self._loaded.get(key)
+        bundle = dict(existing if existing is not None else self._read(key))
+        bundle.update(artifacts)
+        path = self._path(key)
+        data = json.dumps(bundle)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmpPath = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmpPath, path)
+        except OSError as e:
+            print("Error writing to the artifact cache:", e)
+            return
+        with self._lock:
+            self._remember(key, bundle)
+            self._index()[key] = (len(data), time.time())
+
+    def trim(self):
+        """
+        Brief description:
+            Evicts the least recently used bundles until the cache fits in maxBytes.
+
+        Returns:
+            int: Number of bundles evicted.
+        """
+        with self._lock:
+            entries = self._index()
+            total = sum(size for size, _ in entries.values())
+            if total <= self.maxBytes:
+                return 0
+            evicted = 0
+            for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+                if total <= self.maxBytes:
+                    break
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+                del entries[key]
+                self._forget(key)
+                total -= size
+                evicted += 1
+            return evicted
+
+    def resetStats(self):
+        """
+        Brief description:
+            Resets the hit and miss counters, e.g. at the start of a run.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hitRate(self):
+        """
+        Brief description:
+            Returns the share of artifacts served from the cache.
+
+        Returns:
+            float: Hit rate between 0 and 1 (0 when nothing was looked up).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def formatStats(self):
+        """
+        Brief description:
+            Formats the hit and miss counters for a run report.
+
+        Returns:
+            str: e.g. "Artifact cache: 95 hits, 5 misses (95.0% hit rate)".
+        """
+        return f"Artifact cache: {self.hits} hits, {self.misses} misses ({self.hitRate:.1%} hit rate)"
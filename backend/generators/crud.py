@@ -2,7 +2,15 @@
 This module contains functions to generate SQL stored procedures
 for CRUD operations (Create, Read, Update, Delete) in PostgreSQL and MSSQL.
 All names are generated in CamelCase with optional prefix.
+Parameters are declared with the exact type of the column they bind to; where
+that is not possible the generated SQL starts with a '-- WARNING:' comment.
 """
+import inspect
+
+from backend.db.columns import asColumns, findColumn, formatType
+
+# Part of every artifact cache key: bump whenever a change alters the generated SQL
+GENERATOR_VERSION = 3
 
 def camelCase(name):
     """
@@ -18,33 +26,114 @@ def camelCase(name):
     parts = name.split('_')
     return parts[0].lower() + ''.join(p.capitalize() for p in parts[1:])
 
+def paramType(column, engine, warnings):
+    """
+    Brief description:
+        Returns the exact SQL type to declare for a parameter bound to the given column,
+        recording a warning when the type can only be approximated.
+
+    Parameters:
+        column (Column): Column the parameter is compared with or assigned to.
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        warnings (list[str]): List the warning message is appended to, if any.
+
+    Returns:
+        str: The SQL type for the parameter.
+    """
+    sqlType, warning = formatType(column, engine)
+    if warning:
+        warnings.append(warning)
+    return sqlType
+
+def filterType(columns, field, engine, warnings):
+    """
+    Brief description:
+        Returns the parameter type for a filter field, falling back to INT (with a warning)
+        when the field is not among the table columns.
+
+    Parameters:
+        columns (list[Column]): Table columns.
+        field (str): Name of the filter field.
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        warnings (list[str]): List the warning message is appended to, if any.
+
+    Returns:
+        str: The SQL type for the filter parameter.
+    """
+    column = findColumn(columns, field)
+    if column is None:
+        warnings.append(f"filter field '{field}' not found in columns; parameter declared as INT")
+        return "INT"
+    return paramType(column, engine, warnings)
+
+def withWarnings(sql, warnings):
+    """
+    Brief description:
+        Prefixes generated SQL with one '-- WARNING:' comment line per type mismatch.
+
+    Parameters:
+        sql (str): Generated SQL code.
+        warnings (list[str]): Warning messages collected while generating.
+
+    Returns:
+        str: The SQL code, preceded by the warning comments if there are any.
+    """
+    if not warnings:
+        return sql
+    header = ''.join(f"\n    -- WARNING: {message}" for message in dict.fromkeys(warnings))
+    return header + sql
+
+def partitionColumns(columns, partitionKeys, exclude=()):
+    """
+    Brief description:
+        Resolves the partition key columns that must be added to a procedure's parameters
+        and WHERE clause so the planner can prune partitions.
+
+    Parameters:
+        columns (list[Column]): Table columns.
+        partitionKeys (list[str] or None): Partition key column names of the table.
+        exclude (iterable[str], optional): Columns already filtered on.
+
+    Returns:
+        list[Column]: The partition key columns not in `exclude`, in key order.
+    """
+    keys = []
+    for name in partitionKeys or ():
+        column = findColumn(columns, name)
+        if column is not None and name not in exclude:
+            keys.append(column)
+    return keys
+
 def generateInsertPostgres(schema, table, columns, prefix=""):
     """
     Brief description:
         Generates a PostgreSQL INSERT function that inserts a new record into the specified table,
-        excluding the 'id' column, and returns the generated ID.
+        excluding the 'id' column, and returns the generated ID typed like the 'id' column.
 
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
-        columns (list[tuple]): List of (column_name, data_type) tuples.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
         prefix (str, optional): Optional prefix for the function name. Defaults to "".
 
     Returns:
         str: The complete SQL code for creating the INSERT function in PostgreSQL.
     """
-    colNames = [col[0] for col in columns if col[0] != 'id']
-    params = ', '.join([f"p_{col} {dtype}" for col, dtype in columns if col != 'id'])
+    columns = asColumns(columns)
+    warnings = []
+    idSqlType = filterType(columns, 'id', 'PostgreSQL', warnings)
+    colNames = [col.name for col in columns if col.name != 'id']
+    params = ', '.join([f"p_{col.name} {paramType(col, 'PostgreSQL', warnings)}" for col in columns if col.name != 'id'])
     insertCols = ', '.join(colNames)
     values = ', '.join([f"p_{col}" for col in colNames])
     funcName = f"{prefix}Insert{table.capitalize()}"
     fullName = f"{schema}.{funcName}"
 
-    return f"""
+    return withWarnings(f"""
     CREATE OR REPLACE FUNCTION {fullName}({params})
-    RETURNS INT AS $$
+    RETURNS {idSqlType} AS $$
     DECLARE
-        v_id INT;
+        v_id {idSqlType};
     BEGIN
         INSERT INTO {schema}.{table} ({insertCols})
         VALUES ({values})
@@ -53,9 +142,9 @@ def generateInsertPostgres(schema, table, columns, prefix=""):
         RETURN v_id;
     END;
     $$ LANGUAGE plpgsql;
-    """
+    """, warnings)
 
-def generateDeletePostgres(schema, table, prefix="", filterField="id"):
+def generateDeletePostgres(schema, table, columns, prefix="", filterField="id", partitionKeys=None):
     """
     Brief description:
         Generates a PostgreSQL DELETE function that removes a record from the specified table
@@ -64,24 +153,34 @@ def generateDeletePostgres(schema, table, prefix="", filterField="id"):
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
+        columns (list[Column]): Table columns, used to type the filter parameter.
         prefix (str, optional): Optional prefix for the function name. Defaults to "".
         filterField (str, optional): Column to use as the condition in the WHERE clause. Defaults to "id".
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
 
     Returns:
         str: The complete SQL code for creating the DELETE function in PostgreSQL.
     """
+    columns = asColumns(columns)
+    warnings = []
+    filterSqlType = filterType(columns, filterField, 'PostgreSQL', warnings)
+    keys = partitionColumns(columns, partitionKeys, exclude=[filterField])
+    params = ', '.join([f"p_{filterField} {filterSqlType}"]
+                       + [f"p_{col.name} {paramType(col, 'PostgreSQL', warnings)}" for col in keys])
+    whereClause = ' AND '.join([f"{filterField} = p_{filterField}"] + [f"{col.name} = p_{col.name}" for col in keys])
     funcName = f"{prefix}Delete{table.capitalize()}"
     fullName = f"{schema}.{funcName}"
-    return f"""
-    CREATE OR REPLACE FUNCTION {fullName}(p_{filterField} INT)
+    return withWarnings(f"""
+    CREATE OR REPLACE FUNCTION {fullName}({params})
     RETURNS VOID AS $$
     BEGIN
-        DELETE FROM {schema}.{table} WHERE {filterField} = p_{filterField};
+        DELETE FROM {schema}.{table} WHERE {whereClause};
     END;
     $$ LANGUAGE plpgsql;
-    """
+    """, warnings)
 
-def generateUpdatePostgres(schema, table, columns, prefix="", filterField="id"):
+def generateUpdatePostgres(schema, table, columns, prefix="", filterField="id", partitionKeys=None):
     """
     Brief description:
         Generates a PostgreSQL UPDATE function that updates all columns in the given table
@@ -90,30 +189,37 @@ def generateUpdatePostgres(schema, table, columns, prefix="", filterField="id"):
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
-        columns (list[tuple]): List of (column_name, data_type) tuples.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
         prefix (str, optional): Optional prefix for the function name. Defaults to "".
         filterField (str, optional): Column to use as the condition in the WHERE clause. Defaults to "id".
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
 
     Returns:
         str: The complete SQL code for creating the UPDATE function in PostgreSQL.
-    """   
-    sets = ', '.join([f"{col} = p_{col}" for col, _ in columns if col != filterField])
-    params = ', '.join([f"p_{col} {dtype}" for col, dtype in columns])
+    """
+    columns = asColumns(columns)
+    warnings = []
+    keys = partitionColumns(columns, partitionKeys, exclude=[filterField])
+    fixed = {filterField} | {col.name for col in keys}
+    sets = ', '.join([f"{col.name} = p_{col.name}" for col in columns if col.name not in fixed])
+    params = ', '.join([f"p_{col.name} {paramType(col, 'PostgreSQL', warnings)}" for col in columns])
+    whereClause = ' AND '.join([f"{filterField} = p_{filterField}"] + [f"{col.name} = p_{col.name}" for col in keys])
     funcName = f"{prefix}Update{table.capitalize()}"
     fullName = f"{schema}.{funcName}"
 
-    return f"""
+    return withWarnings(f"""
     CREATE OR REPLACE FUNCTION {fullName}({params})
     RETURNS VOID AS $$
     BEGIN
         UPDATE {schema}.{table}
         SET {sets}
-        WHERE {filterField} = p_{filterField};
+        WHERE {whereClause};
     END;
     $$ LANGUAGE plpgsql;
-    """
+    """, warnings)
 
-def generateSelectPostgres(schema, table, columns, prefix="", filterFields=None):
+def generateSelectPostgres(schema, table, columns, prefix="", filterFields=None, partitionKeys=None):
     """
     Brief description:
         Generates a PostgreSQL SELECT function that returns all columns from a table,
@@ -122,10 +228,12 @@ def generateSelectPostgres(schema, table, columns, prefix="", filterFields=None)
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
-        columns (list[tuple]): List of (column_name, data_type) tuples.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
         prefix (str, optional): Optional prefix for the function name. Defaults to "".
         filterFields (list[str], optional): Specific columns to include in the WHERE clause.
                                             If not provided, the first column is used.
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
 
     Returns:
         str: The complete SQL code for creating the SELECT function in PostgreSQL,
@@ -133,27 +241,27 @@ def generateSelectPostgres(schema, table, columns, prefix="", filterFields=None)
     """
     funcName = f"{prefix}Select{table.capitalize()}"
     fullName = f"{schema}.{funcName}"
-    validColumns = [col for col in columns if isinstance(col, tuple) and len(col) == 2]
-    if not validColumns:
+    columns = asColumns(columns)
+    if not columns:
         return f"-- No valid columns found for table {table}"
 
-    colDefs = ', '.join([f"{col} {dtype}" for col, dtype in validColumns])
+    warnings = []
+    colDefs = ', '.join([f"{col.name} {paramType(col, 'PostgreSQL', warnings)}" for col in columns])
 
     if filterFields:
         filters = []
         for field in filterFields:
-            dtype = next((dtype for col, dtype in validColumns if col == field), None)
-            if not dtype:
+            column = findColumn(columns, field)
+            if column is None:
                 return f"-- Filter field '{field}' not found in table {table}"
-            filters.append((field, dtype))
-        paramDefs = ', '.join([f"p_{col} {dtype}" for col, dtype in filters])
-        whereClause = ' AND '.join([f"t.{col} = p_{col}" for col, _ in filters])
+            filters.append(column)
     else:
-        filterCol, filterType = validColumns[0]
-        paramDefs = f"p_{filterCol} {filterType}"
-        whereClause = f"t.{filterCol} = p_{filterCol}"
+        filters = [columns[0]]
+    filters += partitionColumns(columns, partitionKeys, exclude=[col.name for col in filters])
+    paramDefs = ', '.join([f"p_{col.name} {paramType(col, 'PostgreSQL', warnings)}" for col in filters])
+    whereClause = ' AND '.join([f"t.{col.name} = p_{col.name}" for col in filters])
 
-    return f"""
+    return withWarnings(f"""
     CREATE OR REPLACE FUNCTION {fullName}({paramDefs})
     RETURNS TABLE({colDefs}) AS $$
     BEGIN
@@ -162,29 +270,60 @@ def generateSelectPostgres(schema, table, columns, prefix="", filterFields=None)
         WHERE {whereClause};
     END;
     $$ LANGUAGE plpgsql;
-    """
-def normalize_dtype(dtype):
+    """, warnings)
+
+# Hints accepted for Filter procedures in the MSSQL performance profile
+FILTER_HINTS = {"RECOMPILE": "OPTION (RECOMPILE)", "OPTIMIZE FOR UNKNOWN": "OPTION (OPTIMIZE FOR UNKNOWN)"}
+
+def mssqlProcedure(name, params, body, performance=False, memoryOptimized=False):
     """
     Brief description:
-        Normalizes SQL data types by assigning default lengths to character types
-        (e.g., 'varchar' → 'VARCHAR(100)') when unspecified.
+        Wraps a procedure body in the SQL Server CREATE PROCEDURE boilerplate.
+        With the performance profile, the procedure is created with CREATE OR ALTER
+        (so reruns need no DROP) and SET NOCOUNT ON; for memory-optimized tables it
+        is natively compiled as well, with SET NOCOUNT ON inside the ATOMIC block.
 
     Parameters:
-        dtype (str): The raw data type string from the database schema.
+        name (str): Qualified procedure name.
+        params (str): Parameter declarations.
+        body (str): Procedure statements, indented for the BEGIN block.
+        performance (bool, optional): Apply the performance profile. Defaults to False.
+        memoryOptimized (bool, optional): The target table is memory-optimized. Defaults to False.
 
     Returns:
-        str: A properly formatted SQL data type string with default length if needed.
+        str: The complete SQL code for creating the procedure.
+    """
+    if not performance:
+        return f"""
+    CREATE PROCEDURE {name}
+    {params}
+    AS
+    BEGIN
+        {body}
+    END
+    """
+    if memoryOptimized:
+        return f"""
+    CREATE OR ALTER PROCEDURE {name}
+    {params}
+    WITH NATIVE_COMPILATION, SCHEMABINDING
+    AS
+    BEGIN ATOMIC WITH (TRANSACTION ISOLATION LEVEL = SNAPSHOT, LANGUAGE = N'us_english')
+        SET NOCOUNT ON;
+        {body}
+    END
+    """
+    return f"""
+    CREATE OR ALTER PROCEDURE {name}
+    {params}
+    AS
+    BEGIN
+        SET NOCOUNT ON;
+        {body}
+    END
     """
-    dtype_lower = dtype.lower().strip()
-    if dtype_lower in ['varchar', 'char']:
-        return f"{dtype.upper()}(100)"
-    if "varchar" in dtype_lower and "(" not in dtype_lower:
-        return "VARCHAR(100)"
-    if "char" in dtype_lower and "(" not in dtype_lower:
-        return "CHAR(100)"
-    return dtype
 
-def generateInsertMSSQL(schema, table, columns, prefix=""):
+def generateInsertMSSQL(schema, table, columns, prefix="", performance=False, memoryOptimized=False):
     """
     Brief description:
         Generates a SQL Server INSERT stored procedure for the specified table,
@@ -193,29 +332,30 @@ def generateInsertMSSQL(schema, table, columns, prefix=""):
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
-        columns (list[tuple]): List of (column_name, data_type) tuples.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
         prefix (str, optional): Optional prefix for the procedure name. Defaults to "".
+        performance (bool, optional): Use the performance profile (CREATE OR ALTER, SET NOCOUNT ON,
+                                      native compilation for memory-optimized tables). Defaults to False.
+        memoryOptimized (bool, optional): The table is memory-optimized. Defaults to False.
 
     Returns:
         str: The complete SQL code for creating the INSERT stored procedure.
     """
-    colNames = [col[0] for col in columns if col[0] != 'id']
-    params = ', '.join([f"@p_{col} {normalize_dtype(dtype)}" for col, dtype in columns if col != 'id'])
+    columns = asColumns(columns)
+    warnings = []
+    idSqlType = filterType(columns, 'id', 'PostgreSQL', warnings)
+    colNames = [col.name for col in columns if col.name != 'id']
+    params = ', '.join([f"@p_{col.name} {paramType(col, 'MSSQL', warnings)}" for col in columns if col.name != 'id'])
     insertCols = ', '.join(colNames)
     values = ', '.join([f"@p_{col}" for col in colNames])
     name = f"{schema}.{prefix}Insert{table.capitalize()}"
 
-    return f"""
-    CREATE PROCEDURE {name}
-    {params}
-    AS
-    BEGIN
-        INSERT INTO {schema}.{table} ({insertCols})
-        VALUES ({values});
-    END
-    """
+    body = f"""INSERT INTO {schema}.{table} ({insertCols})
+        VALUES ({values});"""
+    return withWarnings(mssqlProcedure(name, params, body, performance, memoryOptimized), warnings)
 
-def generateDeleteMSSQL(schema, table, prefix="", filterField="id"):
+def generateDeleteMSSQL(schema, table, columns, prefix="", filterField="id", performance=False, memoryOptimized=False,
+                        partitionKeys=None):
     """
     Brief description:
         Generates a SQL Server DELETE stored procedure for the specified table,
@@ -224,23 +364,31 @@ def generateDeleteMSSQL(schema, table, prefix="", filterField="id"):
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
+        columns (list[Column]): Table columns, used to type the filter parameter.
         prefix (str, optional): Optional prefix for the procedure name. Defaults to "".
         filterField (str, optional): Column to use in the WHERE clause. Defaults to "id".
+        performance (bool, optional): Use the performance profile (CREATE OR ALTER, SET NOCOUNT ON,
+                                      native compilation for memory-optimized tables). Defaults to False.
+        memoryOptimized (bool, optional): The table is memory-optimized. Defaults to False.
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
 
     Returns:
         str: The complete SQL code for creating the DELETE stored procedure.
     """
+    columns = asColumns(columns)
+    warnings = []
+    filterSqlType = filterType(columns, filterField, 'MSSQL', warnings)
+    keys = partitionColumns(columns, partitionKeys, exclude=[filterField])
+    params = ', '.join([f"@p_{filterField} {filterSqlType}"]
+                       + [f"@p_{col.name} {paramType(col, 'MSSQL', warnings)}" for col in keys])
+    whereClause = ' AND '.join([f"{filterField} = @p_{filterField}"] + [f"{col.name} = @p_{col.name}" for col in keys])
     name = f"{schema}.{prefix}Delete{table.capitalize()}"
-    return f"""
-    CREATE PROCEDURE {name}
-    @p_{filterField} INT
-    AS
-    BEGIN
-        DELETE FROM {schema}.{table} WHERE {filterField} = @p_{filterField};
-    END
-    """
+    body = f"DELETE FROM {schema}.{table} WHERE {whereClause};"
+    return withWarnings(mssqlProcedure(name, params, body, performance, memoryOptimized), warnings)
 
-def generateUpdateMSSQL(schema, table, columns, prefix="", filterField="id"):
+def generateUpdateMSSQL(schema, table, columns, prefix="", filterField="id", performance=False, memoryOptimized=False,
+                        partitionKeys=None):
     """
     Brief description:
         Generates a SQL Server UPDATE stored procedure for the specified table,
@@ -249,29 +397,34 @@ def generateUpdateMSSQL(schema, table, columns, prefix="", filterField="id"):
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
-        columns (list[tuple]): List of (column_name, data_type) tuples.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
         prefix (str, optional): Optional prefix for the procedure name. Defaults to "".
         filterField (str, optional): Column to use in the WHERE clause for filtering. Defaults to "id".
+        performance (bool, optional): Use the performance profile (CREATE OR ALTER, SET NOCOUNT ON,
+                                      native compilation for memory-optimized tables). Defaults to False.
+        memoryOptimized (bool, optional): The table is memory-optimized. Defaults to False.
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
 
     Returns:
         str: The complete SQL code for creating the UPDATE stored procedure.
     """
-    sets = ', '.join([f"{col} = @p_{col}" for col, _ in columns if col != filterField])
-    params = ', '.join([f"@p_{col} {normalize_dtype(dtype)}" for col, dtype in columns])
+    columns = asColumns(columns)
+    warnings = []
+    keys = partitionColumns(columns, partitionKeys, exclude=[filterField])
+    fixed = {filterField} | {col.name for col in keys}
+    sets = ', '.join([f"{col.name} = @p_{col.name}" for col in columns if col.name not in fixed])
+    params = ', '.join([f"@p_{col.name} {paramType(col, 'MSSQL', warnings)}" for col in columns])
+    whereClause = ' AND '.join([f"{filterField} = @p_{filterField}"] + [f"{col.name} = @p_{col.name}" for col in keys])
     name = f"{schema}.{prefix}Update{table.capitalize()}"
 
-    return f"""
-    CREATE PROCEDURE {name}
-    {params}
-    AS
-    BEGIN
-        UPDATE {schema}.{table}
+    body = f"""UPDATE {schema}.{table}
         SET {sets}
-        WHERE {filterField} = @p_{filterField};
-    END
-    """
+        WHERE {whereClause};"""
+    return withWarnings(mssqlProcedure(name, params, body, performance, memoryOptimized), warnings)
 
-def generateSelectMSSQL(schema, table, columns, prefix="", filterFields=None):
+def generateSelectMSSQL(schema, table, columns, prefix="", filterFields=None, performance=False,
+                        memoryOptimized=False, filterHint="RECOMPILE", partitionKeys=None):
     """
     Brief description:
         Generates a SQL Server SELECT stored procedure for the specified table,
@@ -280,44 +433,307 @@ def generateSelectMSSQL(schema, table, columns, prefix="", filterFields=None):
     Parameters:
         schema (str): Schema name where the table resides.
         table (str): Target table name.
-        columns (list[tuple]): List of (column_name, data_type) tuples.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
         prefix (str, optional): Optional prefix for the procedure name. Defaults to "".
         filterFields (list[str], optional): Specific column names to use in the WHERE clause. 
                                             If not provided, the first column is used by default.
+        performance (bool, optional): Use the performance profile (CREATE OR ALTER, SET NOCOUNT ON,
+                                      native compilation for memory-optimized tables). Defaults to False.
+        memoryOptimized (bool, optional): The table is memory-optimized. Defaults to False.
+        filterHint (str or None, optional): Hint added in the performance profile when a filter column
+                                            is not the 'id' key, where parameter sniffing can pick a plan
+                                            that is bad for other values: "RECOMPILE" or
+                                            "OPTIMIZE FOR UNKNOWN". Defaults to "RECOMPILE".
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
 
     Returns:
         str: The complete SQL code for creating the SELECT stored procedure, or
              a comment string if column validation fails.
     """
-    validColumns = [ (row[0], row[1]) for row in columns if len(row) == 2 ]
-   
-    if not validColumns:
-        return f"-- No valid columns found for table {table}"
+    columns = asColumns(columns)
 
-    colDefs = ', '.join([f"{col} {dtype}" for col, dtype in validColumns])
+    if not columns:
+        return f"-- No valid columns found for table {table}"
 
+    warnings = []
     if filterFields:
         filters = []
         for field in filterFields:
-            dtype = next((dtype for col, dtype in validColumns if col == field), None)
-            if not dtype:
+            column = findColumn(columns, field)
+            if column is None:
                 return f"-- Filter field '{field}' not found in table {table}"
-            filters.append((field, dtype))
-        paramDefs = ', '.join([f"@p_{col} {normalize_dtype(dtype)}" for col, dtype in filters])
-        whereClause = ' AND '.join([f"{col} = @p_{col}" for col, _ in filters])
+            filters.append(column)
     else:
-        filterCol, filterType = validColumns[0]
-        paramDefs = f"@p_{filterCol} {normalize_dtype(filterType)}"
-        whereClause = f"{filterCol} = @p_{filterCol}"
+        filters = [columns[0]]
+    sniffable = any(col.name != 'id' for col in filters)
+    filters += partitionColumns(columns, partitionKeys, exclude=[col.name for col in filters])
+    paramDefs = ', '.join([f"@p_{col.name} {paramType(col, 'MSSQL', warnings)}" for col in filters])
+    whereClause = ' AND '.join([f"{col.name} = @p_{col.name}" for col in filters])
 
     name = f"{schema}.{prefix}Select{table.capitalize()}"
 
-    return f"""
-    CREATE PROCEDURE {name}
-    {paramDefs}
-    AS
+    if performance and memoryOptimized:
+        # Natively compiled procedures are schema-bound: no SELECT * and no query hints
+        body = f"""SELECT {', '.join(col.name for col in columns)} FROM {schema}.{table}
+        WHERE {whereClause};"""
+    elif performance and filterHint and sniffable:
+        body = f"""SELECT * FROM {schema}.{table}
+        WHERE {whereClause}
+        {FILTER_HINTS[filterHint]};"""
+    else:
+        body = f"""SELECT * FROM {schema}.{table}
+        WHERE {whereClause};"""
+    return withWarnings(mssqlProcedure(name, paramDefs, body, performance, memoryOptimized), warnings)
+
+STREAM_ACTION = "Filter (streaming)"
+# Rows fetched per round trip by the generated client helpers
+STREAM_BATCH_SIZE = 1000
+
+def resolveFilters(columns, filterFields, partitionKeys=None):
+    """
+    Brief description:
+        Resolves the filter columns of a Filter procedure: the given fields, or the
+        first column when none are given, followed by any partition key columns.
+
+    Parameters:
+        columns (list[Column]): Table columns.
+        filterFields (list[str] or None): Requested filter field names.
+        partitionKeys (list[str], optional): Partition key columns of the table.
+
+    Returns:
+        tuple[list[Column] or None, str or None]: The filter columns, or None and the
+                                                  name of the first field that does not exist.
+    """
+    filters = [] if filterFields else [columns[0]]
+    for field in filterFields or ():
+        column = findColumn(columns, field)
+        if column is None:
+            return None, field
+        filters.append(column)
+    return filters + partitionColumns(columns, partitionKeys, exclude=[col.name for col in filters]), None
+
+def generateSelectCursorPostgres(schema, table, columns, prefix="", filterFields=None, partitionKeys=None):
+    """
+    Brief description:
+        Generates a PostgreSQL SELECT function that opens and returns a refcursor instead of
+        a materialized result set, so callers can FETCH the matching rows in chunks with
+        bounded memory (within the calling transaction). Unless the caller names the cursor,
+        PostgreSQL gives it a unique portal name, so several streams can be open on one connection.
+
+    Parameters:
+        schema (str): Schema name where the table resides.
+        table (str): Target table name.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
+        prefix (str, optional): Optional prefix for the function name. Defaults to "".
+        filterFields (list[str], optional): Specific columns to include in the WHERE clause.
+                                            If not provided, the first column is used.
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
+
+    Returns:
+        str: The complete SQL code for creating the cursor-returning function in PostgreSQL,
+             or a comment if validation fails.
+    """
+    columns = asColumns(columns)
+    if not columns:
+        return f"-- No valid columns found for table {table}"
+    filters, missing = resolveFilters(columns, filterFields, partitionKeys)
+    if filters is None:
+        return f"-- Filter field '{missing}' not found in table {table}"
+
+    warnings = []
+    paramDefs = ', '.join([f"p_{col.name} {paramType(col, 'PostgreSQL', warnings)}" for col in filters])
+    whereClause = ' AND '.join([f"t.{col.name} = p_{col.name}" for col in filters])
+    fullName = f"{schema}.{prefix}SelectCursor{table.capitalize()}"
+
+    return withWarnings(f"""
+    CREATE OR REPLACE FUNCTION {fullName}({paramDefs}, p_cursor refcursor DEFAULT NULL)
+    RETURNS refcursor AS $$
     BEGIN
-        SELECT * FROM {schema}.{table}
+        OPEN p_cursor FOR
+        SELECT t.* FROM {schema}.{table} t
         WHERE {whereClause};
-    END
+        RETURN p_cursor;
+    END;
+    $$ LANGUAGE plpgsql;
+    """, warnings)
+
+def generateSelectPageMSSQL(schema, table, columns, prefix="", filterFields=None, performance=False,
+                            memoryOptimized=False, partitionKeys=None):
+    """
+    Brief description:
+        Generates a SQL Server SELECT stored procedure that returns one keyset page of the
+        matching rows (ordered by 'id', starting after @p_afterId), so callers can stream a
+        large result in chunks with bounded memory on both server and client. The first page
+        and the following ones are separate statements, so every page after the first seeks
+        on 'id' instead of sharing one catch-all plan that rescans from the start.
+
+    Parameters:
+        schema (str): Schema name where the table resides.
+        table (str): Target table name.
+        columns (list[Column]): Table columns (legacy (column_name, data_type) tuples are accepted).
+        prefix (str, optional): Optional prefix for the procedure name. Defaults to "".
+        filterFields (list[str], optional): Specific column names to use in the WHERE clause.
+                                            If not provided, the first column is used by default.
+        performance (bool, optional): Use the performance profile (see mssqlProcedure). Defaults to False.
+        memoryOptimized (bool, optional): The table is memory-optimized. Defaults to False.
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table; they are added
+                                             as parameters and predicates so only one partition is scanned.
+
+    Returns:
+        str: The complete SQL code for creating the paging stored procedure, or
+             a comment string if validation fails.
+    """
+    columns = asColumns(columns)
+    if not columns:
+        return f"-- No valid columns found for table {table}"
+    key = findColumn(columns, 'id')
+    if key is None:
+        return f"-- Streaming filter requires an 'id' key column in table {table}"
+    filters, missing = resolveFilters(columns, filterFields, partitionKeys)
+    if filters is None:
+        return f"-- Filter field '{missing}' not found in table {table}"
+
+    warnings = []
+    paramDefs = ', '.join([f"@p_{col.name} {paramType(col, 'MSSQL', warnings)}" for col in filters]
+                          + [f"@p_afterId {paramType(key, 'MSSQL', warnings)} = NULL",
+                             f"@p_batchSize INT = {STREAM_BATCH_SIZE}"])
+    whereClause = ' AND '.join([f"{col.name} = @p_{col.name}" for col in filters])
+    selectList = ', '.join(col.name for col in columns) if performance and memoryOptimized else '*'
+    name = f"{schema}.{prefix}SelectPage{table.capitalize()}"
+
+    body = f"""IF @p_afterId IS NULL
+            SELECT TOP (@p_batchSize) {selectList} FROM {schema}.{table}
+            WHERE {whereClause}
+            ORDER BY id;
+        ELSE
+            SELECT TOP (@p_batchSize) {selectList} FROM {schema}.{table}
+            WHERE {whereClause} AND id > @p_afterId
+            ORDER BY id;"""
+    return withWarnings(mssqlProcedure(name, paramDefs, body, performance, memoryOptimized), warnings)
+
+def generateStreamingHelper(engine, schema, table, columns, prefix="", filterFields=None, partitionKeys=None):
+    """
+    Brief description:
+        Generates a small, self-contained Python client helper that drives the fetch loop of
+        the streaming Filter procedure: FETCH batches from the refcursor (PostgreSQL) or call
+        the keyset paging procedure page by page (MSSQL), yielding rows one at a time.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        schema (str): Schema name where the table resides.
+        table (str): Target table name.
+        columns (list[Column]): Table columns.
+        prefix (str, optional): Optional procedure name prefix. Defaults to "".
+        filterFields (list[str], optional): Filter fields, as passed to the procedure generator.
+        partitionKeys (list[str], optional): Partition key columns, as passed to the procedure generator.
+
+    Returns:
+        str: Python source code of the helper, or a comment if validation fails.
+    """
+    columns = asColumns(columns)
+    if not columns:
+        return f"# No valid columns found for table {table}"
+    filters, missing = resolveFilters(columns, filterFields, partitionKeys)
+    if filters is None:
+        return f"# Filter field '{missing}' not found in table {table}"
+    args = ', '.join(f"p_{col.name}" for col in filters)
+
+    if engine == "PostgreSQL":
+        funcName = f"{prefix}SelectCursor{table.capitalize()}"
+        placeholders = ', '.join(['%s'] * len(filters))
+        return f'''
+def fetch{table.capitalize()}Stream(conn, {args}, batchSize={STREAM_BATCH_SIZE}):
+    """Yields rows of {schema}.{funcName}, fetching `batchSize` rows per round trip (psycopg2)."""
+    with conn:
+        with conn.cursor() as cur:
+            # The function opens a cursor under a unique portal name and returns it
+            cur.execute("SELECT {schema}.{funcName}({placeholders})", ({args},))
+            cursorName = cur.fetchone()[0]
+            while True:
+                cur.execute(f'FETCH FORWARD {{int(batchSize)}} FROM "{{cursorName}}"')
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                yield from rows
+            cur.execute(f'CLOSE "{{cursorName}}"')
+'''
+
+    key = findColumn(columns, 'id')
+    if key is None:
+        return f"# Streaming filter requires an 'id' key column in table {table}"
+    procName = f"{prefix}SelectPage{table.capitalize()}"
+    keyIndex = columns.index(key)
+    placeholders = ', '.join(['?'] * (len(filters) + 2))
+    return f'''
+def fetch{table.capitalize()}Stream(conn, {args}, batchSize={STREAM_BATCH_SIZE}):
+    """Yields rows of {schema}.{procName}, one keyset page of `batchSize` rows per call (pyodbc)."""
+    afterId = None
+    cur = conn.cursor()
+    try:
+        while True:
+            cur.execute("{{CALL {schema}.{procName} ({placeholders})}}", {args}, afterId, batchSize)
+            rows = cur.fetchall()
+            yield from rows
+            if len(rows) < batchSize:
+                break
+            afterId = rows[-1][{keyIndex}]
+    finally:
+        cur.close()
+'''
+
+GENERATORS = {
+    ("PostgreSQL", "Insert"): generateInsertPostgres,
+    ("PostgreSQL", "Update"): generateUpdatePostgres,
+    ("PostgreSQL", "Delete"): generateDeletePostgres,
+    ("PostgreSQL", "Filter"): generateSelectPostgres,
+    ("MSSQL", "Insert"): generateInsertMSSQL,
+    ("MSSQL", "Update"): generateUpdateMSSQL,
+    ("MSSQL", "Delete"): generateDeleteMSSQL,
+    ("MSSQL", "Filter"): generateSelectMSSQL,
+    ("PostgreSQL", STREAM_ACTION): generateSelectCursorPostgres,
+    ("MSSQL", STREAM_ACTION): generateSelectPageMSSQL,
+}
+
+# Keyword options each generator accepts (everything after schema, table, columns and prefix)
+GENERATOR_PARAMETERS = {generator: frozenset(list(inspect.signature(generator).parameters)[4:])
+                        for generator in GENERATORS.values()}
+GENERATOR_OPTIONS = frozenset().union(*GENERATOR_PARAMETERS.values())
+
+def generateSql(engine, action, schema, table, columns, prefix="", options=None):
+    """
+    Brief description:
+        Dispatches to the generator for the given engine and CRUD action.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        action (str): CRUD action ("Insert", "Update", "Delete", "Filter" or STREAM_ACTION).
+        schema (str): Schema name where the table resides.
+        table (str): Target table name.
+        columns (list[Column]): Table columns.
+        prefix (str, optional): Optional prefix for the procedure name. Defaults to "".
+        options (dict, optional): Extra keyword arguments for the generator (e.g. the MSSQL
+                                  `performance` profile). The same options are passed for every
+                                  action, so options another generator accepts are ignored.
+
+    Returns:
+        str or None: The generated SQL code, or None if the engine/action pair is not supported.
+
+    Raises:
+        ValueError: If an option is not accepted by any generator (e.g. a misspelled name),
+                    or filterHint is not one of FILTER_HINTS.
     """
+    options = options or {}
+    unknown = sorted(set(options) - GENERATOR_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown generator option(s): {', '.join(unknown)}")
+    filterHint = options.get("filterHint")
+    if filterHint is not None and filterHint not in FILTER_HINTS:
+        raise ValueError(f"Unknown filterHint {filterHint!r}; expected one of: {', '.join(FILTER_HINTS)}")
+    generator = GENERATORS.get((engine, action))
+    if generator is None:
+        return None
+    accepted = GENERATOR_PARAMETERS[generator]
+    kwargs = {key: value for key, value in options.items() if key in accepted}
+    return generator(schema, table, columns, prefix, **kwargs)
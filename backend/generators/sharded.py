@@ -0,0 +1,177 @@
+"""
+This module spreads CRUD generation for large catalogs across a process pool.
+Tables are split into contiguous shards, only compact column tuples are sent to
+the workers, and the results are merged back in the original table order.
+"""
+import os
+from functools import partial
+
+from backend.db.columns import Column, asColumns
+from backend.generators.crud import GENERATORS, generateSql
+
+# Below this many tables the pool start-up cost outweighs the gain
+SHARD_THRESHOLD = 200
+# Shards per worker, so a slow shard does not leave the other cores idle
+SHARDS_PER_WORKER = 4
+
+
+def packColumns(columns):
+    """
+    Brief description:
+        Converts Column objects into (name, *type attributes) tuples, which pickle far
+        smaller than objects. Workers re-intern them into shared descriptors.
+
+    Parameters:
+        columns (list[Column]): Table columns.
+
+    Returns:
+        tuple[tuple]: One tuple of column attributes per column.
+    """
+    return tuple((col.name,) + col.type.key for col in asColumns(columns))
+
+
+def unpackColumns(packed):
+    """
+    Brief description:
+        Rebuilds Column objects from tuples produced by packColumns.
+
+    Parameters:
+        packed (tuple[tuple]): Packed column attributes.
+
+    Returns:
+        list[Column]: Table columns.
+    """
+    return [Column(*values) for values in packed]
+
+
+def generateShard(engine, schema, shard, actions, prefix, options=None):
+    """
+    Brief description:
+        Worker entry point: renders every action for every table of one shard.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        schema (str): Schema name where the tables reside.
+        shard (list[tuple]): (table, packedColumns, tableOptions) triples.
+        actions (list[str]): CRUD actions to generate.
+        prefix (str): Optional prefix for procedure names.
+        options (dict, optional): Generator options shared by all tables.
+
+    Returns:
+        list[str]: Generated SQL statements, in table then action order.
+    """
+    statements = []
+    for table, packed, tableOptions in shard:
+        columns = unpackColumns(packed)
+        merged = {**(options or {}), **tableOptions}
+        for action in actions:
+            sql = generateSql(engine, action, schema, table, columns, prefix, merged)
+            if sql is not None:
+                statements.append(sql)
+    return statements
+
+
+def splitShards(items, count):
+    """
+    Brief description:
+        Splits a list into at most `count` contiguous shards of near-equal size.
+
+    Parameters:
+        items (list): Items to split.
+        count (int): Maximum number of shards.
+
+    Returns:
+        list[list]: The shards, in order.
+    """
+    count = max(1, min(count, len(items)))
+    size, extra = divmod(len(items), count)
+    shards, start = [], 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        shards.append(items[start:end])
+        start = end
+    return shards
+
+
+def generateSharded(engine, schema, tableColumns, actions, prefix="", workers=None, options=None,
+                    tableOptions=None, cache=None):
+    """
+    Brief description:
+        Generates the CRUD procedures for many tables, using a process pool when the
+        catalog is large enough to benefit. Output order is deterministic: tables in the
+        given order, and for each table the actions in the given order.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        schema (str): Schema name where the tables reside.
+        tableColumns (list[tuple]): (table, columns) pairs, in the desired output order.
+        actions (list[str]): CRUD actions to generate.
+        prefix (str, optional): Optional prefix for procedure names. Defaults to "".
+        workers (int, optional): Number of worker processes. Defaults to the CPU count;
+                                 1 disables the pool.
+        options (dict, optional): Generator options for every table (see crud.generateSql).
+        tableOptions (dict, optional): Per-table generator options, keyed by table name
+                                       (e.g. {"orders": {"memoryOptimized": True}}).
+        cache (ArtifactCache, optional): Artifact cache; only tables with an artifact missing
+                                         from it are rendered, and the cache is trimmed afterwards.
+
+    Returns:
+        list[str]: Generated SQL statements.
+    """
+    tableOptions = tableOptions or {}
+    packed = [(table, packColumns(columns), tableOptions.get(table, {})) for table, columns in tableColumns]
+    if cache is None:
+        return renderPacked(engine, schema, packed, actions, prefix, workers, options)
+
+    # Imported here so sessions without a cache do not pay for hashlib/json
+    from backend.generators.cache import fingerprint
+
+    # Only supported actions produce an artifact, which keeps rendered output aligned with them
+    actions = [action for action in actions if (engine, action) in GENERATORS]
+    keys = [fingerprint(engine, schema, table, columns, prefix, {**(options or {}), **tOptions})
+            for table, columns, tOptions in packed]
+    artifacts = [cache.get(key, actions) for key in keys]
+    stale = [index for index, tableArtifacts in enumerate(artifacts) if len(tableArtifacts) < len(actions)]
+
+    rendered = renderPacked(engine, schema, [packed[index] for index in stale], actions, prefix, workers, options)
+    for position, index in enumerate(stale):
+        artifacts[index].update(zip(actions, rendered[position * len(actions):(position + 1) * len(actions)]))
+        cache.put(keys[index], artifacts[index])
+    cache.trim()
+    return [tableArtifacts[action] for tableArtifacts in artifacts for action in actions]
+
+
+def renderPacked(engine, schema, packed, actions, prefix="", workers=None, options=None):
+    """
+    Brief description:
+        Renders packed tables, in a process pool when there are enough of them.
+
+    Parameters:
+        engine (str): Database engine ("PostgreSQL" or "MSSQL").
+        schema (str): Schema name where the tables reside.
+        packed (list[tuple]): (table, packedColumns, tableOptions) triples.
+        actions (list[str]): CRUD actions to generate.
+        prefix (str, optional): Optional prefix for procedure names. Defaults to "".
+        workers (int, optional): Number of worker processes. Defaults to the CPU count;
+                                 1 disables the pool.
+        options (dict, optional): Generator options for every table.
+
+    Returns:
+        list[str]: Generated SQL statements, in table then action order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(packed) < SHARD_THRESHOLD:
+        return generateShard(engine, schema, packed, actions, prefix, options)
+
+    # Imported here: concurrent.futures.process pulls in multiprocessing, which is
+    # costly at start-up and not needed for small selections
+    from concurrent.futures import ProcessPoolExecutor
+
+    shards = splitShards(packed, workers * SHARDS_PER_WORKER)
+    statements = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields results in submission order, which keeps the merge deterministic
+        worker = partial(generateShard, engine, schema, actions=actions, prefix=prefix, options=options)
+        for result in pool.map(worker, shards):
+            statements.extend(result)
+    return statements
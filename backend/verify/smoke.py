@@ -0,0 +1,467 @@
+"""
+This module runs a performance smoke test of generated procedures against a
+local PostgreSQL instance before they are deployed anywhere else.
+
+For every table it creates a scratch copy (same columns, indexes and constraints,
+no foreign keys) in a throw-away schema, fills it with synthetic rows, deploys the
+generated Insert/Update/Delete/Filter functions into that schema, calls each one
+repeatedly to collect latency percentiles, and captures EXPLAIN (ANALYZE, BUFFERS)
+of the statement each function runs. The report flags sequential scans and slow
+procedures. Partitioned tables get the same partition-aware procedures as a real
+deployment, but their scratch copy is not partitioned, so pruning is not exercised;
+the report says so for those tables.
+"""
+import json
+import time
+from contextlib import ExitStack
+
+from backend.db.dbConnection import connectToDatabase
+from backend.db.dialects import splitHostPort
+from backend.generators.crud import generateSql, partitionColumns
+
+SCRATCH_SCHEMA = "crud_smoke"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", ""}
+ACTIONS = ["Insert", "Update", "Delete", "Filter"]
+# p95 latency above which a procedure is flagged as slow
+SLOW_MS = 50.0
+
+
+class SmokeResult:
+    """
+    Brief description:
+        Outcome of smoke-testing one generated procedure.
+
+    Attributes:
+        table (str): Table name.
+        action (str): CRUD action ("Insert", "Update", "Delete" or "Filter").
+        latencies (list[float]): Per-call latency in milliseconds.
+        plan (dict or None): EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output of the statement the procedure runs.
+        seqScans (list[str]): Relations read with a sequential scan in that plan.
+        error (str or None): Error message if the procedure could not be deployed or called.
+        note (str or None): Caveat shown in the report without flagging the procedure.
+    """
+    def __init__(self, table, action):
+        self.table = table
+        self.action = action
+        self.latencies = []
+        self.plan = None
+        self.seqScans = []
+        self.error = None
+        self.note = None
+
+    def percentile(self, p):
+        """
+        Brief description:
+            Returns a latency percentile (nearest-rank).
+
+        Parameters:
+            p (float): Percentile between 0 and 100.
+
+        Returns:
+            float or None: Latency in milliseconds, or None if there are no samples.
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[rank]
+
+    @property
+    def slow(self):
+        p95 = self.percentile(95)
+        return p95 is not None and p95 > SLOW_MS
+
+
+INTEGER_TYPES = ("smallint", "integer", "bigint")
+
+
+def isIntegerKey(columns):
+    """
+    Brief description:
+        Tells whether a table has an integer 'id' column, which the scratch copy
+        turns into an identity so Insert calls without an id get fresh values.
+
+    Parameters:
+        columns (list[Column]): Table columns.
+
+    Returns:
+        bool: True if there is an 'id' column of an integer type.
+    """
+    return any(col.name == "id" and col.dataType.lower() in INTEGER_TYPES for col in columns)
+
+
+def syntheticExpression(column):
+    """
+    Brief description:
+        Returns a SQL expression over generate_series value `g` producing plausible,
+        mostly distinct values for a column.
+
+    Parameters:
+        column (Column): Column to fill.
+
+    Returns:
+        str: SQL expression cast to the column type.
+    """
+    dtype = column.dataType.lower()
+    sqlType = column.nativeType or column.dataType
+    if dtype in ("integer", "bigint") or (column.name == "id" and dtype in INTEGER_TYPES + ("numeric", "decimal")):
+        expr = "g"
+    elif dtype == "smallint":
+        expr = "g % 32767"
+    elif dtype in ("numeric", "decimal", "real", "double precision", "money"):
+        expr = "(g % 100000) / 10.0"
+    elif dtype in ("character varying", "character", "text"):
+        length = column.maxLength or 32
+        expr = f"left(md5(g::text), {min(length, 32)})"
+    elif dtype == "boolean":
+        expr = "g % 2 = 0"
+    elif dtype == "date":
+        expr = "current_date - (g % 3650)"
+    elif dtype.startswith("timestamp"):
+        expr = "now() - g * interval '1 second'"
+    elif dtype.startswith("time"):
+        expr = "(g % 86400) * interval '1 second'"
+    elif dtype == "uuid":
+        expr = "md5(g::text)::uuid"
+    elif dtype in ("json", "jsonb"):
+        expr = "json_build_object('g', g)"
+    else:
+        expr = "NULL"
+    return f"({expr})::{sqlType}"
+
+
+def findSeqScans(plan):
+    """
+    Brief description:
+        Walks an EXPLAIN JSON plan and collects the relations read with a Seq Scan.
+
+    Parameters:
+        plan (dict): A plan node (the "Plan" entry of EXPLAIN FORMAT JSON output).
+
+    Returns:
+        list[str]: Relation names scanned sequentially.
+    """
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(findSeqScans(child))
+    return found
+
+
+def bodyStatement(action, scratchTable, columns, filterField="id", partitionKeys=None):
+    """
+    Brief description:
+        Returns the statement a generated procedure runs, with placeholders in the same
+        order as the procedure's parameters, so it can be explained directly (EXPLAIN of
+        a function call only shows an opaque Function Scan).
+
+    Parameters:
+        action (str): CRUD action.
+        scratchTable (str): Qualified scratch table name.
+        columns (list[Column]): Table columns.
+        filterField (str, optional): Filter field used by Update/Delete. Defaults to "id".
+        partitionKeys (list[str], optional): Partition key columns the procedures also filter on.
+
+    Returns:
+        tuple[str, list[Column]]: The SQL statement and the columns bound to its placeholders.
+    """
+    if action == "Insert":
+        bound = [col for col in columns if col.name != "id"]
+        placeholders = ", ".join(f"%s::{col.nativeType or col.dataType}" for col in bound)
+        return f"INSERT INTO {scratchTable} ({', '.join(col.name for col in bound)}) VALUES ({placeholders})", bound
+    if action == "Update":
+        keys = [col for col in columns if col.name == filterField] + partitionColumns(columns, partitionKeys,
+                                                                                      exclude=[filterField])
+        updated = [col for col in columns if col not in keys]
+        sets = ", ".join(f"{col.name} = %s::{col.nativeType or col.dataType}" for col in updated)
+        where = " AND ".join(f"{col.name} = %s" for col in keys)
+        return f"UPDATE {scratchTable} SET {sets} WHERE {where}", updated + keys
+    bound = callArguments(action, columns, filterField, partitionKeys)
+    if action == "Delete":
+        return f"DELETE FROM {scratchTable} WHERE {' AND '.join(f'{col.name} = %s' for col in bound)}", bound
+    return f"SELECT t.* FROM {scratchTable} t WHERE {' AND '.join(f't.{col.name} = %s' for col in bound)}", bound
+
+
+def callArguments(action, columns, filterField="id", partitionKeys=None):
+    """
+    Brief description:
+        Returns the columns bound to a generated procedure's parameters, in order.
+
+    Parameters:
+        action (str): CRUD action.
+        columns (list[Column]): Table columns.
+        filterField (str, optional): Filter field used by Delete. Defaults to "id".
+        partitionKeys (list[str], optional): Partition key columns, passed after the filter field.
+
+    Returns:
+        list[Column]: Columns whose sample values are passed as arguments.
+    """
+    if action == "Insert":
+        return [col for col in columns if col.name != "id"]
+    if action == "Update":
+        return list(columns)
+    filters = [col for col in columns if col.name == filterField] if action == "Delete" else columns[:1]
+    return filters + partitionColumns(columns, partitionKeys, exclude=[col.name for col in filters])
+
+
+def prepareScratchTable(cur, schema, table, columns, rows):
+    """
+    Brief description:
+        Creates the scratch copy of a table and loads synthetic rows into it. An integer
+        'id' becomes (or stays) an identity generated by default, continuing after the
+        synthetic rows; a uuid 'id' gets a random default instead.
+
+    Parameters:
+        cur: Cursor on the local instance (autocommit connection).
+        schema (str): Source schema.
+        table (str): Source table.
+        columns (list[Column]): Table columns.
+        rows (int): Number of synthetic rows.
+
+    Returns:
+        str: Qualified scratch table name.
+    """
+    scratchTable = f"{SCRATCH_SCHEMA}.{table}"
+    cur.execute(f"DROP TABLE IF EXISTS {scratchTable}")
+    # Defaults are excluded so serial columns do not draw from the source sequences
+    cur.execute(f"CREATE TABLE {scratchTable} (LIKE {schema}.{table} INCLUDING ALL EXCLUDING DEFAULTS)")
+    integerKey = isIntegerKey(columns)
+    if integerKey:
+        # LIKE ... INCLUDING ALL keeps GENERATED ALWAYS, which would reject the explicit ids loaded below
+        cur.execute(f"""
+            DO $$ BEGIN
+                IF EXISTS (SELECT 1 FROM pg_attribute
+                           WHERE attrelid = '{scratchTable}'::regclass AND attname = 'id' AND attidentity = '') THEN
+                    ALTER TABLE {scratchTable} ALTER COLUMN id SET NOT NULL;
+                    ALTER TABLE {scratchTable} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+                ELSE
+                    ALTER TABLE {scratchTable} ALTER COLUMN id SET GENERATED BY DEFAULT;
+                END IF;
+            END $$
+        """)
+    elif any(col.name == "id" and col.dataType.lower() == "uuid" for col in columns):
+        cur.execute(f"ALTER TABLE {scratchTable} ALTER COLUMN id "
+                    f"SET DEFAULT md5(random()::text || clock_timestamp()::text)::uuid")
+    names = ", ".join(col.name for col in columns)
+    values = ", ".join(syntheticExpression(col) for col in columns)
+    cur.execute(f"INSERT INTO {scratchTable} ({names}) OVERRIDING SYSTEM VALUE "
+                f"SELECT {values} FROM generate_series(1, %s) AS g", (rows,))
+    if integerKey:
+        cur.execute(f"SELECT setval(pg_get_serial_sequence('{scratchTable}', 'id'), %s)", (rows,))
+    cur.execute(f"ANALYZE {scratchTable}")
+    return scratchTable
+
+
+def uniqueSamples(cur, scratchTable, columns, samples, start):
+    """
+    Brief description:
+        Returns copies of the sample rows whose unique-key columns (other than the
+        identity 'id') hold fresh synthetic values, so Insert calls do not violate the
+        unique and primary-key indexes copied from the source table.
+
+    Parameters:
+        cur: Cursor on the local instance.
+        scratchTable (str): Qualified scratch table name.
+        columns (list[Column]): Table columns.
+        samples (list[dict]): Sampled rows, keyed by column name.
+        start (int): First generate_series value not used by the synthetic rows.
+
+    Returns:
+        list[dict]: The rows to insert, one per sample.
+    """
+    cur.execute("""
+        SELECT DISTINCT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisunique
+    """, (scratchTable,))
+    uniqueNames = {row[0] for row in cur.fetchall()}
+    keys = [col for col in columns if col.name in uniqueNames and col.name != "id"]
+    if not keys:
+        return samples
+    cur.execute(f"SELECT {', '.join(syntheticExpression(col) for col in keys)} "
+                f"FROM generate_series(%s, %s) AS g", (start, start + len(samples) - 1))
+    return [{**sample, **dict(zip((col.name for col in keys), values))}
+            for sample, values in zip(samples, cur.fetchall())]
+
+
+def smokeTestTable(conn, schema, table, columns, prefix, rows, calls, actions=ACTIONS, cancelToken=None,
+                   partitionKeys=None):
+    """
+    Brief description:
+        Runs the smoke test for the given CRUD actions of one table.
+
+    Parameters:
+        conn: Connection to the local instance.
+        schema (str): Source schema.
+        table (str): Source table.
+        columns (list[Column]): Table columns.
+        prefix (str): Optional prefix for procedure names.
+        rows (int): Number of synthetic rows.
+        calls (int): Number of timed calls per procedure.
+        actions (list[str], optional): Actions to test, among ACTIONS. Defaults to all of them.
+        cancelToken (CancelToken, optional): Stops the test between procedures once cancelled.
+        partitionKeys (list[str], optional): Partition key columns of a partitioned table, passed
+                                             to the generators as in a real deployment.
+
+    Returns:
+        list[SmokeResult]: One result per action.
+
+    Raises:
+        OperationCancelled: If the token is cancelled.
+    """
+    results = [SmokeResult(table, action) for action in actions]
+    if partitionKeys:
+        for result in results:
+            result.note = "partitioned table tested on an unpartitioned copy: pruning not exercised"
+    options = {"partitionKeys": partitionKeys}
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        try:
+            scratchTable = prepareScratchTable(cur, schema, table, columns, rows)
+            for action in actions:
+                cur.execute(generateSql("PostgreSQL", action, SCRATCH_SCHEMA, table, columns, prefix, options))
+            cur.execute(f"SELECT {', '.join(col.name for col in columns)} FROM {scratchTable} "
+                        f"ORDER BY random() LIMIT %s", (calls,))
+            samples = [dict(zip((col.name for col in columns), row)) for row in cur.fetchall()]
+            insertSamples = []
+            if samples and "Insert" in actions:
+                insertSamples = uniqueSamples(cur, scratchTable, columns, samples, rows + 1)
+        except Exception as e:
+            for result in results:
+                result.error = f"setup failed: {e}"
+            return results
+    if not samples:
+        for result in results:
+            result.error = "no sample rows to call the procedure with"
+        return results
+
+    conn.autocommit = False
+    for result in results:
+        if cancelToken is not None:
+            cancelToken.raiseIfCancelled()
+        action = result.action
+        funcName = f"{SCRATCH_SCHEMA}.{prefix}{'Select' if action == 'Filter' else action}{table.capitalize()}"
+        args = callArguments(action, columns, partitionKeys=partitionKeys)
+        casts = ", ".join(f"%s::{col.nativeType or col.dataType}" for col in args)
+        callSql = f"SELECT * FROM {funcName}({casts})"
+        actionSamples = insertSamples if action == "Insert" else samples
+        try:
+            with conn.cursor() as cur:
+                for sample in actionSamples:
+                    start = time.perf_counter()
+                    cur.execute(callSql, [sample[col.name] for col in args])
+                    cur.fetchall()
+                    result.latencies.append((time.perf_counter() - start) * 1000)
+                statement, bound = bodyStatement(action, scratchTable, columns, partitionKeys=partitionKeys)
+                # Undo the timed calls, so e.g. Insert does not hit the unique keys it just used
+                conn.rollback()
+                cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                            [actionSamples[0][col.name] for col in bound])
+                explain = cur.fetchone()[0]
+                explain = json.loads(explain) if isinstance(explain, str) else explain
+                result.plan = explain[0]
+                result.seqScans = findSeqScans(result.plan["Plan"])
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            # Calls modify the scratch table; roll back so every action sees the same data
+            conn.rollback()
+    return results
+
+
+def runSmokeTest(host, user, password, dbname, schema, tableColumns, prefix="", rows=10000, calls=50, actions=None,
+                 cancelToken=None, partitionKeys=None):
+    """
+    Brief description:
+        Smoke-tests the generated procedures of the given tables on a local PostgreSQL
+        instance that holds the source schema, then drops the scratch schema.
+
+    Parameters:
+        host (str): Host of the local instance; must be a loopback address.
+        user (str): Username.
+        password (str): Password.
+        dbname (str): Database name.
+        schema (str): Schema the tables live in.
+        tableColumns (list[tuple]): (table, columns) pairs to test.
+        prefix (str, optional): Optional prefix for procedure names. Defaults to "".
+        rows (int, optional): Synthetic rows per table. Defaults to 10000.
+        calls (int, optional): Timed calls per procedure. Defaults to 50.
+        actions (list[str], optional): Actions to test; those not in ACTIONS are skipped.
+                                       Defaults to ACTIONS.
+        cancelToken (CancelToken, optional): Cancels the running statement on the server and
+                                             stops the test; the scratch schema is still dropped.
+        partitionKeys (dict[str, list[str]], optional): Partition key columns, keyed by table name.
+
+    Returns:
+        list[SmokeResult]: One result per table and action.
+
+    Raises:
+        ValueError: If the host is not local.
+        OperationCancelled: If the token is cancelled.
+    """
+    if splitHostPort(host)[0].lower() not in LOCAL_HOSTS:
+        raise ValueError("The smoke test writes scratch data and only runs against a local instance")
+    actions = ACTIONS if actions is None else [action for action in actions if action in ACTIONS]
+    partitionKeys = partitionKeys or {}
+
+    conn = connectToDatabase("PostgreSQL", host, user, password, dbname)
+    results = []
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA IF NOT EXISTS {SCRATCH_SCHEMA}")
+        for table, columns in tableColumns:
+            with ExitStack() as stack:
+                if cancelToken is not None:
+                    stack.enter_context(cancelToken.track("PostgreSQL", conn))
+                results.extend(smokeTestTable(conn, schema, table, columns, prefix, rows, calls, actions,
+                                              cancelToken, partitionKeys.get(table)))
+        if cancelToken is not None:
+            # A statement cancelled mid-table is only recorded as that procedure's error
+            cancelToken.raiseIfCancelled()
+    finally:
+        conn.rollback()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+        conn.close()
+    return results
+
+
+def formatReport(results):
+    """
+    Brief description:
+        Formats smoke test results as a plain-text report, one line per procedure,
+        with flagged procedures marked.
+
+    Parameters:
+        results (list[SmokeResult]): Smoke test results.
+
+    Returns:
+        str: The report text.
+    """
+    lines = ["Procedure smoke test", ""]
+    flagged = 0
+    for result in results:
+        name = f"{result.table}.{result.action}"
+        if result.error:
+            lines.append(f"❌ {name:<40} error: {result.error}")
+            flagged += 1
+            continue
+        warnings = []
+        notes = [result.note] if result.note else []
+        if result.seqScans:
+            warnings.append(f"seq scan on {', '.join(sorted(set(result.seqScans)))}")
+        if result.slow:
+            warnings.append(f"p95 above {SLOW_MS:.0f} ms")
+        flagged += bool(warnings)
+        lines.append(
+            f"{'⚠️' if warnings else '✅'} {name:<40} p50={result.percentile(50):7.2f} ms  "
+            f"p95={result.percentile(95):7.2f} ms  p99={result.percentile(99):7.2f} ms"
+            + (f"  [{'; '.join(warnings + notes)}]" if warnings or notes else "")
+        )
+    lines.append("")
+    lines.append(f"{flagged} of {len(results)} procedures flagged.")
+    return "\n".join(lines)
@@ -0,0 +1,80 @@
+"""
+Benchmark for the in-memory footprint of catalog metadata.
+
+Compares raw driver-style rows (a fresh tuple and fresh strings per column, as
+cur.fetchall() returns them) with the compact Column model (interned names,
+shared type descriptors, __slots__), using tracemalloc.
+
+Usage:
+    python -m benchmarks.benchCatalogMemory [tables] [columnsPerTable]
+"""
+import gc
+import sys
+import tracemalloc
+
+from backend.db.columns import Column
+
+TYPES = [
+    ("int", None, 10, 0, None, None),
+    ("nvarchar", 200, None, None, None, None),
+    ("varchar", 50, None, None, "Latin1_General_BIN2", None),
+    ("decimal", None, 18, 4, None, None),
+    ("datetime2", None, None, 7, None, None),
+]
+COMMON_NAMES = ["id", "tenant_id", "created_at", "updated_at", "name", "status"]
+
+
+def rawRows(tableCount, columnCount):
+    """
+    Brief description:
+        Simulates driver rows: every value is a distinct object, as decoded from the wire.
+
+    Returns:
+        dict[str, list[tuple]]: Rows keyed by table name.
+    """
+    catalog = {}
+    for t in range(tableCount):
+        rows = []
+        for c in range(columnCount):
+            name = COMMON_NAMES[c] if c < len(COMMON_NAMES) else f"col_{c}"
+            dataType, length, precision, scale, collation, native = TYPES[c % len(TYPES)]
+            # "".join forces a new string object, like a driver decoding a result row
+            rows.append(("".join(name), "".join(dataType), length, precision, scale,
+                         "".join(collation) if collation else None, native))
+        catalog[f"table_{t}"] = rows
+    return catalog
+
+
+def measure(build):
+    """
+    Brief description:
+        Returns the memory retained by the object built by `build`, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    tableCount = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    columnCount = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    rawSize, raw = measure(lambda: rawRows(tableCount, columnCount))
+    del raw
+    # Built from freshly fetched rows, so the strings the model keeps are counted here
+    compactSize, _ = measure(lambda: {table: tuple(Column(*row) for row in rows)
+                                      for table, rows in rawRows(tableCount, columnCount).items()})
+
+    total = tableCount * columnCount
+    print(f"{tableCount} tables x {columnCount} columns ({total} columns)")
+    print(f"raw driver rows : {rawSize / 2**20:8.1f} MiB  ({rawSize / total:6.1f} B/column)")
+    print(f"compact model   : {compactSize / 2**20:8.1f} MiB  ({compactSize / total:6.1f} B/column)")
+    print(f"reduction       : {rawSize / compactSize:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
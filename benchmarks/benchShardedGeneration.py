@@ -0,0 +1,64 @@
+"""
+Benchmark for sharded CRUD generation.
+
+Builds a synthetic catalog and times generateSharded with 1 worker and with
+increasing worker counts, checking that every run produces identical output.
+
+Usage:
+    python -m benchmarks.benchShardedGeneration [tables] [columnsPerTable]
+"""
+import os
+import sys
+import time
+
+from backend.db.columns import Column
+from backend.generators.sharded import generateSharded
+
+ACTIONS = ["Insert", "Delete", "Update", "Filter"]
+TYPES = [("int", None, 10, 0), ("nvarchar", 200, None, None), ("decimal", None, 18, 4), ("datetime2", None, None, 7)]
+
+
+def buildCatalog(tableCount, columnCount):
+    """
+    Brief description:
+        Builds a synthetic list of (table, columns) pairs.
+
+    Parameters:
+        tableCount (int): Number of tables.
+        columnCount (int): Number of columns per table (the first one is 'id').
+
+    Returns:
+        list[tuple]: (table, columns) pairs.
+    """
+    catalog = []
+    for t in range(tableCount):
+        columns = [Column("id", "int", None, 10, 0)]
+        for c in range(1, columnCount):
+            dataType, length, precision, scale = TYPES[c % len(TYPES)]
+            columns.append(Column(f"col_{c}", dataType, length, precision, scale))
+        catalog.append((f"table_{t}", columns))
+    return catalog
+
+
+def main():
+    tableCount = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    columnCount = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    catalog = buildCatalog(tableCount, columnCount)
+    cpus = os.cpu_count() or 1
+
+    baseline = None
+    baselineTime = None
+    workerCounts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    for workers in workerCounts:
+        start = time.perf_counter()
+        statements = generateSharded("MSSQL", "dbo", catalog, ACTIONS, workers=workers)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline, baselineTime = statements, elapsed
+        assert statements == baseline, "sharded output differs from single-process output"
+        print(f"workers={workers:>3}  {elapsed:8.2f}s  speedup={baselineTime / elapsed:5.2f}x  "
+              f"({len(statements)} statements)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark for cold-start import time.
+
+Runs a fresh interpreter with `-X importtime` for each entry module, reports the
+cumulative import time of the module and of its heaviest dependencies, and checks
+that no database driver is imported before an engine is selected.
+
+Usage:
+    python -m benchmarks.benchStartup [runs]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["ui.mainWindow", "ui.crudUI", "backend.db.metadata"]
+DRIVERS = ["psycopg2", "pyodbc"]
+
+
+def importProfile(module):
+    """
+    Brief description:
+        Imports a module in a fresh interpreter and parses the `-X importtime` report.
+
+    Parameters:
+        module (str): Module to import.
+
+    Returns:
+        tuple[dict, list[str]]: Cumulative import time in microseconds per module,
+                                and the database drivers that ended up loaded.
+    """
+    check = f"import sys, {module}; print(','.join(d for d in {DRIVERS!r} if d in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    loaded = [d for d in result.stdout.strip().split(",") if d]
+    return times, loaded
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for module in MODULES:
+        samples = []
+        for _ in range(runs):
+            times, loaded = importProfile(module)
+            samples.append(times.get(module, 0))
+        heaviest = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:4]
+        print(f"{module:<22} best={min(samples) / 1000:7.1f} ms  "
+              f"drivers loaded: {', '.join(loaded) or 'none'}")
+        for name, micros in heaviest:
+            print(f"    {name:<30} {micros / 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
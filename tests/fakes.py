@@ -0,0 +1,86 @@
+"""
+DB-API stand-ins shared by the tests: a connection that records the statements
+executed on it and answers fetches from a queue of canned results.
+"""
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, *params):
+        # DB-API drivers take one parameter sequence; pyodbc also takes the values inline
+        if self.conn.failOn and self.conn.failOn in sql:
+            raise RuntimeError(f"statement failed: {self.conn.failOn}")
+        self.conn.executed.append((sql, params[0] if len(params) == 1 else (params or None)))
+        self.conn.pending.append(sql)
+
+    def fetchall(self):
+        return self.conn.results.pop(0) if self.conn.results else []
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def cancel(self):
+        self.conn.cancelled = True
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    Attributes:
+        results (list[list[tuple]]): Rows returned by the next fetches, one list per fetch.
+        failOn (str or None): Statements containing this text raise RuntimeError.
+        executed (list[tuple]): (sql, params) of every statement executed.
+        pending (list[str]): Statements of the open transaction.
+        committed (list[list[str]]): Statements of each committed transaction.
+    """
+    def __init__(self, results=(), failOn=None):
+        self.autocommit = True
+        self.results = list(results)
+        self.failOn = failOn
+        self.executed = []
+        self.pending = []
+        self.committed = []
+        self.cancelled = False
+        self.closed = False
+
+    @property
+    def statements(self):
+        return [sql for sql, _ in self.executed]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, *exc):
+        # Like psycopg2: the block is one transaction
+        if excType is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed.append(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+    def cancel(self):
+        self.cancelled = True
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,72 @@
+import os
+
+from backend.db.columns import Column
+from backend.generators.cache import ArtifactCache, fingerprint
+from backend.generators.sharded import generateSharded, packColumns
+
+COLUMNS = [Column("id", "integer"), Column("name", "text")]
+TABLES = [("orders", COLUMNS), ("customers", COLUMNS)]
+
+
+def testFingerprintDependsOnTheMetadata():
+    packed = packColumns(COLUMNS)
+    key = fingerprint("PostgreSQL", "public", "orders", packed)
+    assert key == fingerprint("PostgreSQL", "public", "orders", packed, options={})
+    assert key != fingerprint("PostgreSQL", "public", "orders", packColumns(COLUMNS[:1]))
+    assert key != fingerprint("PostgreSQL", "public", "orders", packed, options={"filterFields": ["name"]})
+
+
+def testRepeatRunIsServedFromTheCache(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    first = generateSharded("PostgreSQL", "public", TABLES, ["Insert", "Update"], workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 4)
+    cache.resetStats()
+    assert generateSharded("PostgreSQL", "public", TABLES, ["Insert", "Update"], workers=1, cache=cache) == first
+    assert (cache.hits, cache.misses) == (4, 0)
+
+
+def testBundlesPersistAcrossSessions(tmp_path):
+    generateSharded("PostgreSQL", "public", TABLES, ["Insert"], workers=1, cache=ArtifactCache(str(tmp_path)))
+    cache = ArtifactCache(str(tmp_path))
+    generateSharded("PostgreSQL", "public", TABLES, ["Insert"], workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+def testOtherActionsStayCached(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    generateSharded("PostgreSQL", "public", TABLES[:1], ["Insert", "Update"], workers=1, cache=cache)
+    generateSharded("PostgreSQL", "public", TABLES[:1], ["Delete"], workers=1, cache=cache)
+    cache.resetStats()
+    generateSharded("PostgreSQL", "public", TABLES[:1], ["Insert", "Update"], workers=1, cache=cache)
+    assert cache.formatStats() == "Artifact cache: 2 hits, 0 misses (100.0% hit rate)"
+    fresh = ArtifactCache(str(tmp_path))
+    key = fingerprint("PostgreSQL", "public", "orders", packColumns(COLUMNS))
+    assert sorted(fresh.get(key, ["Insert", "Update", "Delete"])) == ["Delete", "Insert", "Update"]
+
+
+def testTrimEvictsTheLeastRecentlyUsedBundles(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    for index, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, {"Insert": "x" * 100})
+        path = cache._path(key)
+        os.utime(path, (index, index))
+    cache = ArtifactCache(str(tmp_path), maxBytes=250)
+    assert cache.trim() == 1
+    assert not os.path.exists(cache._path("aa1"))
+    assert cache.get("aa1", ["Insert"]) == {}
+    assert cache.get("cc3", ["Insert"]) == {"Insert": "x" * 100}
+
+
+def testBundlesInMemoryAreBounded(tmp_path):
+    cache = ArtifactCache(str(tmp_path), maxMemoryBytes=250)
+    for key in ["aa1", "bb2", "cc3"]:
+        cache.put(key, {"Insert": "x" * 100})
+    assert list(cache._loaded) == ["bb2", "cc3"]
+    assert cache._loadedBytes == 200
+    # Evicted from memory only: still served from disk
+    assert cache.get("aa1", ["Insert"]) == {"Insert": "x" * 100}
+    assert list(cache._loaded) == ["cc3", "aa1"]
+
+
+def testHitRateWithoutLookups(tmp_path):
+    assert ArtifactCache(str(tmp_path)).hitRate == 0.0
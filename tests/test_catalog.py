@@ -0,0 +1,219 @@
+import contextlib
+import threading
+
+from backend.db import catalog as catalogModule
+from backend.db.cancel import CancelToken
+from backend.db.catalog import Catalog
+from backend.db.columns import Column
+from fakes import FakeConnection
+
+
+def makeCatalog():
+    return Catalog("PostgreSQL", "localhost", "user", "secret", "db", conn=FakeConnection())
+
+
+def testFailedReadsAreNotCached(monkeypatch):
+    calls = []
+
+    def getTables(engine, host, user, password, database, schema, conn=None, strict=False):
+        calls.append(schema)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        return ["orders"]
+
+    monkeypatch.setattr(catalogModule, "getTables", getTables)
+    catalog = makeCatalog()
+    assert catalog.tables("public") == []
+    assert catalog.tables("public") == ["orders"]
+    assert catalog.tables("public") == ["orders"]
+    assert len(calls) == 2
+
+
+def testFailedSearchIndexIsCachedUntilPrepared(monkeypatch):
+    failures = [RuntimeError("timeout")]
+
+    def getSchemaColumns(engine, host, user, password, database, schema, conn=None, strict=False):
+        if failures:
+            raise failures.pop()
+        return {"orders": [Column("tenant_id", "integer")]}
+
+    monkeypatch.setattr(catalogModule, "getTables", lambda *args, **kwargs: ["orders", "customers"])
+    monkeypatch.setattr(catalogModule, "getSchemaColumns", getSchemaColumns)
+    failures.append(RuntimeError("timeout"))
+    catalog = makeCatalog()
+    assert catalog.searchIndex("public").search("column:tenant") == []
+    # Later keystrokes are answered by the table-names-only index without querying again
+    assert catalog.searchIndex("public").search("order") == ["orders"]
+    assert len(failures) == 1
+    assert catalog.prepareSearchIndex("public").search("column:tenant") == []
+    assert catalog.prepareSearchIndex("public").search("column:tenant") == ["orders"]
+    assert catalog.searchIndex("public").search("column:tenant") == ["orders"]
+    assert catalog.columns("public", "orders")[0].name == "tenant_id"
+
+
+def testCachedEntriesDoNotWaitForQueriesInFlight(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def getTables(engine, host, user, password, database, schema, conn=None, strict=False):
+        started.set()
+        release.wait(5)
+        return ["slow"]
+
+    monkeypatch.setattr(catalogModule, "getSchemas", lambda *args, **kwargs: ["public"])
+    monkeypatch.setattr(catalogModule, "getTables", getTables)
+    catalog = makeCatalog()
+    assert catalog.schemas() == ["public"]
+
+    loader = threading.Thread(target=catalog.tables, args=("public",))
+    loader.start()
+    try:
+        assert started.wait(5)
+        reader = threading.Thread(target=catalog.schemas)
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+    finally:
+        release.set()
+        loader.join(5)
+    assert catalog.tables("public") == ["slow"]
+
+
+def testCatalogReadsAreTrackedByTheTokens(monkeypatch):
+    tracked = []
+
+    class RecordingToken:
+        def track(self, engine, conn, cursor=None):
+            tracked.append((engine, cursor))
+            return contextlib.nullcontext()
+
+    monkeypatch.setattr(catalogModule, "getSchemas", lambda *args, **kwargs: ["public"])
+    catalog = Catalog("PostgreSQL", "localhost", "user", "secret", "db", conn=FakeConnection(),
+                      tokens=[RecordingToken()])
+    assert catalog.schemas() == ["public"]
+    assert len(tracked) == 1
+    engine, registry = tracked[0]
+    assert engine == "PostgreSQL" and hasattr(registry, "cancel")
+
+
+def testCancelledTokenFailsTheReadWithoutCaching(monkeypatch):
+    token = CancelToken()
+    token.cancel()
+    monkeypatch.setattr(catalogModule, "getSchemas", lambda *args, **kwargs: ["public"])
+    catalog = Catalog("PostgreSQL", "localhost", "user", "secret", "db", conn=FakeConnection(), tokens=[token])
+    assert catalog.schemas() == []
+    catalog.tokens = []
+    assert catalog.schemas() == ["public"]
+
+
+class FakeDialect:
+    def replicationLag(self, conn):
+        return 0.0
+
+
+def makeReplicaCatalog(monkeypatch, replica):
+    monkeypatch.setattr(catalogModule, "connectToDatabase", lambda *args, **kwargs: replica)
+    monkeypatch.setattr(catalogModule, "getDialect", lambda engine: FakeDialect())
+    catalog = Catalog("PostgreSQL", "primary", "user", "secret", "db", conn=FakeConnection(),
+                      replicaHost="replica:5433")
+    catalog.checkReplica()
+    catalog._replicaCheckedAt = catalogModule.time.monotonic()
+    return catalog
+
+
+def testFailedReplicaReadIsRetriedOnThePrimary(monkeypatch):
+    replica = FakeConnection()
+    readFrom = []
+
+    def getTables(engine, host, user, password, database, schema, conn=None, strict=False):
+        readFrom.append(conn)
+        if conn is replica:
+            raise RuntimeError("replica is recovering")
+        return ["orders"]
+
+    monkeypatch.setattr(catalogModule, "getTables", getTables)
+    catalog = makeReplicaCatalog(monkeypatch, replica)
+    primary = catalog.primaryConnection()
+    assert catalog.tables("public") == ["orders"]
+    assert readFrom == [replica, primary]
+    # The replica stays unused until the next lag check
+    assert catalog.replicaConnection() is None
+    assert catalog.tables("other") == ["orders"]
+    assert readFrom[-1] is primary
+
+
+def testFailedReadOnBothServersIsNotCached(monkeypatch):
+    failures = [RuntimeError("replica down"), RuntimeError("primary down")]
+
+    def getTables(engine, host, user, password, database, schema, conn=None, strict=False):
+        if failures:
+            raise failures.pop(0)
+        return ["orders"]
+
+    monkeypatch.setattr(catalogModule, "getTables", getTables)
+    catalog = makeReplicaCatalog(monkeypatch, FakeConnection())
+    assert catalog.tables("public") == []
+    assert catalog.tables("public") == ["orders"]
+
+
+def testCancelledReplicaReadIsNotRetried(monkeypatch):
+    token = CancelToken()
+    calls = []
+
+    def getTables(engine, host, user, password, database, schema, conn=None, strict=False):
+        calls.append(conn)
+        token.cancelled = True
+        raise RuntimeError("canceling statement due to user request")
+
+    monkeypatch.setattr(catalogModule, "getTables", getTables)
+    catalog = makeReplicaCatalog(monkeypatch, FakeConnection())
+    catalog.tokens = [token]
+    assert catalog.tables("public") == []
+    assert len(calls) == 1
+
+
+def testUnreachableReplicaDoesNotBlockReads(monkeypatch):
+    connecting = threading.Event()
+    release = threading.Event()
+
+    def connectToDatabase(*args, **kwargs):
+        connecting.set()
+        release.wait(5)
+        raise ConnectionError("timeout expired")
+
+    monkeypatch.setattr(catalogModule, "connectToDatabase", connectToDatabase)
+    monkeypatch.setattr(catalogModule, "getSchemas", lambda *args, **kwargs: ["public"])
+    catalog = Catalog("PostgreSQL", "primary", "user", "secret", "db", conn=FakeConnection(), replicaHost="replica")
+    try:
+        # The first read starts the check and is answered by the primary while it connects
+        assert catalog.schemas() == ["public"]
+        assert connecting.wait(5)
+        check = catalog._checkThread
+        assert catalog.connection() is catalog.primaryConnection()
+    finally:
+        release.set()
+    check.join(5)
+    assert catalog.replicaLag is None and catalog.replicaConnection() is None
+
+
+def testReplicaIsUsedOnceTheCheckSucceeds(monkeypatch):
+    replica = FakeConnection()
+    catalog = makeReplicaCatalog(monkeypatch, replica)
+    assert catalog.connection() is replica
+    assert catalog.replicaLag == 0.0
+
+
+def testCatalogConnectionsUseItsTimeouts(monkeypatch):
+    opened = []
+
+    def connectToDatabase(engine, host, user, password, database, timeouts=None, readOnly=False):
+        opened.append((host, timeouts))
+        return FakeConnection()
+
+    monkeypatch.setattr(catalogModule, "connectToDatabase", connectToDatabase)
+    monkeypatch.setattr(catalogModule, "getDialect", lambda engine: FakeDialect())
+    timeouts = object()
+    catalog = Catalog("PostgreSQL", "primary", "user", "secret", "db", replicaHost="replica", timeouts=timeouts)
+    catalog.primaryConnection()
+    catalog.checkReplica()
+    assert opened == [("primary", timeouts), ("replica", timeouts), ("replica", timeouts)]
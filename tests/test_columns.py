@@ -0,0 +1,67 @@
+from backend.db.columns import Column, asColumns, columnType, findColumn, formatType
+
+
+def testColumnTypesAreShared():
+    first = Column("name", "varchar", 50)
+    second = Column("title", "varchar", 50)
+    assert first.type is second.type
+    assert columnType("varchar", 50) is first.type
+    assert Column("name", "varchar", 80).type is not first.type
+
+
+def testColumnExposesTypeAttributes():
+    column = Column("amount", "numeric", None, 18, 4, None, "numeric(18,4)")
+    assert (column.dataType, column.precision, column.scale, column.nativeType) == ("numeric", 18, 4, "numeric(18,4)")
+    assert column.maxLength is None and column.collation is None
+
+
+def testPostgresTypes():
+    assert formatType(Column("a", "character varying", 50), "PostgreSQL") == ("character varying(50)", None)
+    assert formatType(Column("b", "numeric", None, 10, 2), "PostgreSQL") == ("numeric(10,2)", None)
+    assert formatType(Column("c", "numeric", None, 10, 2, None, "money"), "PostgreSQL") == ("money", None)
+    assert formatType(Column("d", "integer"), "PostgreSQL") == ("integer", None)
+
+
+def testPostgresUnresolvedTypeWarns():
+    sqlType, warning = formatType(Column("tags", "ARRAY"), "PostgreSQL")
+    assert sqlType == "text"
+    assert "'tags'" in warning
+
+
+def testMSSQLTypes():
+    assert formatType(Column("a", "nvarchar", 200), "MSSQL") == ("NVARCHAR(200)", None)
+    assert formatType(Column("b", "varbinary", -1), "MSSQL") == ("VARBINARY(MAX)", None)
+    assert formatType(Column("c", "decimal", None, 18, 4), "MSSQL") == ("DECIMAL(18,4)", None)
+    assert formatType(Column("d", "datetime2", None, None, 3), "MSSQL") == ("DATETIME2(3)", None)
+    assert formatType(Column("e", "int"), "MSSQL") == ("INT", None)
+
+
+def testMSSQLWarnings():
+    sqlType, warning = formatType(Column("code", "varchar"), "MSSQL")
+    assert sqlType == "VARCHAR(100)"
+    assert "'code'" in warning
+    sqlType, warning = formatType(Column("notes", "ntext"), "MSSQL")
+    assert sqlType == "NTEXT"
+    assert "deprecated" in warning
+
+
+def testWarningNamesTheColumnOfASharedType():
+    # The rendered type is cached per descriptor; the warning must still name each column
+    _, first = formatType(Column("first", "varchar"), "MSSQL")
+    _, second = formatType(Column("second", "varchar"), "MSSQL")
+    assert "'first'" in first and "'second'" in second
+
+
+def testAsColumnsAcceptsLegacyTuples():
+    columns = asColumns([("id", "integer"), Column("name", "text")])
+    assert all(isinstance(col, Column) for col in columns)
+    assert [col.name for col in columns] == ["id", "name"]
+    assert findColumn(columns, "name") is columns[1]
+    assert findColumn(columns, "missing") is None
+
+
+def testColumnNamesAreInterned():
+    # "".join builds a new string object, as a driver does when decoding a row
+    first = Column("".join(["tenant", "_id"]), "integer")
+    second = Column("".join(["tenant_", "id"]), "integer")
+    assert first.name is second.name
@@ -0,0 +1,114 @@
+import pytest
+
+from backend.db.columns import Column
+from backend.generators.crud import camelCase, generateSql
+
+COLUMNS = [
+    Column("id", "integer"),
+    Column("name", "character varying", 50),
+    Column("price", "numeric", None, 10, 2),
+]
+MSSQL_COLUMNS = [
+    Column("id", "int"),
+    Column("name", "nvarchar", 50),
+    Column("price", "decimal", None, 10, 2),
+]
+
+
+def testCamelCase():
+    assert camelCase("order_line_item") == "orderLineItem"
+
+
+def testUnsupportedActionReturnsNone():
+    assert generateSql("PostgreSQL", "Merge", "public", "product", COLUMNS) is None
+
+
+def testPostgresInsert():
+    sql = generateSql("PostgreSQL", "Insert", "public", "product", COLUMNS, "app")
+    assert "CREATE OR REPLACE FUNCTION public.appInsertProduct(p_name character varying(50), p_price numeric(10,2))" in sql
+    assert "INSERT INTO public.product (name, price)" in sql
+    assert "WARNING" not in sql
+
+
+def testPostgresInsertReturnsTheIdType():
+    sql = generateSql("PostgreSQL", "Insert", "public", "event", [Column("id", "bigint"), Column("name", "text")])
+    assert "RETURNS bigint AS $$" in sql and "v_id bigint;" in sql
+    sql = generateSql("PostgreSQL", "Insert", "public", "token", [Column("id", "uuid"), Column("name", "text")])
+    assert "RETURNS uuid AS $$" in sql and "v_id uuid;" in sql
+    assert "RETURNS integer AS $$" in generateSql("PostgreSQL", "Insert", "public", "product", COLUMNS)
+
+
+def testPostgresUpdateAndDelete():
+    update = generateSql("PostgreSQL", "Update", "public", "product", COLUMNS)
+    assert "SET name = p_name, price = p_price" in update
+    assert "WHERE id = p_id" in update
+    delete = generateSql("PostgreSQL", "Delete", "public", "product", COLUMNS)
+    assert "public.DeleteProduct(p_id integer)" in delete
+
+
+def testPostgresSelect():
+    sql = generateSql("PostgreSQL", "Filter", "public", "product", COLUMNS, options={"filterFields": ["name"]})
+    assert "RETURNS TABLE(id integer, name character varying(50), price numeric(10,2))" in sql
+    assert "WHERE t.name = p_name" in sql
+    missing = generateSql("PostgreSQL", "Filter", "public", "product", COLUMNS, options={"filterFields": ["sku"]})
+    assert missing.startswith("-- Filter field 'sku' not found")
+
+
+def testMissingFilterFieldWarns():
+    sql = generateSql("PostgreSQL", "Delete", "public", "product", COLUMNS, options={"filterField": "sku"})
+    assert "-- WARNING: filter field 'sku' not found" in sql
+    assert "p_sku INT" in sql
+
+
+def testMSSQLDefaultProfile():
+    sql = generateSql("MSSQL", "Insert", "dbo", "product", MSSQL_COLUMNS)
+    assert "CREATE PROCEDURE dbo.InsertProduct" in sql
+    assert "@p_name NVARCHAR(50), @p_price DECIMAL(10,2)" in sql
+    assert "SET NOCOUNT ON" not in sql
+
+
+def testMSSQLPerformanceProfile():
+    sql = generateSql("MSSQL", "Filter", "dbo", "product", MSSQL_COLUMNS,
+                      options={"performance": True, "filterFields": ["name"]})
+    assert "CREATE OR ALTER PROCEDURE dbo.SelectProduct" in sql
+    assert "SET NOCOUNT ON;" in sql
+    assert "OPTION (RECOMPILE)" in sql
+    byId = generateSql("MSSQL", "Filter", "dbo", "product", MSSQL_COLUMNS,
+                       options={"performance": True, "filterFields": ["id"]})
+    assert "OPTION" not in byId
+
+
+def testMSSQLMemoryOptimized():
+    sql = generateSql("MSSQL", "Filter", "dbo", "product", MSSQL_COLUMNS,
+                      options={"performance": True, "memoryOptimized": True})
+    assert "WITH NATIVE_COMPILATION, SCHEMABINDING" in sql
+    assert "LANGUAGE = N'us_english')\n        SET NOCOUNT ON;" in sql
+    assert "SELECT id, name, price FROM dbo.product" in sql
+
+
+@pytest.mark.parametrize("engine", ["PostgreSQL", "MSSQL"])
+def testEveryActionGenerates(engine):
+    columns = COLUMNS if engine == "PostgreSQL" else MSSQL_COLUMNS
+    for action in ("Insert", "Update", "Delete", "Filter", "Filter (streaming)"):
+        assert generateSql(engine, action, "s", "product", columns)
+
+
+def testUnknownOptionIsRejected():
+    with pytest.raises(ValueError, match="filterFeild"):
+        generateSql("PostgreSQL", "Filter", "public", "product", COLUMNS, options={"filterFeild": "name"})
+
+
+def testOptionsOfOtherGeneratorsAreIgnored():
+    # One options dict serves every engine and action
+    sql = generateSql("PostgreSQL", "Insert", "public", "product", COLUMNS,
+                      options={"performance": True, "partitionKeys": ["name"]})
+    assert "CREATE OR REPLACE FUNCTION public.InsertProduct" in sql
+
+
+def testUnknownFilterHintIsRejected():
+    with pytest.raises(ValueError, match="FORCESEEK"):
+        generateSql("MSSQL", "Filter", "dbo", "product", MSSQL_COLUMNS,
+                    options={"performance": True, "filterHint": "FORCESEEK"})
+    sql = generateSql("MSSQL", "Filter", "dbo", "product", MSSQL_COLUMNS,
+                      options={"performance": True, "filterHint": None, "filterFields": ["name"]})
+    assert "OPTION" not in sql
@@ -0,0 +1,119 @@
+import pytest
+
+from backend.db import dialects
+from backend.db.dialects import DIALECTS, Dialect, getDialect, registerDialect
+from fakes import FakeConnection
+
+
+class IncompleteDialect(Dialect):
+    name = "Incomplete"
+    driverModule = "sqlite3"
+
+    def connect(self, host, user, password, database, timeouts, readOnly=False):
+        return None
+
+
+class SqliteDialect(IncompleteDialect):
+    name = "SQLite"
+
+    def replicationLag(self, conn):
+        return 0.0
+
+    def cancel(self, conn, cursor=None):
+        conn.interrupt()
+
+
+def testIncompleteDialectIsRejectedAtRegistration():
+    with pytest.raises(TypeError, match="cancel, replicationLag"):
+        registerDialect(IncompleteDialect)
+    assert "Incomplete" not in DIALECTS
+
+
+def testNonDialectIsRejected():
+    with pytest.raises(TypeError):
+        registerDialect(object)
+
+
+def testCompleteDialectRegisters():
+    registerDialect(SqliteDialect)
+    try:
+        dialect = getDialect("SQLite")
+        assert isinstance(dialect, SqliteDialect)
+        assert getDialect("SQLite") is dialect
+        assert dialect.driver.__name__ == "sqlite3"
+    finally:
+        DIALECTS.pop("SQLite", None)
+        dialects._instances.pop("SQLite", None)
+
+
+def testUnknownEngine():
+    with pytest.raises(ValueError):
+        getDialect("Oracle")
+
+
+@pytest.mark.parametrize("host, expected", [
+    ("db.example.com", ("db.example.com", None)),
+    (" db.example.com:5433 ", ("db.example.com", 5433)),
+    ("[2001:db8::1]:6432", ("2001:db8::1", 6432)),
+    ("[2001:db8::1]", ("2001:db8::1", None)),
+    ("2001:db8::1", ("2001:db8::1", None)),
+    ("sql01\\reporting", ("sql01\\reporting", None)),
+])
+def testSplitHostPort(host, expected):
+    assert dialects.splitHostPort(host) == expected
+
+
+@pytest.mark.parametrize("host", ["db:", "db:postgres", "db:70000", "[::1]x"])
+def testInvalidPortIsRejected(host):
+    with pytest.raises(ValueError):
+        dialects.splitHostPort(host)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.calls = []
+
+    def connect(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return FakeODBCConnection()
+
+
+class FakeODBCConnection:
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        pass
+
+    def close(self):
+        pass
+
+
+def testPostgresUsesTheGivenPort():
+    dialect = dialects.PostgresDialect()
+    dialect._driver = FakeDriver()
+    dialect.connect("replica.example.com:5433", "user", "secret", "db", dialects.Timeouts())
+    dialect.connect("primary.example.com", "user", "secret", "db", dialects.Timeouts())
+    (_, first), (_, second) = dialect._driver.calls
+    assert (first["host"], first["port"]) == ("replica.example.com", 5433)
+    assert (second["host"], second["port"]) == ("primary.example.com", 5432)
+
+
+def testMSSQLWritesThePortAfterAComma():
+    dialect = dialects.MSSQLDialect()
+    dialect._driver = FakeDriver()
+    dialect.connect("sql01:14330", "user", "secret", "db", dialects.Timeouts())
+    (connectionString,), _ = dialect._driver.calls[0]
+    assert "SERVER=sql01,14330;" in connectionString
+
+
+@pytest.mark.parametrize("row, lag", [
+    ((False, None, None, None, None), 0.0),
+    ((True, "streaming", True, 5.0, 3600.0), 0.0),
+    ((True, "streaming", False, 5.0, 12.0), 12.0),
+    ((True, "streaming", True, 300.0, 3600.0), 3600.0),
+    ((True, None, True, None, 3600.0), 3600.0),
+    ((True, "waiting", True, None, None), None),
+])
+def testPostgresReplicationLag(row, lag):
+    assert dialects.PostgresDialect().replicationLag(FakeConnection(results=[[row]])) == lag
@@ -0,0 +1,146 @@
+import json
+
+from backend.db.cancel import CancelToken
+from backend.db.columns import Column
+from backend.db.dialects import Timeouts
+from backend.deploy import fanout
+from backend.deploy.fanout import (
+    Target, formatFanoutReport, interleaveByHost, loadInventory, processTarget, runFanout
+)
+
+
+def makeTargets():
+    return [Target("PostgreSQL", host, "user", "secret", database)
+            for host, database in [("a", "one"), ("a", "two"), ("a", "three"), ("b", "four"), ("c", "five")]]
+
+
+def testInterleaveByHost():
+    ordered = interleaveByHost(makeTargets())
+    assert [target.database for target in ordered] == ["one", "four", "five", "two", "three"]
+
+
+def testLoadInventory(tmp_path):
+    jsonPath = tmp_path / "targets.json"
+    jsonPath.write_text(json.dumps([{"engine": "MSSQL", "host": "h", "user": "u", "password": "p",
+                                     "database": "d", "replica": "r:1433"}]))
+    target, = loadInventory(str(jsonPath))
+    assert (target.key, target.replica) == ("MSSQL://h/d", "r:1433")
+
+    csvPath = tmp_path / "targets.csv"
+    csvPath.write_text("engine,host,user,password,database\nPostgreSQL,h,u,p,\n")
+    try:
+        loadInventory(str(csvPath))
+    except ValueError as e:
+        assert "database" in str(e)
+    else:
+        raise AssertionError("missing field accepted")
+
+
+def testResumeSkipsOnlyTargetsCompletedWithTheSameParameters(tmp_path, monkeypatch):
+    processed = []
+    failing = {"two"}
+
+    def processTarget(target, schema, tables, actions, prefix, deploy, outputDir, *args):
+        processed.append((target.database, tuple(actions)))
+        if target.database in failing:
+            raise RuntimeError("connection refused")
+        return len(actions)
+
+    monkeypatch.setattr(fanout, "processTarget", processTarget)
+    statePath = str(tmp_path / "state.json")
+    targets = makeTargets()
+
+    first = runFanout(targets, "public", ["Insert"], statePath=statePath)
+    assert [result.status for result in first] == ["ok", "failed", "ok", "ok", "ok"]
+    failing.clear()
+
+    processed.clear()
+    second = runFanout(targets, "public", ["Insert"], statePath=statePath)
+    assert [result.status for result in second] == ["skipped", "ok", "skipped", "skipped", "skipped"]
+    assert processed == [("two", ("Insert",))]
+
+    processed.clear()
+    third = runFanout(targets, "public", ["Insert", "Delete"], statePath=statePath)
+    assert all(result.status == "ok" for result in third)
+    assert len(processed) == 5
+
+
+class FakeCatalog:
+    created = []
+
+    def __init__(self, *args, **kwargs):
+        self.created.append(kwargs)
+
+    def schemaColumns(self, schema):
+        return {"orders": [Column("id", "int")], "orders_view": [Column("id", "int")]}
+
+    def tables(self, schema):
+        return ["orders"]
+
+    def partitionKeys(self, schema):
+        return {}
+
+    def memoryOptimizedTables(self, schema):
+        return {"orders"}
+
+    def close(self):
+        pass
+
+
+def patchTarget(monkeypatch):
+    calls = []
+    monkeypatch.setattr(fanout, "connectToDatabase", lambda *args, **kwargs: object())
+    monkeypatch.setattr(fanout, "Catalog", FakeCatalog)
+    monkeypatch.setattr(fanout, "generateSharded",
+                        lambda *args, **kwargs: calls.append((args, kwargs)) or ["sql"])
+    return calls
+
+
+def testAllTablesExcludeViews(monkeypatch):
+    calls = patchTarget(monkeypatch)
+    target = Target("PostgreSQL", "h", "u", "p", "d")
+    assert processTarget(target, "public", None, ["Insert"], "", False, None) == 1
+    args, _ = calls[0]
+    assert [table for table, _ in args[2]] == ["orders"]
+
+
+def testOptionsReachTheGenerator(monkeypatch):
+    calls = patchTarget(monkeypatch)
+    target = Target("MSSQL", "h", "u", "p", "d")
+    processTarget(target, "dbo", ["orders"], ["Insert"], "", False, None, options={"performance": True})
+    _, kwargs = calls[0]
+    assert kwargs["options"] == {"performance": True}
+    assert kwargs["tableOptions"] == {"orders": {"memoryOptimized": True}}
+
+
+def testCatalogUsesTheTargetTimeouts(monkeypatch):
+    patchTarget(monkeypatch)
+    FakeCatalog.created.clear()
+    timeouts = Timeouts(connect=3, statement=20, lock=2)
+    processTarget(Target("PostgreSQL", "h", "u", "p", "d"), "public", None, ["Insert"], "", False, None, timeouts)
+    assert FakeCatalog.created[0]["timeouts"] is timeouts
+
+
+def testRunWithOtherOptionsDoesNotResume(tmp_path, monkeypatch):
+    monkeypatch.setattr(fanout, "processTarget", lambda *args: 1)
+    statePath = str(tmp_path / "state.json")
+    targets = makeTargets()[:1]
+    runFanout(targets, "dbo", ["Insert"], statePath=statePath)
+    assert runFanout(targets, "dbo", ["Insert"], statePath=statePath)[0].status == "skipped"
+    assert runFanout(targets, "dbo", ["Insert"], statePath=statePath, options={"performance": True})[0].status == "ok"
+
+
+def testCancelledTargetsAreReportedAsCancelled(monkeypatch):
+    token = CancelToken()
+
+    def processTarget(target, *args):
+        if target.database == "one":
+            token.cancel()
+            raise RuntimeError("canceling statement due to user request")
+        return 1
+
+    monkeypatch.setattr(fanout, "processTarget", processTarget)
+    results = runFanout(makeTargets()[:1] + makeTargets()[3:], "public", ["Insert"], maxConcurrency=1,
+                        cancelToken=token)
+    assert [result.status for result in results] == ["cancelled", "cancelled", "cancelled"]
+    assert "0 failed, 3 cancelled of 3 targets." in formatFanoutReport(results)
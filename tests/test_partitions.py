@@ -0,0 +1,68 @@
+import pytest
+
+from backend.db import metadata
+from backend.db.columns import Column
+from backend.generators.crud import generateSql, partitionColumns
+from backend.generators.sharded import generateSharded
+
+COLUMNS = [Column("id", "integer"), Column("region", "text"), Column("created", "date"), Column("qty", "integer")]
+MSSQL_COLUMNS = [Column("id", "int"), Column("region", "nvarchar", 10), Column("qty", "int")]
+KEYS = {"partitionKeys": ["region", "created"]}
+
+
+def testPartitionColumnsKeepKeyOrder():
+    keys = partitionColumns(COLUMNS, ["created", "region"])
+    assert [col.name for col in keys] == ["created", "region"]
+
+
+def testPartitionColumnsSkipFilteredAndUnknownColumns():
+    assert [col.name for col in partitionColumns(COLUMNS, ["region", "id"], exclude=["id"])] == ["region"]
+    assert partitionColumns(COLUMNS, ["tenant"]) == []
+    assert partitionColumns(COLUMNS, None) == []
+
+
+def testPostgresProceduresFilterOnTheKeys():
+    update = generateSql("PostgreSQL", "Update", "public", "sales", COLUMNS, options=KEYS)
+    assert "UpdateSales(p_id integer, p_region text, p_created date, p_qty integer)" in update
+    assert "SET qty = p_qty" in update
+    assert "WHERE id = p_id AND region = p_region AND created = p_created" in update
+    delete = generateSql("PostgreSQL", "Delete", "public", "sales", COLUMNS, options=KEYS)
+    assert "DeleteSales(p_id integer, p_region text, p_created date)" in delete
+    for action in ("Filter", "Filter (streaming)"):
+        sql = generateSql("PostgreSQL", action, "public", "sales", COLUMNS, options=KEYS)
+        assert "WHERE t.id = p_id AND t.region = p_region AND t.created = p_created" in sql
+
+
+def testFilterOnAKeyIsNotRepeated():
+    sql = generateSql("PostgreSQL", "Filter", "public", "sales", COLUMNS,
+                      options={**KEYS, "filterFields": ["region"]})
+    assert "SelectSales(p_region text, p_created date)" in sql
+    assert "WHERE t.region = p_region AND t.created = p_created" in sql
+
+
+@pytest.mark.parametrize("action, where", [
+    ("Update", "WHERE id = @p_id AND region = @p_region"),
+    ("Delete", "WHERE id = @p_id AND region = @p_region"),
+    ("Filter", "WHERE id = @p_id AND region = @p_region"),
+])
+def testMSSQLProceduresFilterOnTheKeys(action, where):
+    sql = generateSql("MSSQL", action, "dbo", "sales", MSSQL_COLUMNS, options={"partitionKeys": ["region"]})
+    assert where in sql
+    assert "@p_region NVARCHAR(10)" in sql
+
+
+def testKeysApplyOnlyToTheirTable():
+    statements = generateSharded("PostgreSQL", "public", [("sales", COLUMNS), ("returns", COLUMNS)], ["Delete"],
+                                 workers=1, tableOptions={"sales": KEYS})
+    assert "AND region = p_region" in statements[0]
+    assert "region" not in statements[1]
+
+
+def testGetPartitionKeysGroupsRowsByTable(monkeypatch):
+    class FakeStatements:
+        def fetchall(self, name, queries, params=()):
+            return [("events", "tenant_id"), ("events", "created"), ("sales", "region")]
+
+    monkeypatch.setattr(metadata, "preparedFor", lambda engine, conn: FakeStatements())
+    keys = metadata.getPartitionKeys("PostgreSQL", None, None, None, None, "public", conn=object())
+    assert keys == {"events": ["tenant_id", "created"], "sales": ["region"]}
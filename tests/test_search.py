@@ -0,0 +1,61 @@
+from backend.db.columns import Column
+from backend.db.search import CatalogIndex, NameIndex, trigrams
+
+TABLES = ["orders", "order_lines", "customers", "Invoices", "tax"]
+COLUMNS = {
+    "orders": [Column("id", "integer"), Column("tenant_id", "integer"), Column("customer_id", "integer")],
+    "order_lines": [Column("id", "integer"), Column("order_id", "integer")],
+    "customers": [Column("id", "integer"), Column("tenant_id", "integer")],
+    "Invoices": [Column("id", "integer")],
+    "tax": [Column("rate", "numeric")],
+    "dropped_table": [Column("tenant_id", "integer")],
+}
+
+
+def testTrigrams():
+    assert trigrams("order") == {"ord", "rde", "der"}
+    assert trigrams("ab") == set()
+
+
+def testNameIndexMatchesSubstrings():
+    index = NameIndex(TABLES)
+    assert index.search("order") == {0, 1}
+    assert index.search("ORDER_L") == {1}
+    assert index.search("voice") == {3}
+    assert index.search("xyz") == set()
+
+
+def testNameIndexShortQueriesScanEveryName():
+    index = NameIndex(TABLES)
+    assert index.search("ta") == {4}
+    assert index.search("") == set(range(len(TABLES)))
+
+
+def testNameIndexRequiresTheWholeSubstring():
+    # Both trigrams of "dere" occur in "order" only as part of "der", not as "dere"
+    assert NameIndex(["order", "ordered"]).search("dere") == {1}
+
+
+def testEmptyQueryReturnsEveryTableInOrder():
+    assert CatalogIndex(TABLES, COLUMNS).search("  ") == TABLES
+
+
+def testTableTermsAreCaseInsensitive():
+    assert CatalogIndex(TABLES, COLUMNS).search("INVOICE") == ["Invoices"]
+
+
+def testColumnTerms():
+    index = CatalogIndex(TABLES, COLUMNS)
+    assert index.search("column:tenant_id") == ["orders", "customers"]
+    assert index.search("col:_id") == ["orders", "order_lines", "customers"]
+    assert index.search("COLUMN:rate") == ["tax"]
+
+
+def testTermsAreCombined():
+    index = CatalogIndex(TABLES, COLUMNS)
+    assert index.search("order column:tenant") == ["orders"]
+    assert index.search("invoice column:tenant") == []
+
+
+def testColumnsOfUnknownTablesAreIgnored():
+    assert CatalogIndex(["tax"], COLUMNS).search("column:tenant_id") == []
@@ -0,0 +1,54 @@
+import concurrent.futures
+
+from backend.db.columns import Column
+from backend.generators import sharded
+from backend.generators.sharded import generateSharded, packColumns, splitShards, unpackColumns
+
+ACTIONS = ["Insert", "Update", "Delete", "Filter"]
+
+
+def makeTables(count):
+    # Tables differ in name and columns, so a misplaced shard changes the output
+    return [(f"table{index:03d}", [Column("id", "integer"), Column(f"col{index}", "character varying", index + 1)])
+            for index in range(count)]
+
+
+def testSplitShardsIsContiguousAndBalanced():
+    shards = splitShards(list(range(10)), 4)
+    assert shards == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+    assert splitShards([1, 2], 8) == [[1], [2]]
+    assert splitShards([], 4) == [[]]
+
+
+def testPackedColumnsRoundTrip():
+    columns = [Column("id", "integer"), Column("price", "numeric", None, 10, 2, None, "numeric(10,2)")]
+    rebuilt = unpackColumns(packColumns(columns))
+    assert [(col.name, col.type) for col in rebuilt] == [(col.name, col.type) for col in columns]
+
+
+def testProcessPoolOutputMatchesTheInlinePath(monkeypatch):
+    pools = []
+
+    class RecordingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs)
+            super().__init__(*args, **kwargs)
+
+    tables = makeTables(23)
+    tableOptions = {"table005": {"partitionKeys": ["col5"]}, "table017": {"filterFields": ["col17"]}}
+    inline = generateSharded("PostgreSQL", "public", tables, ACTIONS, "app", workers=1, tableOptions=tableOptions)
+
+    monkeypatch.setattr(sharded, "SHARD_THRESHOLD", 4)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", RecordingPool)
+    pooled = generateSharded("PostgreSQL", "public", tables, ACTIONS, "app", workers=2, tableOptions=tableOptions)
+    assert pools == [{"max_workers": 2}]
+    assert pooled == inline
+    assert len(pooled) == len(tables) * len(ACTIONS)
+
+
+def testSmallSelectionsStayInline(monkeypatch):
+    def noPool(*args, **kwargs):
+        raise AssertionError("the pool must not be started")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", noPool)
+    assert len(generateSharded("MSSQL", "dbo", makeTables(3), ACTIONS, workers=4)) == 12
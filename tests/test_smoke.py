@@ -0,0 +1,115 @@
+import pytest
+
+from backend.db.columns import Column
+from backend.verify.smoke import (
+    SmokeResult, bodyStatement, callArguments, findSeqScans, formatReport, prepareScratchTable, runSmokeTest,
+    smokeTestTable, syntheticExpression, uniqueSamples
+)
+from fakes import FakeConnection
+
+COLUMNS = [Column("id", "integer"), Column("code", "text"), Column("qty", "integer")]
+
+
+def testCallArguments():
+    assert [col.name for col in callArguments("Insert", COLUMNS)] == ["code", "qty"]
+    assert [col.name for col in callArguments("Delete", COLUMNS)] == ["id"]
+    assert callArguments("Update", COLUMNS) == COLUMNS
+
+
+def testFindSeqScans():
+    plan = {"Node Type": "Hash Join", "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": "orders"},
+        {"Node Type": "Index Scan", "Relation Name": "customers"},
+    ]}
+    assert findSeqScans(plan) == ["orders"]
+
+
+def testPercentileAndReport():
+    result = SmokeResult("orders", "Filter")
+    result.latencies = [float(ms) for ms in range(1, 101)]
+    assert result.percentile(50) == 50.0
+    assert result.slow
+    failed = SmokeResult("orders", "Insert")
+    failed.error = "boom"
+    report = formatReport([result, failed])
+    assert "orders.Insert" in report and "p95 above" in report
+    assert report.endswith("2 of 2 procedures flagged.")
+
+
+def testUniqueKeysGetFreshValues():
+    conn = FakeConnection(results=[[("id",), ("code",)], [("fresh-1",), ("fresh-2",)]])
+    samples = [{"id": 1, "code": "a", "qty": 5}, {"id": 2, "code": "b", "qty": 6}]
+    rows = uniqueSamples(conn.cursor(), "crud_smoke.orders", COLUMNS, samples, 101)
+    assert rows == [{"id": 1, "code": "fresh-1", "qty": 5}, {"id": 2, "code": "fresh-2", "qty": 6}]
+    assert conn.executed[-1][1] == (101, 102)
+
+
+def testTableWithoutSamplesIsSkipped():
+    conn = FakeConnection()
+    results = smokeTestTable(conn, "public", "orders", COLUMNS, "", 0, 5, ["Insert", "Filter"])
+    assert [result.action for result in results] == ["Insert", "Filter"]
+    assert all(result.error == "no sample rows to call the procedure with" for result in results)
+    assert not any(sql.startswith("SELECT * FROM crud_smoke") for sql in conn.statements)
+
+
+def testOnlyLocalInstances():
+    with pytest.raises(ValueError):
+        runSmokeTest("db.example.com", "user", "secret", "db", "public", [])
+    with pytest.raises(ValueError):
+        runSmokeTest("db.example.com:5432", "user", "secret", "db", "public", [])
+
+
+def testIdentityAlwaysKeysAcceptTheSyntheticRows():
+    conn = FakeConnection()
+    prepareScratchTable(conn.cursor(), "public", "orders", COLUMNS, 100)
+    alter, load = [sql for sql in conn.statements if "GENERATED" in sql or "INSERT" in sql]
+    assert "SET GENERATED BY DEFAULT" in alter
+    assert "INSERT INTO crud_smoke.orders (id, code, qty) OVERRIDING SYSTEM VALUE" in load
+    assert "(g)::integer" in load
+    assert any("setval" in sql for sql in conn.statements)
+
+
+def testUuidKeysGetARandomDefault():
+    columns = [Column("id", "uuid"), Column("code", "text")]
+    assert syntheticExpression(columns[0]) == "(md5(g::text)::uuid)::uuid"
+    conn = FakeConnection()
+    prepareScratchTable(conn.cursor(), "public", "tokens", columns, 100)
+    assert not any("IDENTITY" in sql or "GENERATED" in sql or "setval" in sql for sql in conn.statements)
+    assert any("ALTER COLUMN id SET DEFAULT md5(" in sql for sql in conn.statements)
+
+
+def testKeyValuesFollowTheType():
+    assert syntheticExpression(Column("id", "bigint")) == "(g)::bigint"
+    assert syntheticExpression(Column("id", "smallint")) == "(g)::smallint"
+    assert syntheticExpression(Column("id", "text")) == "(left(md5(g::text), 32))::text"
+
+
+PARTITIONED = [Column("id", "integer"), Column("region", "text"), Column("qty", "integer")]
+
+
+def testPartitionKeysAreBound():
+    keys = ["region"]
+    assert [col.name for col in callArguments("Delete", PARTITIONED, partitionKeys=keys)] == ["id", "region"]
+    assert [col.name for col in callArguments("Filter", PARTITIONED, partitionKeys=keys)] == ["id", "region"]
+    assert callArguments("Update", PARTITIONED, partitionKeys=keys) == PARTITIONED
+    statement, bound = bodyStatement("Update", "crud_smoke.sales", PARTITIONED, partitionKeys=keys)
+    assert statement == "UPDATE crud_smoke.sales SET qty = %s::integer WHERE id = %s AND region = %s"
+    assert [col.name for col in bound] == ["qty", "id", "region"]
+    statement, _ = bodyStatement("Filter", "crud_smoke.sales", PARTITIONED, partitionKeys=keys)
+    assert statement == "SELECT t.* FROM crud_smoke.sales t WHERE t.id = %s AND t.region = %s"
+
+
+def testPartitionedTablesDeployPartitionAwareProcedures():
+    conn = FakeConnection()
+    results = smokeTestTable(conn, "public", "sales", PARTITIONED, "", 0, 5, ["Delete"], partitionKeys=["region"])
+    assert any("DELETE FROM crud_smoke.sales WHERE id = p_id AND region = p_region" in sql for sql in conn.statements)
+    assert "pruning not exercised" in results[0].note
+
+
+def testReportMentionsUntestedPruning():
+    result = SmokeResult("sales", "Delete")
+    result.latencies = [1.0]
+    result.note = "partitioned table tested on an unpartitioned copy: pruning not exercised"
+    report = formatReport([result])
+    assert "✅ sales.Delete" in report and "pruning not exercised" in report
+    assert report.endswith("0 of 1 procedures flagged.")
@@ -0,0 +1,59 @@
+import gc
+import threading
+
+from backend.db import statements
+from backend.db.statements import forgetConnection, preparedFor
+from fakes import FakeConnection
+
+
+class SlottedConnection:
+    # Like pyodbc connections: no __weakref__ slot
+    __slots__ = ()
+
+
+QUERIES = {"PostgreSQL": ((), "SELECT 1")}
+
+
+def testStatementsArePreparedOncePerConnection():
+    conn = FakeConnection()
+    preparedFor("PostgreSQL", conn).fetchall("probe", QUERIES)
+    preparedFor("PostgreSQL", conn).fetchall("probe", QUERIES)
+    assert [sql.split()[0] for sql in conn.statements] == ["PREPARE", "EXECUTE", "EXECUTE"]
+    forgetConnection(conn)
+
+
+def testRegistryDoesNotOutliveItsConnection():
+    conn = FakeConnection()
+    preparedFor("PostgreSQL", conn)
+    assert len(statements._registries) >= 1
+    before = len(statements._registries)
+    del conn
+    gc.collect()
+    assert len(statements._registries) == before - 1
+
+
+def testConnectionsWithoutWeakrefsUseTheFallback():
+    conn = SlottedConnection()
+    registry = preparedFor("MSSQL", conn)
+    assert preparedFor("MSSQL", conn) is registry
+    assert registry.conn is conn
+    forgetConnection(conn)
+    assert id(conn) not in statements._strongRegistries
+
+
+def testConcurrentLookupsShareOneRegistry():
+    conn = FakeConnection()
+    found = []
+    barrier = threading.Barrier(8)
+
+    def lookup():
+        barrier.wait()
+        found.append(preparedFor("PostgreSQL", conn))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(registry) for registry in found}) == 1
+    forgetConnection(conn)
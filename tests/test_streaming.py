@@ -0,0 +1,63 @@
+from backend.db.columns import Column
+from backend.generators.crud import STREAM_ACTION, generateSql, generateStreamingHelper
+from fakes import FakeConnection
+
+COLUMNS = [Column("id", "integer"), Column("tenant", "integer"), Column("name", "text")]
+MSSQL_COLUMNS = [Column("name", "nvarchar", 50), Column("id", "int"), Column("tenant", "int")]
+OPTIONS = {"filterFields": ["tenant"]}
+
+
+def loadHelper(engine, columns):
+    source = generateStreamingHelper(engine, "s", "orders", columns, filterFields=["tenant"])
+    namespace = {}
+    exec(source, namespace)
+    return namespace["fetchOrdersStream"]
+
+
+def testPostgresCursorGetsAUniquePortalName():
+    sql = generateSql("PostgreSQL", STREAM_ACTION, "public", "orders", COLUMNS, options=OPTIONS)
+    assert "SelectCursorOrders(p_tenant integer, p_cursor refcursor DEFAULT NULL)" in sql
+    assert "RETURNS refcursor" in sql
+    assert "WHERE t.tenant = p_tenant" in sql
+    assert "orders_stream" not in sql
+
+
+def testMSSQLPagesSeekAfterTheLastId():
+    sql = generateSql("MSSQL", STREAM_ACTION, "dbo", "orders", MSSQL_COLUMNS, options=OPTIONS)
+    assert "@p_tenant INT, @p_afterId INT = NULL, @p_batchSize INT = 1000" in sql
+    first, _, rest = sql.partition("ELSE")
+    assert "IF @p_afterId IS NULL" in first and "WHERE tenant = @p_tenant\n" in first
+    assert "WHERE tenant = @p_tenant AND id > @p_afterId" in rest
+    assert "IS NULL OR" not in sql
+    assert first.count("ORDER BY id;") == 1 and rest.count("ORDER BY id;") == 1
+
+
+def testMSSQLPagingNeedsAnIdColumn():
+    sql = generateSql("MSSQL", STREAM_ACTION, "dbo", "orders", MSSQL_COLUMNS[:1])
+    assert sql.startswith("-- Streaming filter requires an 'id' key column")
+
+
+def testPostgresHelperFetchesFromTheReturnedCursor():
+    fetch = loadHelper("PostgreSQL", COLUMNS)
+    conn = FakeConnection(results=[[("<unnamed portal 3>",)], [(1,), (2,)], [(3,)], []])
+    assert list(fetch(conn, 7, batchSize=2)) == [(1,), (2,), (3,)]
+    call, *fetches, close = conn.executed
+    assert call == ("SELECT s.SelectCursorOrders(%s)", (7,))
+    assert [sql for sql, _ in fetches] == ['FETCH FORWARD 2 FROM "<unnamed portal 3>"'] * 3
+    assert close[0] == 'CLOSE "<unnamed portal 3>"'
+    assert conn.committed
+
+
+def testMSSQLHelperPagesByTheKeyColumn():
+    fetch = loadHelper("MSSQL", MSSQL_COLUMNS)
+    conn = FakeConnection(results=[[("a", 10, 7), ("b", 20, 7)], [("c", 30, 7), ("d", 40, 7)], [("e", 50, 7)]])
+    assert [row[0] for row in fetch(conn, 7, batchSize=2)] == ["a", "b", "c", "d", "e"]
+    assert [params for _, params in conn.executed] == [(7, None, 2), (7, 20, 2), (7, 40, 2)]
+    assert conn.executed[0][0] == "{CALL s.SelectPageOrders (?, ?, ?)}"
+
+
+def testMSSQLHelperStopsOnAFullLastPage():
+    fetch = loadHelper("MSSQL", MSSQL_COLUMNS)
+    conn = FakeConnection(results=[[("a", 10, 7), ("b", 20, 7)]])
+    assert len(list(fetch(conn, 7, batchSize=2))) == 2
+    assert len(conn.executed) == 2
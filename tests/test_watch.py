@@ -0,0 +1,132 @@
+from datetime import datetime
+
+import pytest
+
+from backend.db import metadata
+from backend.db.columns import Column
+from backend.deploy import watch
+from backend.deploy.watch import ChangeDebouncer, PostgresChangeSource, regenerate
+from fakes import FakeConnection
+
+
+def testDebouncerWaitsForQuiet():
+    debouncer = ChangeDebouncer(quiet=2, maxDelay=10)
+    assert debouncer.timeout(0) is None
+    debouncer.add([("public", "orders")], now=0)
+    debouncer.add([("public", "customers")], now=1)
+    assert debouncer.timeout(1) == 2
+    assert debouncer.drain(2) == []
+    assert debouncer.drain(3) == [("public", "customers"), ("public", "orders")]
+    assert debouncer.timeout(3) is None
+
+
+def testDebouncerBoundsTheDelay():
+    debouncer = ChangeDebouncer(quiet=2, maxDelay=5)
+    for now in range(5):
+        debouncer.add([("public", f"t{now}")], now=now)
+    assert debouncer.timeout(4) == 1
+    assert len(debouncer.drain(5)) == 5
+
+
+def testDebouncerIgnoresEmptyChanges():
+    debouncer = ChangeDebouncer()
+    debouncer.add([], now=0)
+    assert debouncer.timeout(0) is None
+
+
+def patchCatalog(monkeypatch, columns, signatures):
+    monkeypatch.setattr(watch, "getColumns", lambda *args, **kwargs: columns)
+    monkeypatch.setattr(watch, "getPartitionKeys", lambda *args, **kwargs: {})
+    monkeypatch.setattr(watch, "getRoutineSignatures",
+                        lambda engine, h, u, p, d, schema, name, **kwargs: signatures.get(name, []))
+
+
+def testRegenerateAfterAddingAColumnDropsTheOldOverloads(monkeypatch):
+    # The functions were created when "product" had no price column
+    signatures = {
+        "InsertProduct": ["public.insertproduct(p_name text)"],
+        "SelectProduct": ["public.selectproduct(p_id integer)"],
+    }
+    patchCatalog(monkeypatch, [Column("id", "integer"), Column("name", "text"), Column("price", "numeric")],
+                 signatures)
+    conn = FakeConnection()
+    counts = regenerate("PostgreSQL", conn, [("public", "product")], ["Insert", "Filter"])
+    assert counts == {("public", "product"): 2}
+    insert, select = conn.committed
+    assert insert[0] == "DROP FUNCTION IF EXISTS public.insertproduct(p_name text);"
+    assert "public.InsertProduct(p_name text, p_price numeric)" in insert[1]
+    assert select[0] == "DROP FUNCTION IF EXISTS public.selectproduct(p_id integer);"
+    assert "price numeric" in select[1]
+    assert conn.autocommit
+
+
+def testRegenerateReplacesPlainMSSQLProcedures(monkeypatch):
+    patchCatalog(monkeypatch, [Column("id", "int"), Column("name", "nvarchar", 50)], {})
+    conn = FakeConnection()
+    regenerate("MSSQL", conn, [("dbo", "product")], ["Insert"])
+    drop, create = conn.committed[0]
+    assert drop == "DROP PROCEDURE IF EXISTS dbo.InsertProduct;"
+    assert "CREATE PROCEDURE dbo.InsertProduct" in create
+
+
+def testOneFailingProcedureDoesNotRollBackTheOthers(monkeypatch, capsys):
+    patchCatalog(monkeypatch, [Column("id", "integer"), Column("name", "text")], {})
+    conn = FakeConnection(failOn="UpdateProduct")
+    regenerate("PostgreSQL", conn, [("public", "product")], ["Insert", "Update", "Delete"])
+    created = [sql for statements in conn.committed for sql in statements]
+    assert any("InsertProduct" in sql for sql in created)
+    assert any("DeleteProduct" in sql for sql in created)
+    assert not any("UpdateProduct" in sql for sql in created)
+    assert "Error deploying public.UpdateProduct" in capsys.readouterr().out
+
+
+class FakeStatements:
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = []
+
+    def fetchall(self, name, queries, params=()):
+        self.params.append(params)
+        return self.rows
+
+
+def testModifiedTablesKeepsTablesModifiedInTheSameTick(monkeypatch):
+    tick = datetime(2024, 1, 1, 12, 0, 0)
+    statements = FakeStatements([(tick, 1)])
+    monkeypatch.setattr(metadata, "preparedFor", lambda engine, conn: statements)
+    changed, since = metadata.getModifiedTables("MSSQL", None, None, None, None, None, conn=object())
+    assert (changed, since) == ([], (tick, frozenset({1})))
+
+    # Table 2 was altered in the same tick as table 1, after the mark was taken
+    statements.rows = [("dbo", "orders", tick, 1), ("dbo", "customers", tick, 2)]
+    changed, since = metadata.getModifiedTables("MSSQL", None, None, None, None, since, conn=object())
+    assert changed == [("dbo", "customers")]
+    assert since == (tick, frozenset({1, 2}))
+    assert statements.params[-1] == (tick,)
+
+    later = datetime(2024, 1, 1, 12, 0, 1)
+    statements.rows = [("dbo", "customers", tick, 2), ("dbo", "orders", later, 1)]
+    changed, since = metadata.getModifiedTables("MSSQL", None, None, None, None, since, conn=object())
+    assert changed == [("dbo", "orders")]
+    assert since == (later, frozenset({1}))
+
+
+def testEmptyDatabaseStartsFromTheBeginning(monkeypatch):
+    monkeypatch.setattr(metadata, "preparedFor", lambda engine, conn: FakeStatements([]))
+    _, since = metadata.getModifiedTables("MSSQL", None, None, None, None, None, conn=object())
+    assert since == (datetime(1900, 1, 1), frozenset())
+
+
+@pytest.mark.parametrize("existing, removed", [(None, True), ((1,), False)])
+def testTriggerIsRemovedOnlyByTheWatchThatInstalledIt(existing, removed):
+    conn = FakeConnection(results=[[existing]] if existing else [])
+    source = PostgresChangeSource(conn)
+    source.close()
+    assert (watch.UNINSTALL_TRIGGER_POSTGRES in conn.pending) == removed
+    assert f"UNLISTEN {watch.CHANNEL}" in conn.pending
+
+
+def testKeptTriggerIsNotRemoved():
+    conn = FakeConnection()
+    PostgresChangeSource(conn).close(keepTrigger=True)
+    assert watch.UNINSTALL_TRIGGER_POSTGRES not in conn.pending
@@ -1,16 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
-import sys
-import psycopg2
-import pyodbc
+import queue
+import threading
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from backend.db.metadata import getColumns, getSchemas, getTables
-from backend.generators.crud import (
-    generateInsertPostgres, generateUpdatePostgres, generateDeletePostgres, generateSelectPostgres,
-    generateInsertMSSQL, generateUpdateMSSQL, generateDeleteMSSQL, generateSelectMSSQL
-)
+from backend.db.cancel import CancelToken, OperationCancelled
+from backend.db.dbConnection import connectToDatabase
+from backend.db.catalog import Catalog
+from backend.db.search import CatalogIndex
+from backend.generators.crud import STREAM_ACTION, generateStreamingHelper
+from backend.generators.sharded import generateSharded
 
 class CrudGenerator(tk.Tk):
     """
@@ -24,6 +23,7 @@ class CrudGenerator(tk.Tk):
         user (str): Database username.
         password (str): Database password.
         dbname (str): Target database name.
+        catalog (Catalog): Cached catalog view shared with the login window.
         selectedTable (tk.StringVar): Currently selected table.
         selectedOption (tk.StringVar): Currently selected CRUD operation.
         executionMode (tk.StringVar): Execution mode ("Code Generation" or "Code Generation and Execution").
@@ -31,6 +31,7 @@ class CrudGenerator(tk.Tk):
         prefixEntry (tk.Entry or None): Entry widget for optional procedure/function prefix.
         schemaOptions (list): List of available schemas in the database.
         tableVars (dict): Mapping of table names to selection variables.
+        searchIndex (CatalogIndex): Search index of the selected schema (table names only until loaded).
         crudVars (dict): Mapping of CRUD actions to selection variables.
 
     Methods:
@@ -40,13 +41,17 @@ class CrudGenerator(tk.Tk):
         - displayRightPanel(sql): Displays generated SQL code in the right panel.
         - addConfirmButton(): Adds the confirm/generate button.
     """
-    def __init__(self, engine, host, user, password, dbname):
+    def __init__(self, engine, host, user, password, dbname, catalog=None):
         super().__init__()
         self.engine = engine
         self.host = host
         self.user = user
         self.password = password
         self.dbname = dbname
+        self.catalog = catalog or Catalog(engine, host, user, password, dbname)
+        self._artifactCache = None
+        self.pendingResults = queue.Queue()
+        self.activeToken = None
 
         self.title("CRUD Generator")
         self.state("zoomed")
@@ -59,6 +64,7 @@ class CrudGenerator(tk.Tk):
         self.currentRecords = []
         self.executionMode = tk.StringVar(value="Code Generation")
         self.prefixEntry = None
+        self.performanceProfile = tk.BooleanVar()
         self.schemaOptions = []
         self.selectedSchema = tk.StringVar()
 
@@ -70,6 +76,71 @@ class CrudGenerator(tk.Tk):
         self.updateTableCheckboxes()
         self.displayRightPanel("")
         self.addConfirmButton()
+        self.pollJob = self.after(100, self.pollPendingResults)
+
+    def runInBackground(self, name, work, done):
+        """
+        Runs work() in a background thread and then done(result, error) on the Tk main loop.
+        Tk is not thread-safe, so the worker never touches widgets: its outcome is queued
+        and picked up by pollPendingResults().
+        """
+        def target():
+            try:
+                outcome = (work(), None)
+            except Exception as e:
+                outcome = (None, e)
+            self.pendingResults.put((done, outcome))
+
+        threading.Thread(target=target, name=name, daemon=True).start()
+
+    def startOperation(self, name, work, done):
+        """
+        Runs a database operation in the background with a new CancelToken: work(token)
+        runs in the worker thread and done(result, error) on the main loop. The Cancel
+        button cancels the token, which stops the running statement on the server.
+        Only one operation runs at a time; returns False if another one is still running.
+        """
+        if self.activeToken is not None:
+            messagebox.showwarning("Busy", "Another operation is still running. Wait for it or cancel it.")
+            return False
+        token = CancelToken()
+        self.activeToken = token
+        self.cancelBtn.config(state="normal")
+
+        def finished(result, error):
+            self.activeToken = None
+            self.cancelBtn.config(state="disabled")
+            done(result, error)
+
+        self.runInBackground(name, lambda: work(token), finished)
+        return True
+
+    def cancelOperation(self):
+        """
+        Cancels the running background operation, if any.
+        """
+        if self.activeToken is not None:
+            self.activeToken.cancel()
+
+    @property
+    def artifactCache(self):
+        """Caché de artefactos de la sesión; se importa y crea en la primera generación."""
+        if self._artifactCache is None:
+            from backend.generators.cache import ArtifactCache
+            self._artifactCache = ArtifactCache()
+        return self._artifactCache
+
+    def pollPendingResults(self):
+        """
+        Delivers the outcomes queued by background workers, then polls again.
+        """
+        while True:
+            try:
+                done, (result, error) = self.pendingResults.get_nowait()
+            except queue.Empty:
+                break
+            done(result, error)
+        self.pollJob = self.after(100, self.pollPendingResults)
 
     def buildLayout(self):
         """
@@ -109,37 +180,41 @@ class CrudGenerator(tk.Tk):
         self.bottomFrame = tk.Frame(self.mainFrame, bg="#f0f8ff")
         self.bottomFrame.pack(side=tk.BOTTOM, pady=10)
 
-    def executeSql(self, sql):
+    def executeSql(self, statements, token):
         """
         Brief description:
-            Executes a given SQL statement on the connected database (PostgreSQL or MSSQL).
-            Shows an error message if execution fails.
+            Executes the given SQL statements on the connected database (PostgreSQL or MSSQL),
+            each in its own transaction, on one connection opened with the configured timeouts.
+            Runs in a worker thread, so failures are returned instead of shown.
 
         Parameters:
-            sql (str): The SQL statement to execute.
+            statements (list[str]): The SQL statements to execute.
+            token (CancelToken): Cancels the running statement and skips the remaining ones.
 
         Returns:
-            None
+            list[str]: One error message per statement that failed.
+
+        Raises:
+            OperationCancelled: If the token is cancelled.
         """
+        errors = []
+        conn = connectToDatabase(self.engine, self.host, self.user, self.password, self.dbname)
         try:
-            if self.engine == "PostgreSQL":
-                conn = psycopg2.connect(
-                    dbname=self.dbname,
-                    user=self.user,
-                    password=self.password,
-                    host=self.host,
-                    port=5432
-                )
-            elif self.engine == "MSSQL":
-                connStr = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={self.host};DATABASE={self.dbname};UID={self.user};PWD={self.password}"
-                conn = pyodbc.connect(connStr)
-            else:
-                raise ValueError("Unsupported database engine")
-            with conn.cursor() as cur:
-                cur.execute(sql)
-            conn.commit()
-        except Exception as e:
-            messagebox.showerror("Error", f"❌ Failed to execute procedure:{e}")
+            for sql in statements:
+                try:
+                    with conn.cursor() as cur:
+                        with token.track(self.engine, conn, cur):
+                            cur.execute(sql)
+                    conn.commit()
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    conn.rollback()
+                    token.raiseIfCancelled()
+                    errors.append(str(e))
+        finally:
+            conn.close()
+        return errors
 
     def showSqlInPanel(self, sql):
         """
@@ -180,14 +255,15 @@ class CrudGenerator(tk.Tk):
               - dbname (str): Nombre de la base de datos.
               Además, se espera que disponga de los métodos:
               - getSelectedCrudActions(): Devuelve las acciones CRUD seleccionadas.
-              - executeSql(sql): Ejecuta la instrucción SQL proporcionada.
+              - executeSql(statements, token): Ejecuta las instrucciones SQL proporcionadas.
               - showSqlInPanel(sql): Muestra en un panel el SQL generado.
               Retorno:
         None
         (El método no retorna ningún valor; sin embargo, genera efectos secundarios:
             - Muestra en un panel el código SQL completo generado.
-            - Ejecuta, si el modo de ejecución es "Code Generation and Execution", cada instrucción SQL.
-            - Muestra un mensaje de éxito si se ejecutó al menos una instrucción SQL.)
+            - Ejecuta, si el modo de ejecución es "Code Generation and Execution", cada instrucción SQL
+              en segundo plano; el botón Cancel detiene la ejecución en el servidor.
+            - Muestra un mensaje de éxito, de error o de cancelación al terminar la ejecución.)
         """
         
         tables = [table for table, var in self.tableVars.items() if var.get()]
@@ -197,46 +273,77 @@ class CrudGenerator(tk.Tk):
         prefix = self.prefixEntry.get().strip() if self.prefixEntry else ""
 
         fullSql = ""
-        somethingExecuted = False
+        warningCount = 0
 
-        for table in tables:
-            columns = getColumns(self.engine, self.host, self.user, self.password, self.dbname, schema, table)
-
-            for action in actions:
-                if self.engine == "PostgreSQL":
-                    if action == "Insert":
-                        sql = generateInsertPostgres(schema, table, columns, prefix)
-                    elif action == "Update":
-                        sql = generateUpdatePostgres(schema, table, columns, prefix)
-                    elif action == "Delete":
-                        sql = generateDeletePostgres(schema, table, prefix)
-                    elif action == "Filter":
-                        sql = generateSelectPostgres(schema, table, columns, prefix)
-                    else:
-                        continue
-                elif self.engine == "MSSQL":
-                    if action == "Insert":
-                        sql = generateInsertMSSQL(schema, table, columns, prefix)
-                    elif action == "Update":
-                        sql = generateUpdateMSSQL(schema, table, columns, prefix)
-                    elif action == "Delete":
-                        sql = generateDeleteMSSQL(schema, table, prefix)
-                    elif action == "Filter":
-                        sql = generateSelectMSSQL(schema, table, columns, prefix)
-                    else:
-                        continue
-                else:
-                    continue
-
-                fullSql += sql + "\n\n"
-                if mode == "Code Generation and Execution":
-                    self.executeSql(sql)
-                    somethingExecuted = True
+        tableColumns = [
+            (table, self.catalog.columns(schema, table))
+            for table in tables
+        ]
+
+        options, tableOptions = self.getGeneratorOptions(schema, tables)
+        self.artifactCache.resetStats()
+        statements = generateSharded(self.engine, schema, tableColumns, actions, prefix,
+                                     options=options, tableOptions=tableOptions, cache=self.artifactCache)
+        for sql in statements:
+            fullSql += sql + "\n\n"
+            warningCount += sql.count("-- WARNING:")
+
+        if STREAM_ACTION in actions:
+            fullSql += self.streamingHelpers(schema, tableColumns, prefix)
+        fullSql = f"-- {self.artifactCache.formatStats()}\n\n" + fullSql
 
         self.showSqlInPanel(fullSql)
-        if somethingExecuted:
+        if warningCount:
+            messagebox.showwarning("Type Warnings", f"⚠️ {warningCount} parameter(s) could not match their column type exactly. See the WARNING comments in the generated code.")
+        if mode == "Code Generation and Execution" and statements:
+            self.startOperation("execute", lambda token: self.executeSql(statements, token), self.executionFinished)
+
+    def executionFinished(self, errors, error):
+        """
+        Reports the outcome of executing the generated procedures.
+        """
+        if isinstance(error, OperationCancelled):
+            messagebox.showwarning("Cancelled", "🛑 Execution was cancelled; procedures already executed were kept.")
+        elif error is not None:
+            messagebox.showerror("Error", f"❌ Failed to execute procedures: {error}")
+        elif errors:
+            messagebox.showerror("Error", f"❌ Failed to execute {len(errors)} procedure(s):\n" + "\n".join(errors))
+        else:
             messagebox.showinfo("Success", "✅ All procedures were successfully executed.")
 
+    def streamingHelpers(self, schema, tableColumns, prefix):
+        """
+        Returns the Python client helpers that drive the streaming Filter
+        procedures, wrapped in a SQL block comment so the panel content
+        stays executable.
+        """
+        partitionKeys = self.catalog.partitionKeys(schema)
+        helpers = "".join(generateStreamingHelper(self.engine, schema, table, columns, prefix,
+                                                  partitionKeys=partitionKeys.get(table))
+                          for table, columns in tableColumns)
+        return f"/* Client helpers (Python) for the streaming Filter procedures:\n{helpers}*/\n"
+
+    def getGeneratorOptions(self, schema, tables):
+        """
+        Returns the generator options for the current selection.
+
+        Partitioned tables get their partition keys, so the generated
+        procedures filter on them and only scan one partition. With the
+        SQL Server performance profile enabled, procedures use
+        CREATE OR ALTER and SET NOCOUNT ON, and tables that are
+        memory-optimized get natively compiled procedures.
+        """
+        options = {}
+        partitionKeys = self.catalog.partitionKeys(schema)
+        tableOptions = {table: {"partitionKeys": partitionKeys[table]} for table in tables if table in partitionKeys}
+        if self.engine == "MSSQL" and self.performanceProfile.get():
+            options = {"performance": True}
+            memoryOptimized = self.catalog.memoryOptimizedTables(schema)
+            for table in tables:
+                if table in memoryOptimized:
+                    tableOptions.setdefault(table, {})["memoryOptimized"] = True
+        return options, tableOptions
+
     def getSelectedCrudActions(self):
         """
         Returns a list of CRUD actions currently selected by the user.
@@ -250,33 +357,76 @@ class CrudGenerator(tk.Tk):
         """
         Retrieves a list of available tables from the currently selected schema.
 
-        Uses the getTables() utility to query the database and return all 
-        base tables for the active schema selection.
+        Uses the session catalog, which serves prefetched tables without
+        querying the database again.
         """
-        return getTables(self.engine, self.host, self.user, self.password, self.dbname, self.selectedSchema.get())
+        return self.catalog.tables(self.selectedSchema.get())
 
     def updateTableCheckboxes(self, event=None):
         """
         Updates the list of table checkboxes based on the currently selected schema.
 
         Destroys any existing checkbox list, fetches available tables for the 
-        selected schema, and renders a new group of checkboxes for user selection.
+        selected schema, and renders a new group of checkboxes for user selection,
+        topped by a search box that filters them as the user types.
         """
         if hasattr(self, 'tableFrame'):
             self.tableFrame.destroy()
 
         self.tableVars = {}
+        self.tableChecks = {}
         tables = self.getAvailableTables()
         self.tableFrame = tk.Frame(self.leftFrame, bg="#e6f2ff")
         self.tableFrame.pack(anchor="w", padx=10, pady=(5, 10))
 
         tk.Label(self.tableFrame, text="Select one or more tables", bg="#e6f2ff", font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(5, 0))
 
+        self.tableSearch = tk.StringVar()
+        searchEntry = tk.Entry(self.tableFrame, textvariable=self.tableSearch, width=32)
+        searchEntry.pack(anchor="w", padx=10, pady=(2, 5))
+        self.tableSearch.trace_add("write", self.filterTableCheckboxes)
+        self.searchAnchor = searchEntry
+
         for table in tables:
             var = tk.BooleanVar()
             chk = tk.Checkbutton(self.tableFrame, text=table, variable=var, bg="#e6f2ff")
             chk.pack(anchor="w", padx=10)
             self.tableVars[table] = var
+            self.tableChecks[table] = chk
+        self.shownTables = set(tables)
+
+        # The column snapshot behind "column:" searches is read in the background;
+        # until it arrives, searches match table names only
+        schema = self.selectedSchema.get()
+        self.searchIndex = CatalogIndex(tables, {})
+
+        def indexReady(index, error):
+            if index is not None and schema == self.selectedSchema.get():
+                self.searchIndex = index
+                self.filterTableCheckboxes()
+
+        self.runInBackground("search-index", lambda: self.catalog.prepareSearchIndex(schema), indexReady)
+
+    def filterTableCheckboxes(self, *args):
+        """
+        Shows only the table checkboxes matching the search box.
+
+        The query is answered by the schema's search index (e.g. "order"
+        or "column:tenant_id"), built in the background when the schema
+        is selected, and only the checkboxes whose visibility
+        changes are packed or forgotten, so the list is never rebuilt.
+        Selections of hidden tables are kept.
+        """
+        matches = set(self.searchIndex.search(self.tableSearch.get()))
+        anchor = self.searchAnchor
+        for table, chk in self.tableChecks.items():
+            if table in matches:
+                if table not in self.shownTables:
+                    chk.pack(anchor="w", padx=10, after=anchor)
+                anchor = chk
+            elif table in self.shownTables:
+                chk.pack_forget()
+        self.shownTables = matches & self.tableChecks.keys()
 
     def buildLeftPanel(self):
         """
@@ -289,14 +439,13 @@ class CrudGenerator(tk.Tk):
         - CRUD action checkboxes (Insert, Delete, Update, Filter)
         - Logout button at the bottom
         """
-        self.schemaOptions = getSchemas(self.engine, self.host, self.user, self.password, self.dbname)
+        self.schemaOptions = self.catalog.schemas()
         tk.Label(self.leftFrame, text="Select schema", bg="#e6f2ff", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
 
         schemaCombo = ttk.Combobox(self.leftFrame, values=self.schemaOptions, textvariable=self.selectedSchema, state="readonly", width=30)
-        if self.engine == "PostgreSQL" and "public" in self.schemaOptions:
-            self.selectedSchema.set("public")
-        elif self.engine == "MSSQL" and self.schemaOptions:
-            self.selectedSchema.set(self.schemaOptions[0])
+        defaultSchema = self.catalog.defaultSchema()
+        if defaultSchema:
+            self.selectedSchema.set(defaultSchema)
         schemaCombo.pack(anchor="w", padx=20, pady=2)
         schemaCombo.bind("<<ComboboxSelected>>", self.updateTableCheckboxes)
 
@@ -315,8 +464,11 @@ class CrudGenerator(tk.Tk):
                 combo.current(0)
                 combo.pack(anchor="w", padx=20, pady=2)
 
+        if self.engine == "MSSQL":
+            tk.Checkbutton(self.leftFrame, text="SQL Server performance profile", variable=self.performanceProfile, bg="#e6f2ff").pack(anchor="w", padx=20, pady=(5, 0))
+
         tk.Label(self.leftFrame, text="Select CRUD actions", bg="#e6f2ff", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
-        crudOptions = ["Insert", "Delete", "Update", "Filter"]
+        crudOptions = ["Insert", "Delete", "Update", "Filter", STREAM_ACTION]
         for option in crudOptions:
             var = tk.BooleanVar()
             chk = tk.Checkbutton(self.leftFrame, text=option, variable=var, bg="#e6f2ff")
@@ -331,7 +483,8 @@ class CrudGenerator(tk.Tk):
         """
         Adds and positions action buttons at the bottom of the interface.
 
-        This includes buttons for generating procedures and viewing permissions.
+        This includes buttons for generating procedures and viewing permissions,
+        and a Cancel button that is enabled while a database operation runs.
         Buttons are grouped in left and right frames within the bottom section
         of the main window.
         """
@@ -348,6 +501,16 @@ class CrudGenerator(tk.Tk):
         permissionsBtn = tk.Button(self.bottomFrameRight, text="View Permissions", command=self.viewPermissions, bg="#2196F3", fg="white")
         permissionsBtn.pack(side=tk.LEFT, padx=10)
 
+        fanoutBtn = tk.Button(self.bottomFrameRight, text="Fan-out...", command=self.runFanout, bg="#673AB7", fg="white")
+        fanoutBtn.pack(side=tk.LEFT, padx=10)
+
+        if self.engine == "PostgreSQL":
+            smokeBtn = tk.Button(self.bottomFrameRight, text="Smoke Test", command=self.runSmokeTest, bg="#FF9800", fg="white")
+            smokeBtn.pack(side=tk.LEFT, padx=10)
+
+        self.cancelBtn = tk.Button(self.bottomFrameRight, text="Cancel", command=self.cancelOperation, bg="#f44336", fg="white", state="disabled")
+        self.cancelBtn.pack(side=tk.LEFT, padx=10)
+
     def displayRightPanel(self, option):
         """
         Placeholder for displaying content in the right panel based on user selection.
@@ -361,27 +524,114 @@ class CrudGenerator(tk.Tk):
         This method destroys the current application window and reinitializes
         the login interface by launching a new instance of ConnectionApp.
         """
+        self.after_cancel(self.pollJob)
+        self.catalog.close()
         self.destroy()
         from ui.mainWindow import ConnectionApp
         app = ConnectionApp()
         app.mainloop()
 
+    def runSmokeTest(self):
+        """
+        Runs the performance smoke test for the selected tables and actions.
+
+        The generated procedures are deployed into a scratch schema on the
+        (local) PostgreSQL instance, exercised with synthetic rows, and the
+        report with latency percentiles and flagged sequential scans is shown
+        in the right panel. The test runs in the background and can be cancelled.
+        """
+        from backend.verify.smoke import ACTIONS, formatReport, runSmokeTest
+
+        schema = self.selectedSchema.get()
+        tables = [t for t, v in self.tableVars.items() if v.get()]
+        actions = [action for action in self.getSelectedCrudActions() if action in ACTIONS]
+        prefix = self.prefixEntry.get().strip() if self.prefixEntry else ""
+        if not actions:
+            messagebox.showwarning("Smoke Test", f"Select at least one of: {', '.join(ACTIONS)}.")
+            return
+        tableColumns = [(table, self.catalog.columns(schema, table)) for table in tables]
+        partitionKeys = self.catalog.partitionKeys(schema)
+
+        def work(token):
+            return runSmokeTest(self.host, self.user, self.password, self.dbname, schema, tableColumns, prefix,
+                                actions=actions, cancelToken=token, partitionKeys=partitionKeys)
+
+        def done(results, error):
+            if isinstance(error, OperationCancelled):
+                self.showSqlInPanel("🛑 Smoke test cancelled.")
+            elif error is not None:
+                messagebox.showerror("Smoke Test", f"❌ Smoke test failed: {error}")
+            else:
+                self.showSqlInPanel(formatReport(results))
+
+        if self.startOperation("smoke-test", work, done):
+            self.showSqlInPanel("Running the smoke test...")
+
+    def runFanout(self):
+        """
+        Generates (and, in execution mode, deploys) the selected CRUD set on every
+        database listed in an inventory file.
+
+        The user picks a JSON or CSV inventory; the selected schema, tables, actions
+        and prefix are applied to every target. The run happens in a background
+        thread, which the Cancel button stops, and its per-target report is shown in
+        the right panel. Completed targets are recorded next to the inventory, so
+        rerunning with the same settings resumes the failed and cancelled ones only.
+        """
+        from tkinter import filedialog
+        from backend.deploy.fanout import formatFanoutReport, loadInventory, runFanout
+
+        path = filedialog.askopenfilename(title="Select target inventory",
+                                          filetypes=[("Inventory", "*.json *.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            targets = loadInventory(path)
+        except Exception as e:
+            messagebox.showerror("Fan-out", f"❌ Invalid inventory: {e}")
+            return
+
+        schema = self.selectedSchema.get()
+        tables = [t for t, v in self.tableVars.items() if v.get()] or None
+        actions = self.getSelectedCrudActions()
+        prefix = self.prefixEntry.get().strip() if self.prefixEntry else ""
+        deploy = self.executionMode.get() == "Code Generation and Execution"
+        outputDir = os.path.splitext(path)[0] + "_sql"
+        # Per-table options (partition keys, memory-optimized tables) are read from each target
+        options, _ = self.getGeneratorOptions(schema, [])
+
+        # Built on the Tk thread so the worker never races the lazy construction
+        cache = self.artifactCache
+
+        def work(token):
+            cache.resetStats()
+            return runFanout(targets, schema, actions, tables, prefix, deploy, outputDir,
+                             statePath=path + ".state.json", cancelToken=token, cache=cache,
+                             options=options)
+
+        def done(results, error):
+            if error is not None:
+                self.showSqlInPanel(f"❌ Fan-out failed: {error}")
+            else:
+                self.showSqlInPanel(formatFanoutReport(results, cache))
+
+        if self.startOperation("fanout", work, done):
+            self.showSqlInPanel(f"Running on {len(targets)} targets...")
+
     def viewPermissions(self):
         """
         Retrieves and displays read/write permissions for the selected tables.
 
-        This method calls the `getPermissions` function to obtain column-level 
+        This method asks the session catalog (`getPermissions`) for column-level 
         access information (read and write) for each selected table within the 
         current schema. The results are formatted and displayed in the right panel.
         """
-        from backend.db.metadata import getPermissions
-
         schema = self.selectedSchema.get()
         tables = [t for t, v in self.tableVars.items() if v.get()]
         allPermissions = ""
 
         for table in tables:
-            permissions = getPermissions(self.engine, self.host, self.user, self.password, self.dbname, schema, table)
+            permissions = self.catalog.permissions(schema, table)
             allPermissions += f"🔹 Table: {table}\n"
             for col, can_read, can_write in permissions:
                 allPermissions += f"  • {col} → Read: {'✅' if can_read else '❌'} | Write: {'✅' if can_write else '❌'}\n"
@@ -1,12 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import psycopg2
-import pyodbc
 import sys, os
 
-# Add parent directory to the path for import resolution
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from ui.crudUI import CrudGenerator
+if __package__ in (None, ""):
+    # Running as a script (python ui/mainWindow.py): make the project root importable
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.db.catalog import Catalog
+from backend.db.dbConnection import connectToDatabase
+from backend.db.dialects import DEFAULT_TIMEOUTS, configureTimeouts
 
 class ConnectionApp(tk.Tk):
     """
@@ -20,16 +21,18 @@ class ConnectionApp(tk.Tk):
         username (tk.StringVar): Database username.
         password (tk.StringVar): Database password.
         database (tk.StringVar): Name of the database to connect to.
+        replicaHost (tk.StringVar): Optional read replica host serving catalog reads.
+        timeouts (dict): Connect, statement and lock timeouts in seconds (tk.StringVar each).
     """
     def __init__(self):
         super().__init__()
         self.title("Database Connection")
-        self.geometry("400x400")
+        self.geometry("400x520")
         self.update_idletasks()
         
         # Center the window on screen
         width = 400
-        height = 400
+        height = 520
         x = (self.winfo_screenwidth() // 2) - (width // 2)
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f"{width}x{height}+{x}+{y}")
@@ -42,6 +45,12 @@ class ConnectionApp(tk.Tk):
         self.username = tk.StringVar()
         self.password = tk.StringVar()
         self.database = tk.StringVar()
+        self.replicaHost = tk.StringVar()
+        self.timeouts = {
+            "connect": tk.StringVar(value=str(DEFAULT_TIMEOUTS.connect)),
+            "statement": tk.StringVar(value=str(DEFAULT_TIMEOUTS.statement)),
+            "lock": tk.StringVar(value=str(DEFAULT_TIMEOUTS.lock)),
+        }
 
         self.buildUi()
 
@@ -49,7 +58,8 @@ class ConnectionApp(tk.Tk):
         """
         Brief description:
             Builds the user interface for the database connection window, including input fields
-            for engine, host, username, password, and database name, along with a connect button.
+            for engine, host, username, password, database name, optional read replica and
+            timeouts, along with a connect button.
 
         Parameters:
             None (uses internal tkinter variables and widget states).
@@ -63,7 +73,7 @@ class ConnectionApp(tk.Tk):
         engineDropdown = ttk.Combobox(self, values=["PostgreSQL", "MSSQL"], state="readonly", textvariable=self.engine)
         engineDropdown.pack(**padding)
 
-        tk.Label(self, text="Host (IP or localhost)", bg="#f0f0f0").pack(**padding)
+        tk.Label(self, text="Host (IP or localhost, optionally host:port)", bg="#f0f0f0").pack(**padding)
         tk.Entry(self, textvariable=self.host).pack(**padding)
 
         tk.Label(self, text="Username", bg="#f0f0f0").pack(**padding)
@@ -75,6 +85,15 @@ class ConnectionApp(tk.Tk):
         tk.Label(self, text="Database Name", bg="#f0f0f0").pack(**padding)
         tk.Entry(self, textvariable=self.database).pack(**padding)
 
+        tk.Label(self, text="Read replica host[:port] (optional)", bg="#f0f0f0").pack(**padding)
+        tk.Entry(self, textvariable=self.replicaHost).pack(**padding)
+
+        tk.Label(self, text="Timeouts in seconds: connect / statement / lock (0 = none)", bg="#f0f0f0").pack(**padding)
+        timeoutFrame = tk.Frame(self, bg="#f0f0f0")
+        timeoutFrame.pack(**padding)
+        for name in ("connect", "statement", "lock"):
+            tk.Entry(timeoutFrame, textvariable=self.timeouts[name], width=6).pack(side=tk.LEFT, padx=5)
+
         tk.Button(
             self, text="Connect", command=self.connectToDatabase,
             bg="#4CAF50", fg="white", font=("Segoe UI", 10, "bold"), width=15
@@ -84,7 +103,11 @@ class ConnectionApp(tk.Tk):
         """
         Brief description:
             Attempts to establish a connection to the selected database engine using
-            the provided credentials. If successful, launches the main CRUD interface.
+            the provided credentials. If successful, hands the connection over to a
+            prefetching catalog and launches the main CRUD interface. When a read
+            replica is given, the catalog reads from it while its lag is acceptable;
+            generated SQL is always executed on the primary. The timeouts apply to
+            every connection opened from then on.
 
         Parameters:
             None (retrieves connection data from internal tkinter variables).
@@ -97,32 +120,29 @@ class ConnectionApp(tk.Tk):
         user = self.username.get()
         password = self.password.get()
         dbname = self.database.get()
+        replicaHost = self.replicaHost.get().strip() or None
+        try:
+            timeouts = {name: int(var.get().strip()) for name, var in self.timeouts.items()}
+            if any(value < 0 for value in timeouts.values()):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Connection Error", "Timeouts must be whole numbers of seconds (0 or more).")
+            return
+        configureTimeouts(**timeouts)
 
         try:
-            # Attempt to connect using appropriate library
-            if engine == "PostgreSQL":
-                conn = psycopg2.connect(
-                    dbname=dbname,
-                    user=user,
-                    password=password,
-                    host=host,
-                    port=5432
-                )
-            elif engine == "MSSQL":
-                connStr = (
-                    f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                    f"SERVER={host};DATABASE={dbname};UID={user};PWD={password}"
-                )
-                conn = pyodbc.connect(connStr)
-            else:
-                raise Exception("Unsupported database engine")
-
-            # Connection succeeded
-            conn.close()
+            # Only the driver of the selected engine is imported here
+            conn = connectToDatabase(engine, host, user, password, dbname)
+
+            # Connection succeeded: hand it to the catalog and start loading
+            # schemas/tables/columns while the main window is being built
+            catalog = Catalog(engine, host, user, password, dbname, conn=conn, replicaHost=replicaHost)
+            catalog.prefetch()
             self.destroy()
 
-            # Launch main application window
-            app = CrudGenerator(engine, host, user, password, dbname)
+            # Launch main application window (imported lazily to keep start-up fast)
+            from ui.crudUI import CrudGenerator
+            app = CrudGenerator(engine, host, user, password, dbname, catalog=catalog)
             app.mainloop()
 
         except Exception as e: